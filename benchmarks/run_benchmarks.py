@@ -0,0 +1,233 @@
+"""
+Scaling benchmarks for the scenario generation pipeline.
+
+Every stage is timed and its peak traced allocation recorded on a grid of problem sizes.
+The grid is a baseline configuration plus one-at-a-time sweeps of ``n_scenarios``, the
+number of margins, the sample size and the fraction of discrete margins, so each sweep
+gives one scaling curve. Results are written as JSON and can be compared against a stored
+baseline run::
+
+    python benchmarks/run_benchmarks.py --output benchmarks/results/latest.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+
+The comparison exits with status 1 if any stage is slower or uses more memory than the
+baseline by more than the given tolerances.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from copula_scengen import ScenarioGenerator
+from copula_scengen.modules.copula.extended_empirical_copula import ExtendedEmpiricalCopula
+from copula_scengen.modules.copula_sample_generators import CopulaSampleGenerator
+from copula_scengen.modules.copula_sample_transformers import (
+    CopulaSampleTransformer,
+    EmpiricalCopulaSampleTransformer,
+    ExtendedCopulaSampleTransformer,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+RESULTS_FORMAT_VERSION = 1
+N_DISCRETE_VALUES = 5
+N_WORKERS = 2
+# timing differences below this are noise on the sub-millisecond stages and are never reported
+MIN_SECONDS_DIFFERENCE = 0.005
+
+
+@dataclasses.dataclass(frozen=True)
+class Case:
+    n_scenarios: int
+    n_margins: int
+    n_observations: int
+    discrete_fraction: float
+
+    @property
+    def key(self) -> str:
+        return f"s{self.n_scenarios}-m{self.n_margins}-o{self.n_observations}-d{self.discrete_fraction:g}"
+
+
+BASE_CASE = Case(n_scenarios=50, n_margins=4, n_observations=500, discrete_fraction=0.5)
+SWEEPS = {
+    "n_scenarios": [25, 50, 100, 200],
+    "n_margins": [2, 4, 8],
+    "n_observations": [250, 500, 2000],
+    "discrete_fraction": [0.0, 0.5, 1.0],
+}
+QUICK_BASE_CASE = Case(n_scenarios=15, n_margins=3, n_observations=100, discrete_fraction=0.5)
+QUICK_SWEEPS = {
+    "n_scenarios": [10, 15, 30],
+    "n_margins": [2, 3],
+    "n_observations": [100, 300],
+    "discrete_fraction": [0.0, 1.0],
+}
+
+
+def cases(base: Case, sweeps: dict[str, list[Any]]) -> list[Case]:
+    """Baseline case plus one-at-a-time variations, without duplicates, in sweep order."""
+    result = [base]
+    for field, values in sweeps.items():
+        for value in values:
+            case = dataclasses.replace(base, **{field: value})
+            if case not in result:
+                result.append(case)
+    return result
+
+
+def make_data(case: Case, seed: int = 0) -> pd.DataFrame:
+    """Correlated sample with the leading ``discrete_fraction`` of margins binned to ``0..4``."""
+    rng = np.random.default_rng(seed)
+    factor = rng.normal(size=(case.n_observations, 1))
+    latent = 0.6 * factor + 0.8 * rng.normal(size=(case.n_observations, case.n_margins))
+
+    n_discrete = round(case.discrete_fraction * case.n_margins)
+    columns = {}
+    for margin in range(case.n_margins):
+        values = latent[:, margin]
+        if margin < n_discrete:
+            edges = np.quantile(values, np.linspace(0, 1, N_DISCRETE_VALUES + 1)[1:-1])
+            values = np.searchsorted(edges, values).astype(float)
+        columns[f"x{margin}"] = values
+    return pd.DataFrame(columns)
+
+
+def stages(case: Case, data: pd.DataFrame, executor: Executor) -> Iterator[tuple[str, Callable[[], object]]]:
+    """Yield ``(stage, run)`` pairs; inputs of a stage are prepared outside of ``run``."""
+    yield "scenario_generator.generate", lambda: ScenarioGenerator().generate(data=data, n_scenarios=case.n_scenarios)
+    yield (
+        "copula_sample_generator.create",
+        lambda: CopulaSampleGenerator().create(data=data, n_scenarios=case.n_scenarios),
+    )
+    # against the stage above: the cost of shipping the pairs, or the gain of spare cores
+    yield (
+        "copula_sample_generator.create[process_pool]",
+        lambda: CopulaSampleGenerator(executor=executor).create(data=data, n_scenarios=case.n_scenarios),
+    )
+
+    copula_sample = CopulaSampleGenerator().create(data=data, n_scenarios=case.n_scenarios)
+    for transformer in (
+        CopulaSampleTransformer(),
+        ExtendedCopulaSampleTransformer(),
+        EmpiricalCopulaSampleTransformer(),
+    ):
+        name = f"{type(transformer).__name__}.transform"
+        yield name, lambda transformer=transformer: transformer.transform(data=data, copula_sample=copula_sample)
+
+    if case.n_margins >= 2:  # noqa: PLR2004
+        pair = data.iloc[:, :2].to_numpy()
+        yield "extended_empirical_copula.grid", lambda: ExtendedEmpiricalCopula(data=pair).grid(case.n_scenarios)
+
+
+def measure(run: Callable[[], object], repeat: int) -> dict[str, float]:
+    """Best wall time over ``repeat`` untraced runs, then the traced peak of one more run."""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": min(seconds), "peak_bytes": peak}
+
+
+def run_benchmarks(base: Case, sweeps: dict[str, list[Any]], repeat: int) -> dict[str, Any]:
+    results = []
+    # one pool for the whole run, so its start-up is not timed
+    with ProcessPoolExecutor(max_workers=N_WORKERS) as executor:
+        for case in cases(base, sweeps):
+            data = make_data(case)
+            for stage, run in stages(case, data, executor):
+                measurement = measure(run, repeat=repeat)
+                results.append({"stage": stage, "case": case.key, **dataclasses.asdict(case), **measurement})
+                print(
+                    f"{stage:<48} {case.key:<28} {measurement['seconds']:9.4f} s "
+                    f"{measurement['peak_bytes'] / 2**20:9.2f} MiB"
+                )
+
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], time_tolerance: float, memory_tolerance: float
+) -> list[str]:
+    """Describe every stage and case that regressed against ``baseline`` beyond the tolerances."""
+    reference = {(row["stage"], row["case"]): row for row in baseline["results"]}
+    regressions = []
+    for row in results["results"]:
+        old = reference.get((row["stage"], row["case"]))
+        if old is None:
+            continue
+        for metric, tolerance in (("seconds", time_tolerance), ("peak_bytes", memory_tolerance)):
+            if metric == "seconds" and row[metric] - old[metric] < MIN_SECONDS_DIFFERENCE:
+                continue
+            if old[metric] > 0 and row[metric] > old[metric] * (1 + tolerance):
+                ratio = row[metric] / old[metric]
+                regressions.append(
+                    f"{row['stage']} [{row['case']}] {metric}: {old[metric]:.6g} -> {row[metric]:.6g} ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="write the results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="compare the results against this stored run")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage, the best is kept")
+    parser.add_argument("--quick", action="store_true", help="run a reduced grid of small problems")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="allowed relative memory growth")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    base, sweeps = (QUICK_BASE_CASE, QUICK_SWEEPS) if args.quick else (BASE_CASE, SWEEPS)
+    results = run_benchmarks(base=base, sweeps=sweeps, repeat=args.repeat)
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.baseline is None:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, time_tolerance=args.time_tolerance, memory_tolerance=args.memory_tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+from copula_scengen.modules.scenario_generators.fitted_scenario_generator import FittedScenarioGenerator
 from copula_scengen.modules.scenario_generators.scenario_generator import ScenarioGenerator
 
-__all__ = ["ScenarioGenerator"]
+__all__ = ["FittedScenarioGenerator", "ScenarioGenerator"]
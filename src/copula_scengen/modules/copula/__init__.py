@@ -1,14 +1,33 @@
 from copula_scengen.modules.copula.base import Copula, CopulaProvider
+from copula_scengen.modules.copula.copula_grid import (
+    CopulaGrid,
+    CumulativeCopulaGrid,
+    DenseCopulaGrid,
+    EvaluatedCopulaGrid,
+    FactoredCopulaGrid,
+)
 from copula_scengen.modules.copula.empirical_copula import EmpiricalCopula
 from copula_scengen.modules.copula.empirical_copula_provider import EmpiricalCopulaProvider
-from copula_scengen.modules.copula.extended_empirical_copula import ExtendedEmpiricalCopula
+from copula_scengen.modules.copula.extended_empirical_copula import ExtendedCopulaGrid, ExtendedEmpiricalCopula
 from copula_scengen.modules.copula.extended_empirical_copula_provider import ExtendedEmpiricalCopulaProvider
+from copula_scengen.modules.copula.histogram_copula import HistogramCopula
+from copula_scengen.modules.copula.histogram_copula_provider import HistogramCopulaProvider
+from copula_scengen.modules.copula.pairwise_histogram_accumulator import PairwiseHistogramAccumulator
 
 __all__ = [
     "Copula",
+    "CopulaGrid",
     "CopulaProvider",
+    "CumulativeCopulaGrid",
+    "DenseCopulaGrid",
     "EmpiricalCopula",
     "EmpiricalCopulaProvider",
+    "EvaluatedCopulaGrid",
+    "ExtendedCopulaGrid",
     "ExtendedEmpiricalCopula",
     "ExtendedEmpiricalCopulaProvider",
+    "FactoredCopulaGrid",
+    "HistogramCopula",
+    "HistogramCopulaProvider",
+    "PairwiseHistogramAccumulator",
 ]
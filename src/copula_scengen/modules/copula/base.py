@@ -4,6 +4,9 @@ from collections.abc import Sequence
 import numpy as np
 import pandas as pd
 
+from copula_scengen.modules.copula.copula_grid import CopulaGrid, EvaluatedCopulaGrid
+from copula_scengen.modules.margin_profiles import MarginProfiles
+
 
 class Copula(ABC):
     @abstractmethod
@@ -24,8 +27,36 @@ class Copula(ABC):
         args = np.column_stack((first.ravel(), second.ravel()))
         return self(args).reshape(max_rank + 1, max_rank + 1)
 
+    def grid_columns(self, max_rank: int) -> CopulaGrid:
+        """
+        Lazy counterpart of :meth:`grid`, producing the lattice one column at a time.
+
+        Keeps memory at ``O(max_rank)`` instead of ``O(max_rank ** 2)``. The default evaluates
+        ``__call__`` per column; subclasses may stream columns from their own structure.
+        """
+        return EvaluatedCopulaGrid(copula=self, max_rank=max_rank)
+
 
 class CopulaProvider(ABC):
     @abstractmethod
     def get(self, data: pd.DataFrame, margins: Sequence[int]) -> Copula:
         """Return a copula fit on data.iloc[:, margins]."""
+
+    def from_profiles(self, margin_profiles: MarginProfiles, margins: Sequence[int]) -> Copula:
+        """
+        Return a copula fit on ``margin_profiles.data.iloc[:, margins]``.
+
+        Providers whose copulas can reuse the shared per-column profiles override this; the
+        default ignores them and delegates to :meth:`get`.
+        """
+        return self.get(data=margin_profiles.data, margins=margins)
+
+    @property
+    def cache_token(self) -> str:
+        """
+        Identify the copulas this provider fits to given data, as part of result cache keys.
+
+        The default is the provider class. Providers whose copulas depend on more than the
+        data they are given, or on settings that change the values, extend it.
+        """
+        return f"{type(self).__module__}.{type(self).__qualname__}"
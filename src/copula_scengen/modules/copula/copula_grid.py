@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from copula_scengen.modules.copula.base import Copula
+
+
+class CopulaGrid(ABC):
+    """
+    Copula values on a 2D lattice, produced one column at a time.
+
+    ``column(index)`` returns the lattice column ``index`` as a 1D array over the first axis.
+    Implementations may keep state between calls and are fastest when columns are requested
+    in non-decreasing order, which is how the greedy assignment loop reads them.
+    """
+
+    @abstractmethod
+    def column(self, index: int) -> np.ndarray:
+        """Return column ``index`` of the lattice."""
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the grid's own arrays; ``0`` when an implementation does not report it."""
+        return 0
+
+
+class DenseCopulaGrid(CopulaGrid):
+    """Wrap an already materialized ``(rows, columns)`` matrix."""
+
+    def __init__(self, values: np.ndarray) -> None:
+        self.values = values
+
+    def column(self, index: int) -> np.ndarray:
+        return self.values[:, index]
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+
+class EvaluatedCopulaGrid(CopulaGrid):
+    """
+    Evaluate ``copula`` on the ``(i / max_rank, r / max_rank)`` lattice, one column per call.
+
+    Holds no more than one column of query points at a time; the values are identical to
+    the corresponding column of ``copula.grid(max_rank)``.
+    """
+
+    def __init__(self, copula: Copula, max_rank: int) -> None:
+        self._copula = copula
+        self._coords = np.arange(max_rank + 1) / max_rank
+
+    def column(self, index: int) -> np.ndarray:
+        args = np.column_stack((self._coords, np.full(self._coords.shape, self._coords[index])))
+        return self._copula(args)
+
+    @property
+    def nbytes(self) -> int:
+        return self._coords.nbytes
+
+
+class CumulativeCopulaGrid(CopulaGrid):
+    """
+    Columns of a 2D empirical copula's cumulative histogram, streamed as the column advances.
+
+    Equivalent to ``EmpiricalCopula.cumulative_counts(thresholds)[:, index]``, but only keeps
+    one column of counts: the pseudo-observations are ordered by their column bin once, and
+    moving from one column to the next adds the points of the newly covered bins to a running
+    per-row histogram. Requesting an earlier column restarts the stream. With ``weights`` the
+    histogram sums the weights of the points and is normalized by their total.
+    """
+
+    def __init__(
+        self,
+        pseudo_observations: tuple[np.ndarray, np.ndarray],
+        thresholds: list[np.ndarray],
+        weights: np.ndarray | None = None,
+    ) -> None:
+        rows, columns = thresholds
+        first, second = pseudo_observations
+        self._n = first.size if weights is None else weights.sum()
+
+        row_idx = np.searchsorted(rows, first, side="left")
+        column_idx = np.searchsorted(columns, second, side="left")
+        valid = (row_idx < rows.size) & (column_idx < columns.size)
+
+        order = np.argsort(column_idx[valid], kind="stable")
+        # row bins fit the smallest unsigned dtype, which shrinks the grid a pool worker sends back
+        self._row_idx = row_idx[valid][order].astype(np.min_scalar_type(rows.size))
+        self._weights = None if weights is None else weights[valid][order]
+        # number of points binned at column index <= j, for every column j
+        self._column_ends = np.searchsorted(column_idx[valid][order], np.arange(columns.size), side="right")
+
+        self._counts = np.zeros(rows.size, dtype=np.int64 if weights is None else float)
+        self._consumed = 0
+        self._last: tuple[int, np.ndarray] | None = None
+
+    def column(self, index: int) -> np.ndarray:
+        if self._last is not None and self._last[0] == index:
+            return self._last[1]
+
+        end = self._column_ends[index]
+        if end < self._consumed:
+            self._counts[:] = 0
+            self._consumed = 0
+        weights = None if self._weights is None else self._weights[self._consumed : end]
+        self._counts += np.bincount(self._row_idx[self._consumed : end], weights=weights, minlength=self._counts.size)
+        self._consumed = end
+
+        values = np.cumsum(self._counts) / self._n
+        self._last = (index, values)
+        return values
+
+    @property
+    def nbytes(self) -> int:
+        weights_nbytes = 0 if self._weights is None else self._weights.nbytes
+        return self._row_idx.nbytes + self._column_ends.nbytes + self._counts.nbytes + weights_nbytes
+
+
+class FactoredCopulaGrid(CopulaGrid):
+    """
+    Lattice given as the product ``left @ right`` of a ``(rows, k)`` and a ``(k, columns)`` factor.
+
+    Each column is one matrix-vector product, so the grid holds ``O(k * (rows + columns))``
+    values instead of the full ``rows x columns`` matrix.
+    """
+
+    def __init__(self, left: np.ndarray, right: np.ndarray) -> None:
+        self._left = left
+        self._right = right
+
+    def column(self, index: int) -> np.ndarray:
+        return self._left @ self._right[:, index]
+
+    @property
+    def nbytes(self) -> int:
+        return self._left.nbytes + self._right.nbytes
@@ -1,6 +1,11 @@
 import numpy as np
 
 
+def rank_dtype(max_rank: int) -> np.dtype:
+    """Smallest unsigned integer dtype holding the ranks ``1..max_rank``, and any count up to ``max_rank``."""
+    return np.min_scalar_type(max_rank)
+
+
 class CopulaSample:
     def __init__(self, ranks: np.ndarray, max_rank: int) -> None:
         self.ranks = ranks
@@ -9,9 +14,13 @@ class CopulaSample:
         self._filled = 0
 
     @classmethod
-    def initialize(cls, max_rank: int, n_margins: int = 1) -> "CopulaSample":
-        """Initialize ranks, preallocating capacity for `n_margins` columns for later `extend` calls."""
-        buffer = np.zeros((max_rank, max(n_margins, 1)), dtype=int)
+    def initialize(cls, max_rank: int, n_margins: int = 1, dtype: np.dtype | type = int) -> "CopulaSample":
+        """
+        Initialize ranks, preallocating capacity for `n_margins` columns for later `extend` calls.
+
+        ``dtype=rank_dtype(max_rank)`` stores the ranks compactly, in 1 to 4 bytes instead of 8.
+        """
+        buffer = np.zeros((max_rank, max(n_margins, 1)), dtype=dtype)
         buffer[:, 0] = np.arange(1, max_rank + 1)
 
         instance = cls(ranks=buffer[:, :1], max_rank=max_rank)
@@ -31,7 +40,8 @@ class CopulaSample:
         else:
             buffer = None
             filled = 0
-            extended_ranks = np.append(self.ranks, new_ranks.reshape((self.max_rank, 1)), axis=1)
+            new_column = new_ranks.astype(self.ranks.dtype, copy=False).reshape((self.max_rank, 1))
+            extended_ranks = np.append(self.ranks, new_column, axis=1)
 
         instance = CopulaSample(ranks=extended_ranks, max_rank=self.max_rank)
         instance._buffer = buffer
@@ -1,18 +1,51 @@
+from functools import lru_cache
+
 import numpy as np
 
 
+@lru_cache(maxsize=8)
+def running_fractions(max_rank: int) -> np.ndarray:
+    """
+    ``fractions[k]`` is ``1 / max_rank`` added to ``0.0`` ``k`` times in floating point, for ``k`` in ``0..max_rank``.
+
+    Sample values are kept as integer counts and read through this table, which reproduces
+    the running float sums of the original dense sample bit for bit. ``k / max_rank`` can
+    differ from them in the last ulp, which is enough to flip ties in the greedy assignment.
+    """
+    # ``cumsum`` accumulates sequentially, exactly like the repeated ``+=`` of the original
+    fractions = np.concatenate(([0.0], np.cumsum(np.full(max_rank, 1.0 / max_rank))))
+    fractions.flags.writeable = False
+    return fractions
+
+
 class CopulaSample2D:
-    def __init__(self, max_rank: int) -> None:
+    """
+    Running 2D copula sample of a prior margin against the margin being assigned.
+
+    Evaluated at ``i``, it is the fraction of scenarios assigned so far whose rank in the prior
+    margin is ``<= i``. The counts are integers, bumped on the suffix ``rank..max_rank`` by
+    ``assign``, and read through :func:`running_fractions`. Evaluating at ``0`` returns the
+    running total, the value at ``max_rank``, which is the convention :class:`DeviationCache`
+    was built against.
+
+    The counts never exceed ``max_rank``, so ``dtype`` may be as narrow as ``rank_dtype(max_rank)``.
+    """
+
+    def __init__(self, max_rank: int, dtype: np.dtype | type = np.int64) -> None:
         self.max_rank = max_rank
-        self._cache = np.zeros(max_rank)
+        # ``_counts[i - 1]`` is the count at ``i``
+        self._counts = np.zeros(max_rank, dtype=dtype)
 
     @classmethod
-    def initialize(cls, max_rank: int) -> "CopulaSample2D":
-        return cls(max_rank=max_rank)
+    def initialize(cls, max_rank: int, dtype: np.dtype | type = np.int64) -> "CopulaSample2D":
+        return cls(max_rank=max_rank, dtype=dtype)
 
     def __call__(self, arg: np.ndarray) -> float | np.ndarray:
-        arr = np.asarray(arg) - 1
-        return self._cache[arr]
+        return running_fractions(self.max_rank)[self.counts(arg)]
+
+    def counts(self, arg: np.ndarray) -> int | np.ndarray:
+        """Number of assigned scenarios with prior rank ``<= arg``, vectorized over ``arg``."""
+        return self._counts[np.asarray(arg) - 1]
 
     def assign(self, rank: int) -> None:
-        self._cache[rank - 1 :] += 1.0 / self.max_rank
+        self._counts[rank - 1 :] += 1
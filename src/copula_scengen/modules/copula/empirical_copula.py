@@ -1,26 +1,116 @@
+from collections.abc import Sequence
 from functools import cached_property
 
 import numpy as np
 
 from copula_scengen.modules.copula.base import Copula
-from copula_scengen.modules.functions.pseudoobservations import compute_pseudoobservations
+from copula_scengen.modules.copula.copula_grid import CopulaGrid, CumulativeCopulaGrid
+from copula_scengen.modules.copula.dominance_counter import DominanceCounter
+from copula_scengen.modules.margin_profiles import MarginProfile
+
+DEFAULT_MEMORY_BUDGET = 1 << 26
 
 
 class EmpiricalCopula(Copula):
-    def __init__(self, data: np.ndarray) -> None:
+    """
+    Empirical copula of ``data``: the fraction of pseudo-observations dominated by a query point.
+
+    :meth:`__call__` never allocates more than about ``memory_budget`` bytes of temporaries.
+    Query batches whose ``queries x observations x margins`` comparison fits in the budget are
+    broadcast in one go; larger ones are answered by a merge-sort-tree dominance count for two
+    margins and by the broadcast over row chunks that fit the budget otherwise. All three give
+    identical results.
+
+    With observation ``weights`` (or weighted ``margin_profiles``) every row counts with its
+    weight, as if it were repeated that many times. ``data`` may be omitted when
+    ``margin_profiles`` are given, so that shared profiles are used without copying any columns.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray | None = None,
+        margin_profiles: Sequence[MarginProfile] | None = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        weights: np.ndarray | None = None,
+    ) -> None:
+        if data is None and margin_profiles is None:
+            msg = "Either data or margin_profiles must be given"
+            raise ValueError(msg)
         self.data = data
+        self._margin_profiles = margin_profiles
+        self.memory_budget = memory_budget
+        self._weights = weights
+
+    @cached_property
+    def margin_profiles(self) -> Sequence[MarginProfile]:
+        """Profiles of the columns of ``data``, either shared by the caller or built here."""
+        if self._margin_profiles is not None:
+            return self._margin_profiles
+        return [MarginProfile(values=self.data[:, j], weights=self._weights) for j in range(self.data.shape[1])]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """``(observations, margins)`` of the underlying data."""
+        return self.margin_profiles[0].size, len(self.margin_profiles)
+
+    @property
+    def weights(self) -> np.ndarray | None:
+        return self.margin_profiles[0].weights
+
+    @property
+    def total_weight(self) -> float:
+        return self.margin_profiles[0].total_weight
 
     @cached_property
     def pseudo_observations(self) -> np.ndarray:
-        per_margin = [compute_pseudoobservations(self.data[:, j]) for j in range(self.data.shape[1])]
+        per_margin = [profile.pseudo_observations for profile in self.margin_profiles]
         return np.vstack(per_margin).T.astype(float)
 
+    @cached_property
+    def _dominance_counter(self) -> DominanceCounter:
+        first, second = (profile.ranks for profile in self.margin_profiles)
+        return DominanceCounter(first=first, second=second, weights=self.weights)
+
     def __call__(self, args: np.ndarray) -> np.ndarray:
         # allow (d,) -> (1, d)
         if args.ndim == 1:
             args = args[None, :]
 
-        return np.mean((args[:, None, :] >= self.pseudo_observations[None, :, :]).all(axis=2), axis=1)
+        n, d = self.shape
+        if args.shape[1] != d:
+            msg = f"Expected query points with {d} coordinates, got {args.shape[1]}"
+            raise ValueError(msg)
+
+        # the broadcast holds a ``(rows, n, d)`` comparison and its ``(rows, n)`` reduction,
+        # which is cast to float for a weighted sum
+        bytes_per_pair = d + 1 if self.weights is None else d + 9
+        rows_per_chunk = max(1, self.memory_budget // max(n * bytes_per_pair, 1))
+        if args.shape[0] <= rows_per_chunk:
+            return self._broadcast(args)
+        if d == 2:  # noqa: PLR2004
+            return self._dominance_count(args)
+        return np.concatenate(
+            [self._broadcast(args[start : start + rows_per_chunk]) for start in range(0, args.shape[0], rows_per_chunk)]
+        )
+
+    def _broadcast(self, args: np.ndarray) -> np.ndarray:
+        dominated = (args[:, None, :] >= self.pseudo_observations[None, :, :]).all(axis=2)
+        if self.weights is None:
+            return np.count_nonzero(dominated, axis=1) / self.shape[0]
+        return dominated @ self.weights / self.total_weight
+
+    def _dominance_count(self, args: np.ndarray) -> np.ndarray:
+        """Evaluate a 2-margin copula through :class:`DominanceCounter` on the integer ranks."""
+        n = self.shape[0]
+        # count, per axis, the ranks whose pseudo-observation (``rank / n`` unweighted) is ``<= arg``
+        if self.weights is None:
+            levels = [np.arange(n) / n] * 2
+        else:
+            levels = [profile.sorted_pseudo_observations for profile in self.margin_profiles]
+        t0, t1 = (np.searchsorted(levels[axis], args[:, axis], side="right") for axis in range(2))
+        counts = self._dominance_counter.count(t0, t1)
+        counts[np.isnan(args).any(axis=1)] = 0
+        return counts / self.total_weight
 
     def cumulative_counts(self, thresholds: list[np.ndarray]) -> np.ndarray:
         """
@@ -36,26 +126,42 @@ class EmpiricalCopula(Copula):
         :meth:`__call__`, and is bit-identical because each point is binned at the smallest
         threshold index ``j`` with ``thresholds[a][j] >= pseudo`` (matching the ``>=`` test).
         """
-        pseudo = self.pseudo_observations
-        n, d = pseudo.shape
+        pseudo = [profile.pseudo_observations for profile in self.margin_profiles]
+        n, d = pseudo[0].size, len(pseudo)
         shape = tuple(t.size for t in thresholds)
 
         # smallest index j on each axis with thresholds[a][j] >= pseudo; == size means the
         # point exceeds every threshold on that axis and therefore contributes nowhere.
-        per_axis_idx = [np.searchsorted(thresholds[a], pseudo[:, a], side="left") for a in range(d)]
+        per_axis_idx = [np.searchsorted(thresholds[a], pseudo[a], side="left") for a in range(d)]
         valid = np.ones(n, dtype=bool)
         for a in range(d):
             valid &= per_axis_idx[a] < shape[a]
 
-        counts = np.zeros(shape, dtype=np.int64)
-        np.add.at(counts, tuple(idx[valid] for idx in per_axis_idx), 1)
+        if self.weights is None:
+            counts = np.zeros(shape, dtype=np.int64)
+            np.add.at(counts, tuple(idx[valid] for idx in per_axis_idx), 1)
+        else:
+            counts = np.zeros(shape, dtype=float)
+            np.add.at(counts, tuple(idx[valid] for idx in per_axis_idx), self.weights[valid])
 
         grid = counts
         for a in range(d):
             grid = np.cumsum(grid, axis=a)
-        return grid / n
+        return grid / self.total_weight
+
+    def cumulative_columns(self, thresholds: list[np.ndarray]) -> CumulativeCopulaGrid:
+        """Stream the columns of :meth:`cumulative_counts` for a 2-margin copula."""
+        first, second = (profile.pseudo_observations for profile in self.margin_profiles)
+        return CumulativeCopulaGrid(pseudo_observations=(first, second), thresholds=thresholds, weights=self.weights)
 
     def grid(self, max_rank: int) -> np.ndarray:
         """Evaluate the copula on the lattice ``(i / max_rank)`` per axis, exactly and quickly."""
         coords = np.arange(max_rank + 1) / max_rank
-        return self.cumulative_counts([coords] * self.data.shape[1])
+        return self.cumulative_counts([coords] * self.shape[1])
+
+    def grid_columns(self, max_rank: int) -> CopulaGrid:
+        if self.shape[1] != 2:  # noqa: PLR2004
+            return super().grid_columns(max_rank)
+
+        coords = np.arange(max_rank + 1) / max_rank
+        return self.cumulative_columns([coords, coords])
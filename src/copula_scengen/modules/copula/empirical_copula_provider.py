@@ -3,9 +3,16 @@ from collections.abc import Sequence
 import pandas as pd
 
 from copula_scengen.modules.copula.base import CopulaProvider
-from copula_scengen.modules.copula.empirical_copula import EmpiricalCopula
+from copula_scengen.modules.copula.empirical_copula import DEFAULT_MEMORY_BUDGET, EmpiricalCopula
+from copula_scengen.modules.margin_profiles import MarginProfiles
 
 
 class EmpiricalCopulaProvider(CopulaProvider):
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> None:
+        self._memory_budget = memory_budget
+
     def get(self, data: pd.DataFrame, margins: Sequence[int]) -> EmpiricalCopula:
-        return EmpiricalCopula(data=data.iloc[:, list(margins)].to_numpy())
+        return EmpiricalCopula(data=data.iloc[:, list(margins)].to_numpy(), memory_budget=self._memory_budget)
+
+    def from_profiles(self, margin_profiles: MarginProfiles, margins: Sequence[int]) -> EmpiricalCopula:
+        return EmpiricalCopula(margin_profiles=margin_profiles.select(margins), memory_budget=self._memory_budget)
@@ -1,11 +1,13 @@
+from collections.abc import Sequence
 from functools import cached_property
 from itertools import combinations
 
 import numpy as np
 
 from copula_scengen.modules.copula.base import Copula
-from copula_scengen.modules.copula.empirical_copula import EmpiricalCopula
-from copula_scengen.schemas.margin_type import is_discrete
+from copula_scengen.modules.copula.copula_grid import CopulaGrid
+from copula_scengen.modules.copula.empirical_copula import DEFAULT_MEMORY_BUDGET, EmpiricalCopula
+from copula_scengen.modules.margin_profiles import MarginProfile
 
 _TOLERANCE = 1e-9
 
@@ -23,25 +25,30 @@ class ExtendedEmpiricalCopula(Copula):
     where v_i^S = v_i^+ if i in S else v_i^-, with v_i^-, v_i^+ the lower/upper "steps"
     (nearest attained CDF values) around v_i, and lambda_i the linear interpolation weight
     between them (zero when v_i is itself an attained CDF value).
+
+    ``memory_budget`` bounds the temporaries of each evaluation of the inner empirical copula;
+    ``weights`` are observation weights and ``data`` is optional as in :class:`EmpiricalCopula`.
     """
 
-    def __init__(self, data: np.ndarray) -> None:
+    def __init__(
+        self,
+        data: np.ndarray | None = None,
+        margin_profiles: Sequence[MarginProfile] | None = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        weights: np.ndarray | None = None,
+    ) -> None:
         self.data = data
-        self._inner_copula = EmpiricalCopula(data=self.data)
-        self._discrete_margins = [j for j in range(self.data.shape[1]) if is_discrete(self.data[:, j])]
+        self._inner_copula = EmpiricalCopula(
+            data=self.data, margin_profiles=margin_profiles, memory_budget=memory_budget, weights=weights
+        )
+        profiles = self._inner_copula.margin_profiles
+        self._discrete_margins = [j for j, profile in enumerate(profiles) if profile.is_discrete]
 
     @cached_property
     def _jump_points(self) -> dict[int, np.ndarray]:
         """For each discrete margin, the sorted, distinct, attained CDF values (range of F), with a leading 0.0."""
-        jump_points = {}
-        n = self.data.shape[0]
-        for j in self._discrete_margins:
-            column = self.data[:, j]
-            min_val = int(np.min(column))
-            value_counts = np.bincount((column - min_val).astype(int))
-            cumulative = np.cumsum(value_counts) / n
-            jump_points[j] = np.concatenate(([0.0], cumulative))
-        return jump_points
+        profiles = self._inner_copula.margin_profiles
+        return {j: profiles[j].jump_points for j in self._discrete_margins}
 
     def _steps(self, j: int, v: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
         """Compute v^- and v^+ (lower/upper steps) for margin j, vectorized over query points v."""
@@ -98,66 +105,155 @@ class ExtendedEmpiricalCopula(Copula):
 
         return result
 
-    def grid(self, max_rank: int) -> np.ndarray:
+    def _axis_lattice(
+        self, coords: Sequence[np.ndarray]
+    ) -> tuple[list[np.ndarray], list[np.ndarray], list[np.ndarray], list[np.ndarray | None]]:
         """
-        Evaluate the copula on the ``(i / max_rank, r / max_rank)`` lattice, exactly and quickly.
-
-        Restricted to the 2-margin case used by the generator. The inner empirical copula is
-        evaluated a single time on the (small) product of per-axis query values -- lattice
-        coordinates for continuous axes, jump points for discrete axes -- via its cumulative
-        histogram, instead of a full broadcast per subset. Falls back to the batched
-        ``__call__`` for other dimensionalities.
+        Per axis: the sorted query values fed to the inner copula, plus, for each lattice
+        coordinate ``coords[axis]``, the index of its lower/upper step within those values and
+        the weight.
         """
-        coords = np.arange(max_rank + 1) / max_rank
-
-        if self.data.shape[1] != 2:  # noqa: PLR2004
-            first, second = np.meshgrid(coords, coords, indexing="ij")
-            args = np.column_stack((first.ravel(), second.ravel()))
-            return self(args).reshape(max_rank + 1, max_rank + 1)
-
-        if not self._discrete_margins:
-            return self._inner_copula.grid(max_rank)
-
-        # Per axis: the sorted query values fed to the inner copula, plus, for each lattice
-        # coordinate, the index of its lower/upper step within those values and the weight.
         axis_values: list[np.ndarray] = []
         lower_idx: list[np.ndarray] = []
         upper_idx: list[np.ndarray] = []
-        weights: list[np.ndarray] = []
-        for axis in range(2):
+        weights: list[np.ndarray | None] = []
+        for axis, axis_coords in enumerate(coords):
             if axis in self._discrete_margins:
-                low, up, wgt = self._lambda(axis, coords)
+                low, up, wgt = self._lambda(axis, axis_coords)
                 values = self._jump_points[axis]
                 axis_values.append(values)
                 lower_idx.append(np.searchsorted(values, low))
                 upper_idx.append(np.searchsorted(values, up))
                 weights.append(wgt)
             else:
-                axis_values.append(coords)
-                identity = np.arange(coords.size)
-                lower_idx.append(identity)
-                upper_idx.append(identity)
+                values, positions = np.unique(axis_coords, return_inverse=True)
+                axis_values.append(values)
+                lower_idx.append(positions)
+                upper_idx.append(positions)
                 weights.append(None)
+        return axis_values, lower_idx, upper_idx, weights
 
+    def lattice(self, coords: Sequence[np.ndarray]) -> np.ndarray:
+        """
+        Evaluate the copula on the product lattice ``coords[0] x ... x coords[d - 1]``.
+
+        ``coords[a]`` holds the (not necessarily sorted) query values of axis ``a``; the result
+        has shape ``tuple(c.size for c in coords)``. The inner empirical copula is evaluated a
+        single time on the product of per-axis query values -- the coordinates for continuous
+        axes, the jump points for discrete ones -- via its cumulative histogram. Each of the
+        ``2 ** |discrete|`` subset terms then gathers from that histogram and is weighted by the
+        tensor product of the per-axis interpolation weights.
+        """
+        if len(coords) != self._inner_copula.shape[1]:
+            msg = f"Expected coordinates for {self._inner_copula.shape[1]} axes, got {len(coords)}"
+            raise ValueError(msg)
+
+        axis_values, lower_idx, upper_idx, weights = self._axis_lattice(coords)
         inner_grid = self._inner_copula.cumulative_counts(axis_values)
+        if not self._discrete_margins:
+            return inner_grid[np.ix_(*lower_idx)]
 
-        result = np.zeros((max_rank + 1, max_rank + 1), dtype=float)
+        shape = tuple(np.size(axis_coords) for axis_coords in coords)
+        result = np.zeros(shape, dtype=float)
         for subset_size in range(len(self._discrete_margins) + 1):
             for subset in combinations(self._discrete_margins, subset_size):
-                idx0 = upper_idx[0] if 0 in subset else lower_idx[0]
-                idx1 = upper_idx[1] if 1 in subset else lower_idx[1]
+                idx = [upper_idx[a] if a in subset else lower_idx[a] for a in range(len(coords))]
+                weight = np.ones((1,) * len(coords))
+                for a in self._discrete_margins:
+                    factor = weights[a] if a in subset else 1.0 - weights[a]
+                    weight = weight * factor.reshape([-1 if axis == a else 1 for axis in range(len(coords))])
+                result += weight * inner_grid[np.ix_(*idx)]
+
+        return result
+
+    def grid(self, max_rank: int) -> np.ndarray:
+        """
+        Evaluate the copula on the ``i / max_rank`` lattice along every axis, exactly and quickly.
+
+        Delegates to :meth:`lattice`, which never evaluates the inner copula per query point.
+        """
+        if not self._discrete_margins:
+            return self._inner_copula.grid(max_rank)
+
+        coords = np.arange(max_rank + 1) / max_rank
+        return self.lattice([coords] * self._inner_copula.shape[1])
+
+    def grid_columns(self, max_rank: int) -> CopulaGrid:
+        """
+        Lazy counterpart of :meth:`grid` for the 2-margin case, bit-identical column by column.
+
+        Streams the two inner columns each lattice column needs (at the lower and the upper
+        step of the second axis) instead of materializing the inner cumulative histogram.
+        """
+        if self._inner_copula.shape[1] != 2:  # noqa: PLR2004
+            return super().grid_columns(max_rank)
+
+        if not self._discrete_margins:
+            return self._inner_copula.grid_columns(max_rank)
+
+        coords = np.arange(max_rank + 1) / max_rank
+        axis_values, lower_idx, upper_idx, weights = self._axis_lattice([coords, coords])
+        return ExtendedCopulaGrid(
+            lower_columns=self._inner_copula.cumulative_columns(axis_values),
+            upper_columns=self._inner_copula.cumulative_columns(axis_values),
+            lower_idx=lower_idx,
+            upper_idx=upper_idx,
+            weights=weights,
+            discrete_margins=self._discrete_margins,
+        )
+
+
+class ExtendedCopulaGrid(CopulaGrid):
+    """
+    Columns of :meth:`ExtendedEmpiricalCopula.grid` for two margins, combined from the streamed
+    inner columns at the lower and upper steps of the second axis.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        lower_columns: CopulaGrid,
+        upper_columns: CopulaGrid,
+        lower_idx: list[np.ndarray],
+        upper_idx: list[np.ndarray],
+        weights: list[np.ndarray | None],
+        discrete_margins: list[int],
+    ) -> None:
+        self._lower_columns = lower_columns
+        self._upper_columns = upper_columns
+        self._lower_idx = lower_idx
+        self._upper_idx = upper_idx
+        self._weights = weights
+        self._discrete_margins = discrete_margins
+
+    def column(self, index: int) -> np.ndarray:
+        size = self._lower_idx[0].size
+        result = np.zeros(size, dtype=float)
+        for subset_size in range(len(self._discrete_margins) + 1):
+            for subset in combinations(self._discrete_margins, subset_size):
+                idx0 = self._upper_idx[0] if 0 in subset else self._lower_idx[0]
+                inner_column = (
+                    self._upper_columns.column(self._upper_idx[1][index])
+                    if 1 in subset
+                    else self._lower_columns.column(self._lower_idx[1][index])
+                )
 
                 factor0 = (
-                    np.ones(max_rank + 1)
+                    np.ones(size)
                     if 0 not in self._discrete_margins
-                    else (weights[0] if 0 in subset else 1.0 - weights[0])
+                    else (self._weights[0] if 0 in subset else 1.0 - self._weights[0])
                 )
                 factor1 = (
-                    np.ones(max_rank + 1)
+                    1.0
                     if 1 not in self._discrete_margins
-                    else (weights[1] if 1 in subset else 1.0 - weights[1])
+                    else (self._weights[1][index] if 1 in subset else 1.0 - self._weights[1][index])
                 )
 
-                result += np.outer(factor0, factor1) * inner_grid[np.ix_(idx0, idx1)]
+                result += (factor0 * factor1) * inner_column[idx0]
 
         return result
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [*self._lower_idx, *self._upper_idx, *(weight for weight in self._weights if weight is not None)]
+        return self._lower_columns.nbytes + self._upper_columns.nbytes + sum(array.nbytes for array in arrays)
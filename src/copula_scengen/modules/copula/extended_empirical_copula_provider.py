@@ -3,9 +3,19 @@ from collections.abc import Sequence
 import pandas as pd
 
 from copula_scengen.modules.copula.base import CopulaProvider
+from copula_scengen.modules.copula.empirical_copula import DEFAULT_MEMORY_BUDGET
 from copula_scengen.modules.copula.extended_empirical_copula import ExtendedEmpiricalCopula
+from copula_scengen.modules.margin_profiles import MarginProfiles
 
 
 class ExtendedEmpiricalCopulaProvider(CopulaProvider):
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> None:
+        self._memory_budget = memory_budget
+
     def get(self, data: pd.DataFrame, margins: Sequence[int]) -> ExtendedEmpiricalCopula:
-        return ExtendedEmpiricalCopula(data=data.iloc[:, list(margins)].to_numpy())
+        return ExtendedEmpiricalCopula(data=data.iloc[:, list(margins)].to_numpy(), memory_budget=self._memory_budget)
+
+    def from_profiles(self, margin_profiles: MarginProfiles, margins: Sequence[int]) -> ExtendedEmpiricalCopula:
+        return ExtendedEmpiricalCopula(
+            margin_profiles=margin_profiles.select(margins), memory_budget=self._memory_budget
+        )
@@ -0,0 +1,39 @@
+import hashlib
+from collections.abc import Sequence
+from itertools import combinations
+
+import pandas as pd
+
+from copula_scengen.modules.copula.base import CopulaProvider
+from copula_scengen.modules.copula.histogram_copula import HistogramCopula
+from copula_scengen.modules.copula.pairwise_histogram_accumulator import PairwiseHistogramAccumulator
+
+
+class HistogramCopulaProvider(CopulaProvider):
+    """
+    Serve the pairwise copulas of a :class:`PairwiseHistogramAccumulator`, matched by column name.
+
+    The rows of ``data`` are never read, so a generator can be run on a frame that only
+    carries the column names, e.g. ``pd.DataFrame(columns=accumulator.columns)``.
+    """
+
+    def __init__(self, accumulator: PairwiseHistogramAccumulator) -> None:
+        self._accumulator = accumulator
+
+    def get(self, data: pd.DataFrame, margins: Sequence[int]) -> HistogramCopula:
+        if len(margins) != 2:  # noqa: PLR2004
+            msg = f"Histogram copulas have exactly two margins, got {len(margins)}"
+            raise ValueError(msg)
+        first, second = (data.columns[margin] for margin in margins)
+        return self._accumulator.copula(first, second)
+
+    @property
+    def cache_token(self) -> str:
+        """The provider class and a digest of the accumulated edges and counts, which the copulas come from."""
+        digest = hashlib.sha256(repr([self._accumulator.columns, self._accumulator.n_rows]).encode())
+        for edges, counts in zip(self._accumulator.edges, self._accumulator.marginal_counts, strict=True):
+            digest.update(edges.tobytes())
+            digest.update(counts.tobytes())
+        for first, second in combinations(self._accumulator.columns, 2):
+            digest.update(self._accumulator.pair_counts(first, second).tobytes())
+        return f"{super().cache_token}:{digest.hexdigest()}"
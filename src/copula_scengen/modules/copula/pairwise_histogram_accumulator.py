@@ -0,0 +1,243 @@
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from copula_scengen.modules.copula.histogram_copula import HistogramCopula
+from copula_scengen.modules.margin_profiles import MarginProfile, MarginProfiles
+from copula_scengen.schemas.margin_type import MarginType, is_discrete
+
+DEFAULT_N_BINS = 128
+
+
+class PairwiseHistogramAccumulator:
+    """
+    Online summary of a growing history: a sketch of every column and every pairwise 2D histogram.
+
+    Chunks of rows are fed to :meth:`update` (or a whole iterator of them to :meth:`update_from`,
+    e.g. ``pd.read_csv(path, chunksize=...)`` or the record batches of a Parquet file converted
+    with ``to_pandas()``), and only the counts are kept, never the rows. :meth:`copula` then
+    returns the :class:`HistogramCopula` of any pair, whose grids are what the greedy
+    assignment needs as its targets, and :meth:`margin_profiles` the column sketches as
+    weighted profiles, which the transformers turn into scenario values.
+
+    Every column is cut into bins, ``edges[column]`` holding their sorted right edges, and keeps
+    the count and the sum of the values of each bin. A discrete column has one bin per distinct
+    value, and a value it has not seen before gets a bin of its own, so atoms are never merged.
+    A continuous column starts from up to ``n_bins`` bins between quantiles of the first chunk
+    and adapts to later ones: values beyond the range seen so far get up to ``n_bins`` new bins
+    between their own quantiles, after which the adjacent bins with the smallest joint count
+    are merged until ``n_bins`` remain. Merging sums counts, value sums and the rows or columns
+    of the pairwise histograms, so it is exact, and a merged bin holds at most ``2 / n_bins`` of
+    the rows seen when it was formed, so the bins follow a history that drifts out of its range.
+    Bins are never split, though: rows that later pile up inside one bin stay in it, summarized
+    by its count and mean. Columns with given ``edges`` keep them fixed instead, with open-ended
+    outer bins; their counts then do not depend on how the history is chunked. NaNs are
+    skipped, pairwise. ``margin_types`` declares columns discrete or continuous instead of
+    inferring it; columns with given ``edges`` are continuous unless declared discrete.
+    The memory is ``O(n_columns ** 2 * n_bins ** 2)`` whatever the number of rows ingested.
+    """
+
+    def __init__(
+        self,
+        n_bins: int = DEFAULT_N_BINS,
+        edges: Mapping[Hashable, np.ndarray] | None = None,
+        margin_types: Mapping[Hashable, MarginType] | None = None,
+    ) -> None:
+        if n_bins < 1:
+            msg = "n_bins must be a positive int"
+            raise ValueError(msg)
+        self.n_bins = n_bins
+        self._given_edges = dict(edges or {})
+        self._margin_types = {column: MarginType(margin_type) for column, margin_type in (margin_types or {}).items()}
+        self.columns: list[Hashable] = []
+        self.edges: list[np.ndarray] = []
+        self.marginal_counts: list[np.ndarray] = []
+        self._value_sums: list[np.ndarray] = []
+        self._pair_counts: dict[tuple[int, int], np.ndarray] = {}
+        self._discrete: list[bool] = []
+        # smallest value seen in each adaptive continuous column, the lower end of its first bin
+        self._minimum: dict[int, float] = {}
+        self.n_rows = 0
+
+    def _is_discrete(self, column: Hashable, values: np.ndarray) -> bool:
+        margin_type = self._margin_types.get(column)
+        if margin_type is not None:
+            return margin_type == MarginType.DISCRETE
+        return column not in self._given_edges and is_discrete(values)
+
+    def _quantile_edges(self, values: np.ndarray) -> np.ndarray:
+        return np.unique(np.quantile(values, np.linspace(0, 1, self.n_bins + 1)[1:]))
+
+    def _learn_edges(self, margin: int, values: np.ndarray) -> np.ndarray:
+        column = self.columns[margin]
+        finite = values[~np.isnan(values)]
+        if column in self._given_edges:
+            edges = np.sort(np.asarray(self._given_edges[column], dtype=float))
+            if self._discrete[margin] or (edges.size and edges[-1] == np.inf):
+                return edges
+            # fixed bins: the top one is open-ended, as the first one is open below
+            return np.append(edges, np.inf)
+        if finite.size == 0:
+            msg = f"Cannot derive bins for column {column!r} from a chunk without values"
+            raise ValueError(msg)
+        if self._discrete[margin]:
+            return np.unique(finite)
+        self._minimum[margin] = finite.min()
+        return self._quantile_edges(finite)
+
+    def _initialize(self, chunk: pd.DataFrame) -> None:
+        self.columns = list(chunk.columns)
+        self._discrete = []
+        self.edges = []
+        for margin, column in enumerate(self.columns):
+            values = chunk[column].to_numpy(dtype=float)
+            self._discrete.append(self._is_discrete(column, values[~np.isnan(values)]))
+            self.edges.append(self._learn_edges(margin, values))
+        self.marginal_counts = [np.zeros(edges.size, dtype=np.int64) for edges in self.edges]
+        self._value_sums = [np.zeros(edges.size, dtype=float) for edges in self.edges]
+        self._pair_counts = {
+            (first, second): np.zeros((self.edges[first].size, self.edges[second].size), dtype=np.int64)
+            for first, second in combinations(range(len(self.columns)), 2)
+        }
+
+    def _regroup(self, margin: int, edges: np.ndarray, combine: Callable[[np.ndarray, int], np.ndarray]) -> None:
+        """Replace the bins of ``margin`` by ``edges``, mapping every count array along its axis with ``combine``."""
+        self.marginal_counts[margin] = combine(self.marginal_counts[margin], 0)
+        self._value_sums[margin] = combine(self._value_sums[margin], 0)
+        for (first, second), pair in self._pair_counts.items():
+            if margin in (first, second):
+                self._pair_counts[first, second] = combine(pair, 0 if margin == first else 1)
+        self.edges[margin] = edges
+
+    def _insert_bins(self, margin: int, new_edges: np.ndarray) -> None:
+        """Add empty bins with right edges ``new_edges``, none of which is an edge already."""
+        grown = np.union1d(self.edges[margin], new_edges)
+        # where the existing bins move to among the grown ones
+        kept = np.searchsorted(grown, self.edges[margin])
+
+        def combine(counts: np.ndarray, axis: int) -> np.ndarray:
+            shape = list(counts.shape)
+            shape[axis] = grown.size
+            result = np.zeros(shape, dtype=counts.dtype)
+            index = [slice(None)] * counts.ndim
+            index[axis] = kept
+            result[tuple(index)] = counts
+            return result
+
+        self._regroup(margin, grown, combine)
+
+    def _merge_bins(self, margin: int) -> None:
+        """Merge the adjacent bins of ``margin`` with the smallest joint count until ``n_bins`` remain."""
+        counts = list(self.marginal_counts[margin])
+        starts = list(range(len(counts)))
+        while len(counts) > self.n_bins:
+            joint = np.add(counts[:-1], counts[1:])
+            merged = int(np.argmin(joint))
+            counts[merged] = joint[merged]
+            del counts[merged + 1], starts[merged + 1]
+        # each merged bin keeps the right edge of its last part
+        edges = self.edges[margin][[*(start - 1 for start in starts[1:]), len(self.edges[margin]) - 1]]
+        self._regroup(margin, edges, lambda values, axis: np.add.reduceat(values, starts, axis=axis))
+
+    def _extend_range(self, margin: int, values: np.ndarray) -> None:
+        """Give the values of ``margin`` outside the bins it has so far bins of their own."""
+        finite = values[~np.isnan(values)]
+        edges = self.edges[margin]
+        if self._discrete[margin]:
+            new_edges = np.setdiff1d(finite, edges)
+        elif margin in self._minimum:
+            below = finite[finite < self._minimum[margin]]
+            above = finite[finite > edges[-1]]
+            # the quantiles of the values below all end under the current minimum, so none is an edge yet
+            new_edges = np.concatenate(
+                [self._quantile_edges(part) for part in (below, above) if part.size] or [np.empty(0)]
+            )
+            if below.size:
+                self._minimum[margin] = below.min()
+        else:
+            return
+        if new_edges.size:
+            self._insert_bins(margin, new_edges)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Add the rows of ``chunk``, whose columns must be those of the first chunk, in any order."""
+        if not self.columns:
+            self._initialize(chunk)
+        missing = [column for column in self.columns if column not in chunk.columns]
+        if missing:
+            msg = f"Chunk is missing columns {missing}"
+            raise ValueError(msg)
+
+        values = chunk[self.columns].to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        bins = np.empty(values.shape, dtype=np.intp)
+        for margin in range(len(self.columns)):
+            self._extend_range(margin, values[:, margin])
+            edges = self.edges[margin]
+            # every value has a bin: new ones were just added, fixed edges end at ``inf``
+            bins[:, margin] = np.searchsorted(edges, values[:, margin], side="left")
+            observed = bins[present[:, margin], margin]
+            self.marginal_counts[margin] += np.bincount(observed, minlength=edges.size)
+            self._value_sums[margin] += np.bincount(
+                observed, weights=values[present[:, margin], margin], minlength=edges.size
+            )
+
+        for (first, second), counts in self._pair_counts.items():
+            valid = present[:, first] & present[:, second]
+            flat = bins[valid, first] * counts.shape[1] + bins[valid, second]
+            counts[...] += np.bincount(flat, minlength=counts.size).reshape(counts.shape)
+        self.n_rows += values.shape[0]
+
+        for margin in self._minimum:
+            if self.edges[margin].size > self.n_bins:
+                self._merge_bins(margin)
+
+    def update_from(self, chunks: Iterable[pd.DataFrame]) -> None:
+        for chunk in chunks:
+            self.update(chunk)
+
+    def pair_counts(self, first: Hashable, second: Hashable) -> np.ndarray:
+        """Joint bin counts of columns ``first`` (rows) and ``second`` (columns)."""
+        first_index, second_index = self.columns.index(first), self.columns.index(second)
+        if first_index == second_index:
+            msg = "A pair needs two different columns"
+            raise ValueError(msg)
+        if first_index < second_index:
+            return self._pair_counts[first_index, second_index]
+        return self._pair_counts[second_index, first_index].T
+
+    def copula(self, first: Hashable, second: Hashable) -> HistogramCopula:
+        return HistogramCopula(counts=self.pair_counts(first, second))
+
+    def margin_profile(self, column: Hashable) -> MarginProfile:
+        """
+        Sketch of ``column`` as a weighted profile: every non-empty bin is one row weighted by its count.
+
+        A discrete bin stands for its value, a continuous one for the mean of its values, so the
+        profile has the column's exact mean and its quantiles are accurate to about one bin.
+        """
+        margin = self.columns.index(column)
+        counts = self.marginal_counts[margin]
+        filled = counts > 0
+        if self._discrete[margin]:
+            values = self.edges[margin][filled]
+        else:
+            values = self._value_sums[margin][filled] / counts[filled]
+        margin_type = MarginType.DISCRETE if self._discrete[margin] else MarginType.CONTINUOUS
+        return MarginProfile(values=values, weights=counts[filled].astype(float), margin_type=margin_type)
+
+    def margin_profiles(self) -> MarginProfiles:
+        """The sketches of all columns, for the transformers; the store carries the column names, no rows."""
+        profiles = [self.margin_profile(column) for column in self.columns]
+        return MarginProfiles(
+            pd.DataFrame(columns=self.columns),
+            profiles=profiles,
+            margin_types=[profile.margin_type for profile in profiles],
+        )
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [*self.edges, *self.marginal_counts, *self._value_sums, *self._pair_counts.values()]
+        return sum(array.nbytes for array in arrays)
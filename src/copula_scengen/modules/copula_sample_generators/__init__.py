@@ -1,7 +1,11 @@
 from copula_scengen.modules.copula_sample_generators.base import CopulaSampleGenerationStrategy
+from copula_scengen.modules.copula_sample_generators.cancellation import CancellationToken
 from copula_scengen.modules.copula_sample_generators.copula_sample_generator import CopulaSampleGenerator
+from copula_scengen.modules.copula_sample_generators.result_cache import ResultCache
 
 __all__ = [
+    "CancellationToken",
     "CopulaSampleGenerationStrategy",
     "CopulaSampleGenerator",
+    "ResultCache",
 ]
@@ -1,11 +1,27 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 import pandas as pd
 
 from copula_scengen.modules.copula.copula_sample import CopulaSample
+from copula_scengen.modules.margin_profiles import MarginProfiles
+from copula_scengen.schemas.generation_report import GenerationReport
 
 
 class CopulaSampleGenerationStrategy(ABC):
+    # how the latest ``create`` call ended, for strategies that can stop early
+    last_report: GenerationReport | None = None
+
     @abstractmethod
     def create(self, data: pd.DataFrame, n_scenarios: int) -> CopulaSample:
         """Create a rank-based copula sample."""
+
+    def create_from_profiles(self, margin_profiles: MarginProfiles, n_scenarios: int) -> CopulaSample:
+        """Create a copula sample for ``margin_profiles.data``, reusing its shared column profiles."""
+        return self.create(data=margin_profiles.data, n_scenarios=n_scenarios)
+
+    def create_batch(self, margin_profiles: Sequence[MarginProfiles], n_scenarios: int) -> list[CopulaSample]:
+        """Create one copula sample per store in ``margin_profiles``; strategies may batch the work."""
+        return [
+            self.create_from_profiles(margin_profiles=profiles, n_scenarios=n_scenarios) for profiles in margin_profiles
+        ]
@@ -0,0 +1,51 @@
+import numpy as np
+
+from copula_scengen.modules.copula.copula_grid import CopulaGrid
+from copula_scengen.modules.copula_sample_generators.incremental_deviation_cache import deviation_rows
+
+
+class BatchedDeviationCache:
+    """
+    :class:`IncrementalDeviationCache` for a batch of independent assignments of the same margin.
+
+    Each of the ``B`` jobs matches its new margin against the same number ``P`` of prior
+    margins, so the sample counts, target columns and cache matrices all stack on a leading
+    batch axis and one rank of every job is handled by a single set of array operations. As in
+    the per-job cache, only the column of each target grid for the current rank is read, into a
+    ``(B, P, max_rank + 1)`` buffer, so the cache itself holds ``O(B * P * max_rank)`` values
+    besides the grids. Every job's values are those of its own :class:`IncrementalDeviationCache`.
+    """
+
+    def __init__(
+        self, target_grids: list[list[CopulaGrid]], max_rank: int, count_dtype: np.dtype | type = np.int64
+    ) -> None:
+        self.max_rank = max_rank
+        self._target_grids = target_grids
+        n_jobs, n_priors = len(target_grids), len(target_grids[0])
+
+        self._target_column = np.empty((n_jobs, n_priors, max_rank + 1), dtype=float)
+        self._sample_counts = np.zeros((n_jobs, n_priors, max_rank + 1), dtype=count_dtype)
+        # an assignment at ``rank`` bumps every ``i >= rank``; ``0`` mirrors ``max_rank`` (see CopulaSample2D)
+        self._bump_lattice = np.arange(max_rank + 1)
+        self._bump_lattice[0] = max_rank
+
+    @property
+    def nbytes(self) -> int:
+        grids = sum(target_grid.nbytes for grids in self._target_grids for target_grid in grids)
+        return grids + self._target_column.nbytes + self._sample_counts.nbytes
+
+    def at_rank(self, rank: int) -> np.ndarray:
+        """``(B, P, max_rank)`` cache matrices for assigning ``rank`` given the assignments made so far."""
+        for job, grids in enumerate(self._target_grids):
+            for prior, target_grid in enumerate(grids):
+                self._target_column[job, prior] = target_grid.column(rank)
+        return deviation_rows(sample_counts=self._sample_counts, target_column=self._target_column)
+
+    @staticmethod
+    def total_deviation(cache_matrices: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+        """Summed deviation of every ``(B, k, P)`` candidate row of ``ranks``, as ``DeviationCache.total_deviation``."""
+        return np.take_along_axis(cache_matrices.transpose(0, 2, 1), ranks - 1, axis=1).sum(axis=2)
+
+    def assign(self, ranks: np.ndarray) -> None:
+        """Record, for every job, a scenario whose ranks in its prior margins are the row of ``(B, P)`` ``ranks``."""
+        self._sample_counts += self._bump_lattice >= np.asarray(ranks)[:, :, None]
@@ -0,0 +1,23 @@
+import threading
+import time
+
+
+class CancellationToken:
+    """
+    Cooperative stop signal for a generation run, optionally with a wall-clock deadline.
+
+    The generator polls :attr:`cancelled` once per assigned rank. :meth:`cancel` may be called
+    from any thread, e.g. a signal handler or a scheduler watchdog; ``timeout`` seconds after
+    construction the token reports itself cancelled on its own.
+    """
+
+    def __init__(self, timeout: float | None = None) -> None:
+        self._event = threading.Event()
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (self._deadline is not None and time.monotonic() >= self._deadline)
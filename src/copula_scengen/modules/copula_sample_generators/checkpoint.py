@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from copula_scengen.modules.copula.copula_sample import rank_dtype
+from copula_scengen.modules.margin_profiles import MarginProfiles
+
+_FORMAT_VERSION = 1
+_FILE_NAME = "copula_sample.npz"
+
+
+def fingerprint(margin_profiles: MarginProfiles, initial_ranks: np.ndarray, settings: dict[str, object]) -> str:
+    """
+    Digest of the data and weights, the given ranks and ``settings``.
+
+    Only these reach the digest, so ``settings`` has to name every other input that changes
+    the ranks, such as the copula provider's cache token and the declared margin types.
+    """
+    digest = hashlib.sha256()
+    header = {
+        "format_version": _FORMAT_VERSION,
+        "initial_shape": list(initial_ranks.shape),
+        "columns": [str(column) for column in margin_profiles.columns],
+        "settings": settings,
+    }
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+    for margin in range(len(margin_profiles)):
+        digest.update(np.ascontiguousarray(margin_profiles[margin].values, dtype=float).tobytes())
+    if margin_profiles.weights is not None:
+        digest.update(np.ascontiguousarray(margin_profiles.weights, dtype=float).tobytes())
+    digest.update(np.ascontiguousarray(initial_ranks, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Rank matrix of the margins completed so far, persisted in ``directory`` after each margin.
+
+    The ranks are stored in the smallest unsigned dtype that holds ``n_scenarios``, together
+    with the fingerprint of the run, in a single ``.npz`` file. Every save writes a temporary
+    file in the same directory and moves it into place with :func:`os.replace`, so a crash
+    leaves either the previous or the new checkpoint, never a torn one. A checkpoint whose
+    fingerprint does not match the current run is ignored and eventually overwritten.
+    """
+
+    def __init__(self, directory: str | Path, fingerprint: str) -> None:
+        self.path = Path(directory) / _FILE_NAME
+        self.fingerprint = fingerprint
+
+    def load(self) -> np.ndarray | None:
+        """Return the saved ``(n_scenarios, completed_margins)`` ranks, or ``None`` if there are none to resume."""
+        if not self.path.exists():
+            return None
+        with np.load(self.path, allow_pickle=False) as archive:
+            if str(archive["fingerprint"]) != self.fingerprint:
+                return None
+            return archive["ranks"].astype(int)
+
+    def save(self, ranks: np.ndarray) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        compact = ranks.astype(rank_dtype(ranks.shape[0]))
+        file_descriptor, temporary = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                np.savez(file, ranks=compact, fingerprint=np.array(self.fingerprint))
+                file.flush()
+                os.fsync(file.fileno())
+            Path(temporary).replace(self.path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
@@ -1,62 +1,347 @@
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 
 from copula_scengen.modules.copula.base import CopulaProvider
-from copula_scengen.modules.copula.copula_sample import CopulaSample
-from copula_scengen.modules.copula.copula_sample2d import CopulaSample2D
+from copula_scengen.modules.copula.copula_grid import CopulaGrid, DenseCopulaGrid
+from copula_scengen.modules.copula.copula_sample import CopulaSample, rank_dtype
 from copula_scengen.modules.copula.extended_empirical_copula_provider import ExtendedEmpiricalCopulaProvider
 from copula_scengen.modules.copula_sample_generators.base import CopulaSampleGenerationStrategy
+from copula_scengen.modules.copula_sample_generators.batched_deviation_cache import BatchedDeviationCache
+from copula_scengen.modules.copula_sample_generators.cancellation import CancellationToken
+from copula_scengen.modules.copula_sample_generators.checkpoint import Checkpoint, fingerprint
 from copula_scengen.modules.copula_sample_generators.deviation_cache import DeviationCache
+from copula_scengen.modules.copula_sample_generators.incremental_deviation_cache import IncrementalDeviationCache
+from copula_scengen.modules.copula_sample_generators.result_cache import ResultCache, target_grid_key
+from copula_scengen.modules.margin_profiles import MarginProfiles
+from copula_scengen.modules.observers import GenerationObserver
+from copula_scengen.schemas.generation_report import BudgetPolicy, GenerationOutcome, GenerationReport
+
+
+def _build_target_grid(copula_provider: CopulaProvider, margin_profiles: MarginProfiles, max_rank: int) -> CopulaGrid:
+    """Build the target grid of the 2-margin store ``margin_profiles``; module level so it pickles."""
+    return DeviationCache.target_grid(
+        target_copula=copula_provider.from_profiles(margin_profiles=margin_profiles, margins=[0, 1]),
+        max_rank=max_rank,
+    )
 
 
 class CopulaSampleGenerator(CopulaSampleGenerationStrategy):
-    def __init__(self, copula_provider: CopulaProvider | None = None) -> None:
+    """
+    Greedy, margin-by-margin copula sample generator.
+
+    ``executor`` optionally builds the target grids of the prior margins concurrently. With a
+    ``ThreadPoolExecutor`` the workers share the margin profiles. With a
+    ``ProcessPoolExecutor`` each worker receives only the two columns of its pair and returns
+    the streamed grid, which takes ``O(n_observations + n_scenarios)`` memory. The columns are
+    sorted once, here, and their pseudo-observations shipped with the pairs, so a worker only
+    bins them. Shipping still costs ``O(n_observations)`` per pair in pickling, which only
+    spare cores win back: on a single core the pool is slower than building the grids in
+    process (see ``benchmarks/run_benchmarks.py``). The generator does not shut the executor down.
+
+    ``n_threads > 1`` evaluates the deviations inside the greedy loop on that many threads,
+    sharding the prior margins when building the cache and the candidate scenarios when
+    reducing it. The argmin and its tie-breaking are the same as in the serial loop.
+
+    ``max_prior_margins = k`` matches each new margin against only the ``k`` prior margins with
+    the largest absolute Spearman correlation to it, instead of against all of them, so the
+    number of target grids and the deviation work scale with ``d * k`` rather than ``d ** 2``.
+    Dependence on the skipped pairs is then only reproduced indirectly, through the selected
+    ones. ``None`` (the default) keeps every prior margin.
+
+    ``observer`` receives the stage timings, the per-rank progress of every margin and the
+    build time and size of its target grids.
+
+    Runs can be bounded by a ``cancellation_token`` and/or a ``time_budget`` in seconds per
+    ``create`` call, both checked once per assigned rank. When either fires,
+    ``on_budget_exhausted`` decides what is returned: ``PARTIAL`` stops with the margins
+    completed so far, ``FALLBACK`` assigns the remaining ranks of the current margin in order
+    of their current deviation and gives each later margin the ranks of its most correlated
+    prior margin. :attr:`last_report` tells which of these happened.
+
+    With a ``checkpoint_dir`` the rank matrix is saved there atomically after every margin
+    completed by the greedy heuristic, and a later ``create`` on the same data, ``n_scenarios``
+    and settings resumes after the last saved margin instead of recomputing it.
+
+    ``compact=True`` keeps the ranks, and the running 2D sample counts of the greedy loop, in
+    the smallest unsigned dtype that holds ``n_scenarios`` (see :func:`rank_dtype`) instead of
+    ``int64``. The gathers of the loop then move 2 to 8 times fewer bytes; the deviations, and
+    so the sample, are identical, but the returned ranks have that compact dtype.
+
+    A ``result_cache`` keeps the target grid of every margin pair and the rank matrix of every
+    completed run on disk, keyed by a digest of the data, ``n_scenarios``, the provider and the
+    prior margin selection. A repeated run then reads its grids memory-mapped instead of
+    building them, or returns the cached sample without running the greedy loop at all.
+
+    :meth:`create_batch` assigns the margins of many data sets with the same number of columns
+    in one greedy loop, stacking their deviation caches on a leading batch axis. Each sample is
+    the one :meth:`create_from_profiles` would return for its data set.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        copula_provider: CopulaProvider | None = None,
+        executor: Executor | None = None,
+        n_threads: int = 1,
+        max_prior_margins: int | None = None,
+        observer: GenerationObserver | None = None,
+        *,
+        cancellation_token: CancellationToken | None = None,
+        time_budget: float | None = None,
+        on_budget_exhausted: BudgetPolicy = BudgetPolicy.PARTIAL,
+        checkpoint_dir: str | Path | None = None,
+        compact: bool = False,
+        result_cache: ResultCache | None = None,
+    ) -> None:
+        if max_prior_margins is not None and max_prior_margins < 1:
+            msg = "max_prior_margins must be a positive int or None"
+            raise ValueError(msg)
         self._copula_provider = copula_provider or ExtendedEmpiricalCopulaProvider()
+        self._executor = executor
+        self._n_threads = n_threads
+        self._max_prior_margins = max_prior_margins
+        self._observer = observer or GenerationObserver()
+        self._cancellation_token = cancellation_token
+        self._time_budget = time_budget
+        self._on_budget_exhausted = BudgetPolicy(on_budget_exhausted)
+        self._checkpoint_dir = checkpoint_dir
+        self._compact = compact
+        self._result_cache = result_cache
+        self.last_report: GenerationReport | None = None
 
     def create(self, data: pd.DataFrame, n_scenarios: int) -> CopulaSample:
-        copula_sample = CopulaSample.initialize(max_rank=n_scenarios, n_margins=data.shape[1])
-        for new_margin in range(1, data.shape[1]):
-            copula_sample = self._assign_ranks_to_margin(
-                copula_sample=copula_sample,
-                data=data,
-                margin=new_margin,
-                n_scenarios=n_scenarios,
+        return self.create_from_profiles(margin_profiles=MarginProfiles(data), n_scenarios=n_scenarios)
+
+    def create_from_profiles(self, margin_profiles: MarginProfiles, n_scenarios: int) -> CopulaSample:
+        copula_sample = CopulaSample.initialize(
+            max_rank=n_scenarios, n_margins=len(margin_profiles), dtype=self._rank_dtype(n_scenarios)
+        )
+        return self._generate(margin_profiles=margin_profiles, copula_sample=copula_sample)
+
+    def create_batch(self, margin_profiles: Sequence[MarginProfiles], n_scenarios: int) -> list[CopulaSample]:
+        """
+        Create one copula sample per store in ``margin_profiles`` with a single batched greedy loop.
+
+        Every rank of every job is assigned by the same array operations, so the per-rank
+        interpreter overhead is paid once per batch instead of once per data set. Cancellation,
+        time budgets, checkpoints, the result cache and ``n_threads`` only apply to :meth:`create`.
+        """
+        n_margins = {len(profiles) for profiles in margin_profiles}
+        if len(n_margins) != 1:
+            msg = f"All data sets must have the same number of margins, got {sorted(n_margins)}"
+            raise ValueError(msg)
+        (n_margins,) = n_margins
+
+        copula_samples = [
+            CopulaSample.initialize(max_rank=n_scenarios, n_margins=n_margins, dtype=self._rank_dtype(n_scenarios))
+            for _ in margin_profiles
+        ]
+        with self._observer.stage("copula_sample_generation"):
+            for new_margin in range(1, n_margins):
+                with self._observer.stage("margin_assignment", margin=new_margin):
+                    new_ranks = self._assign_ranks_to_margin_batch(
+                        copula_samples=copula_samples,
+                        margin_profiles=margin_profiles,
+                        margin=new_margin,
+                        n_scenarios=n_scenarios,
+                    )
+                copula_samples = [
+                    copula_sample.extend(new_ranks=ranks)
+                    for copula_sample, ranks in zip(copula_samples, new_ranks, strict=True)
+                ]
+
+        self.last_report = GenerationReport(GenerationOutcome.COMPLETED, completed_margins=n_margins)
+        return copula_samples
+
+    def extend(self, copula_sample: CopulaSample, data: pd.DataFrame, new_columns: list[str]) -> CopulaSample:
+        """
+        Append the margins ``new_columns`` of ``data`` to an existing ``copula_sample``.
+
+        The other columns of ``data``, in their order, must be the margins ``copula_sample`` was
+        generated for. Only the new margins are assigned -- each against the existing and the
+        previously appended ones -- so the cost is that of the new margins alone, and the result
+        is the sample a full ``create`` on the reordered data would have produced.
+        """
+        missing = [column for column in new_columns if column not in data.columns]
+        if missing:
+            msg = f"new_columns not found in data: {missing}"
+            raise ValueError(msg)
+        existing_columns = [column for column in data.columns if column not in new_columns]
+        if len(existing_columns) != copula_sample.ranks.shape[1]:
+            msg = (
+                f"copula_sample has {copula_sample.ranks.shape[1]} margins, "
+                f"but data has {len(existing_columns)} columns besides new_columns"
+            )
+            raise ValueError(msg)
+
+        margin_profiles = MarginProfiles(data[[*existing_columns, *new_columns]])
+        return self._generate(margin_profiles=margin_profiles, copula_sample=copula_sample)
+
+    def _generate(self, margin_profiles: MarginProfiles, copula_sample: CopulaSample) -> CopulaSample:
+        """Assign the margins of ``margin_profiles`` that ``copula_sample`` does not cover yet."""
+        tokens = [token for token in (self._cancellation_token,) if token is not None]
+        if self._time_budget is not None:
+            tokens.append(CancellationToken(timeout=self._time_budget))
+
+        def should_stop() -> bool:
+            return any(token.cancelled for token in tokens)
+
+        checkpoint = None
+        if self._checkpoint_dir is not None:
+            settings = {
+                "copula_provider": self._copula_provider.cache_token,
+                "max_prior_margins": self._max_prior_margins,
+                "margin_types": margin_profiles.margin_types,
+            }
+            checkpoint = Checkpoint(self._checkpoint_dir, fingerprint(margin_profiles, copula_sample.ranks, settings))
+
+        cache_key = None
+        if self._result_cache is not None:
+            settings = {
+                "result": "copula_sample",
+                "copula_provider": self._copula_provider.cache_token,
+                "max_prior_margins": self._max_prior_margins,
+                "margin_types": margin_profiles.margin_types,
+            }
+            cache_key = fingerprint(margin_profiles, copula_sample.ranks, settings)
+
+        with self._observer.stage("copula_sample_generation"):
+            cached = None if cache_key is None else self._result_cache.get(cache_key)
+            if cached is not None:
+                self.last_report = GenerationReport(GenerationOutcome.COMPLETED, completed_margins=len(margin_profiles))
+                return CopulaSample(
+                    ranks=np.array(cached, dtype=copula_sample.ranks.dtype), max_rank=copula_sample.max_rank
+                )
+
+            if self._n_threads > 1:
+                with ThreadPoolExecutor(max_workers=self._n_threads) as loop_executor:
+                    result = self._create(margin_profiles, copula_sample, loop_executor, should_stop, checkpoint)
+            else:
+                result = self._create(margin_profiles, copula_sample, None, should_stop, checkpoint)
+
+            # partial and fallback samples depend on timing, only complete ones are reproducible
+            if cache_key is not None and self.last_report.outcome == GenerationOutcome.COMPLETED:
+                self._result_cache.put(cache_key, result.ranks)
+            return result
+
+    def _create(
+        self,
+        margin_profiles: MarginProfiles,
+        copula_sample: CopulaSample,
+        loop_executor: Executor | None,
+        should_stop: Callable[[], bool],
+        checkpoint: Checkpoint | None,
+    ) -> CopulaSample:
+        n_scenarios = copula_sample.max_rank
+        n_given = copula_sample.ranks.shape[1]
+        restored = checkpoint.load() if checkpoint is not None else None
+        if restored is not None and restored.shape[1] > n_given:
+            for new_ranks in restored.T[n_given:]:
+                copula_sample = copula_sample.extend(new_ranks=new_ranks)
+        first_margin = copula_sample.ranks.shape[1]
+
+        fallback_margins: list[int] = []
+        for new_margin in range(first_margin, len(margin_profiles)):
+            if fallback_margins or should_stop():
+                if self._on_budget_exhausted == BudgetPolicy.PARTIAL:
+                    self.last_report = GenerationReport(GenerationOutcome.PARTIAL, completed_margins=new_margin)
+                    return copula_sample
+                new_ranks = self._correlated_margin_ranks(copula_sample, margin_profiles, new_margin)
+                copula_sample = copula_sample.extend(new_ranks=new_ranks)
+                fallback_margins.append(new_margin)
+                continue
+
+            with self._observer.stage("margin_assignment", margin=new_margin):
+                extended, interrupted = self._assign_ranks_to_margin(
+                    copula_sample=copula_sample,
+                    margin_profiles=margin_profiles,
+                    margin=new_margin,
+                    n_scenarios=n_scenarios,
+                    loop_executor=loop_executor,
+                    should_stop=should_stop,
+                )
+            if extended is None:
+                self.last_report = GenerationReport(GenerationOutcome.PARTIAL, completed_margins=new_margin)
+                return copula_sample
+            copula_sample = extended
+            if interrupted:
+                fallback_margins.append(new_margin)
+            elif checkpoint is not None:
+                with self._observer.stage("checkpoint", margin=new_margin):
+                    checkpoint.save(copula_sample.ranks)
+
+        if fallback_margins:
+            self.last_report = GenerationReport(
+                GenerationOutcome.FALLBACK,
+                completed_margins=fallback_margins[0],
+                fallback_margins=tuple(fallback_margins),
             )
+        else:
+            self.last_report = GenerationReport(GenerationOutcome.COMPLETED, completed_margins=len(margin_profiles))
         return copula_sample
 
-    def _assign_ranks_to_margin(
+    def _assign_ranks_to_margin(  # noqa: PLR0913
         self,
+        *,
         copula_sample: CopulaSample,
-        data: pd.DataFrame,
+        margin_profiles: MarginProfiles,
         margin: int,
         n_scenarios: int,
-    ) -> CopulaSample:
+        loop_executor: Executor | None = None,
+        should_stop: Callable[[], bool] = lambda: False,
+    ) -> tuple[CopulaSample | None, bool]:
+        """
+        Assign the ranks of ``margin``, returning the extended sample and whether the budget ran out.
+
+        When the budget runs out midway, the sample is ``None`` under ``PARTIAL``; under
+        ``FALLBACK`` the remaining ranks go to the available scenarios in order of deviation.
+        """
         available = np.ones(n_scenarios, dtype=bool)
 
-        copula_samples_2d = [CopulaSample2D.initialize(n_scenarios) for _ in range(margin)]
-        target_grids = [
-            DeviationCache.precompute_target_grid(
-                target_copula=self._copula_provider.get(data=data, margins=[prior_margin, margin]),
-                max_rank=n_scenarios,
-            )
-            for prior_margin in range(margin)
-        ]
+        prior_margins = self._select_prior_margins(margin_profiles=margin_profiles, margin=margin)
+        count_dtype = np.int64 if not self._compact else rank_dtype(n_scenarios)
+        start = time.perf_counter()
+        target_grids = self._build_target_grids(
+            margin_profiles=margin_profiles, prior_margins=prior_margins, margin=margin, n_scenarios=n_scenarios
+        )
+        self._observer.on_target_grids_built(
+            margin=margin,
+            n_grids=len(target_grids),
+            seconds=time.perf_counter() - start,
+            nbytes=sum(target_grid.nbytes for target_grid in target_grids),
+        )
+
+        deviation_cache = IncrementalDeviationCache(
+            target_grids=target_grids,
+            max_rank=n_scenarios,
+            count_dtype=count_dtype,
+            executor=loop_executor,
+            n_shards=self._n_threads,
+        )
 
-        new_ranks = np.zeros(n_scenarios, dtype=int)
+        new_ranks = np.zeros(n_scenarios, dtype=copula_sample.ranks.dtype)
 
-        all_scenarios = copula_sample.retrieve_scenarios(scenario_idxs=np.arange(n_scenarios))
+        all_scenarios = copula_sample.retrieve_scenarios(scenario_idxs=np.arange(n_scenarios))[:, prior_margins]
 
         for new_rank in range(1, n_scenarios + 1):
-            cache = DeviationCache.compute_cache(
-                copula_samples=copula_samples_2d,
-                target_grids=target_grids,
-                rank=new_rank,
-            )
+            cache = deviation_cache.at_rank(new_rank)
 
             idxs = np.where(available)[0]
-            scenario_ranks = all_scenarios[idxs, :margin]
+            scenario_ranks = all_scenarios[idxs, :]
+
+            if should_stop():
+                if self._on_budget_exhausted == BudgetPolicy.PARTIAL:
+                    return None, True
+                order = idxs[np.argsort(cache.total_deviation(scenario_ranks), kind="stable")]
+                new_ranks[order] = np.arange(new_rank, n_scenarios + 1)
+                return copula_sample.extend(new_ranks=new_ranks), True
 
-            dev = cache(scenario_ranks).sum(axis=1)
+            dev = cache.total_deviation(scenario_ranks)
 
             best_pos = np.argmin(dev)
             best_idx = idxs[best_pos]
@@ -65,7 +350,143 @@ class CopulaSampleGenerator(CopulaSampleGenerationStrategy):
             available[best_idx] = False
             new_ranks[best_idx] = new_rank
 
-            for cs2d, rank in zip(copula_samples_2d, best_scenario, strict=False):
-                cs2d.assign(rank=rank)
+            deviation_cache.assign(ranks=best_scenario)
+            self._observer.on_progress(margin=margin, assigned=new_rank, n_scenarios=n_scenarios)
+
+        return copula_sample.extend(new_ranks=new_ranks), False
+
+    def _assign_ranks_to_margin_batch(
+        self,
+        *,
+        copula_samples: list[CopulaSample],
+        margin_profiles: Sequence[MarginProfiles],
+        margin: int,
+        n_scenarios: int,
+    ) -> np.ndarray:
+        """``(B, n_scenarios)`` ranks of ``margin`` for every job, as :meth:`_assign_ranks_to_margin` assigns them."""
+        n_jobs = len(copula_samples)
+        jobs = np.arange(n_jobs)
+        prior_margins = [
+            self._select_prior_margins(margin_profiles=profiles, margin=margin) for profiles in margin_profiles
+        ]
+
+        start = time.perf_counter()
+        deviation_cache = BatchedDeviationCache(
+            target_grids=[
+                self._build_target_grids(
+                    margin_profiles=profiles, prior_margins=priors, margin=margin, n_scenarios=n_scenarios
+                )
+                for profiles, priors in zip(margin_profiles, prior_margins, strict=True)
+            ],
+            max_rank=n_scenarios,
+            count_dtype=np.int64 if not self._compact else rank_dtype(n_scenarios),
+        )
+        self._observer.on_target_grids_built(
+            margin=margin,
+            n_grids=n_jobs * len(prior_margins[0]),
+            seconds=time.perf_counter() - start,
+            nbytes=deviation_cache.nbytes,
+        )
+
+        available = np.ones((n_jobs, n_scenarios), dtype=bool)
+        new_ranks = np.zeros((n_jobs, n_scenarios), dtype=copula_samples[0].ranks.dtype)
+        # ``(B, n_scenarios, P)`` ranks of every scenario in the prior margins of its job
+        all_scenarios = np.stack(
+            [
+                copula_sample.ranks[:, priors]
+                for copula_sample, priors in zip(copula_samples, prior_margins, strict=True)
+            ]
+        )
+
+        for new_rank in range(1, n_scenarios + 1):
+            cache_matrices = deviation_cache.at_rank(new_rank)
+
+            # every job has the same number of scenarios left, in increasing order per row
+            idxs = np.nonzero(available)[1].reshape(n_jobs, -1)
+            scenario_ranks = np.take_along_axis(all_scenarios, idxs[:, :, None], axis=1)
+            dev = deviation_cache.total_deviation(cache_matrices, scenario_ranks)
+
+            best_idx = idxs[jobs, np.argmin(dev, axis=1)]
+            available[jobs, best_idx] = False
+            new_ranks[jobs, best_idx] = new_rank
+
+            deviation_cache.assign(ranks=all_scenarios[jobs, best_idx])
+            self._observer.on_progress(margin=margin, assigned=new_rank, n_scenarios=n_scenarios)
+
+        return new_ranks
+
+    @staticmethod
+    def _rank_correlations(margin_profiles: MarginProfiles, margin: int) -> np.ndarray:
+        """
+        Spearman correlation of ``margin`` with each prior margin, ``0`` where undefined.
+
+        Each is one dot product of centered ranks cached on the profiles, ``O(margin * n_obs)``
+        in all, instead of the ``(margin + 1) ** 2`` covariance matrix of every pair.
+        """
+        new = margin_profiles[margin]
+        priors = margin_profiles.select(range(margin))
+        covariances = np.array([new.weighted_centered_ranks @ prior.centered_ranks for prior in priors])
+        norms = np.array([prior.centered_ranks_norm for prior in priors])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlations = covariances / (new.centered_ranks_norm * norms)
+        return np.nan_to_num(correlations, nan=0.0)
+
+    def _select_prior_margins(self, margin_profiles: MarginProfiles, margin: int) -> list[int]:
+        """Prior margins to match ``margin`` against, in increasing order."""
+        k = self._max_prior_margins
+        if k is None or k >= margin:
+            return list(range(margin))
+
+        dependence = np.abs(self._rank_correlations(margin_profiles, margin))
+        return sorted(np.argsort(-dependence, kind="stable")[:k].tolist())
+
+    def _correlated_margin_ranks(
+        self, copula_sample: CopulaSample, margin_profiles: MarginProfiles, margin: int
+    ) -> np.ndarray:
+        """Fallback ranks for ``margin``: those of its most correlated prior margin, reversed if negative."""
+        correlations = self._rank_correlations(margin_profiles, margin)
+        source = int(np.argmax(np.abs(correlations)))
+        ranks = copula_sample.ranks[:, source]
+        # ``max_rank - (ranks - 1)`` rather than ``max_rank + 1 - ranks``, which overflows compact dtypes
+        return ranks if correlations[source] >= 0 else copula_sample.max_rank - (ranks - 1)
+
+    def _rank_dtype(self, n_scenarios: int) -> np.dtype | type:
+        return rank_dtype(n_scenarios) if self._compact else int
+
+    def _build_target_grids(
+        self, margin_profiles: MarginProfiles, prior_margins: list[int], margin: int, n_scenarios: int
+    ) -> list[CopulaGrid]:
+        """Target grids of the pairs ``(prior_margin, margin)``, read from the result cache where present."""
+        if self._result_cache is None:
+            return self._compute_target_grids(margin_profiles, prior_margins, margin, n_scenarios)
+
+        token = self._copula_provider.cache_token
+        keys = [target_grid_key(margin_profiles, [prior, margin], n_scenarios, token) for prior in prior_margins]
+        cached = [self._result_cache.get(key) for key in keys]
+        missing = [prior for prior, values in zip(prior_margins, cached, strict=True) if values is None]
+        computed = iter(self._compute_target_grids(margin_profiles, missing, margin, n_scenarios))
+        return [
+            self._result_cache.put_grid(key, next(computed), n_scenarios)
+            if values is None
+            else DenseCopulaGrid(values.T)
+            for key, values in zip(keys, cached, strict=True)
+        ]
 
-        return copula_sample.extend(new_ranks=new_ranks)
+    def _compute_target_grids(
+        self, margin_profiles: MarginProfiles, prior_margins: list[int], margin: int, n_scenarios: int
+    ) -> list[CopulaGrid]:
+        if self._executor is None:
+            # in process: the copulas view the shared profiles, no column is copied per pair
+            return [
+                DeviationCache.target_grid(
+                    target_copula=self._copula_provider.from_profiles(margin_profiles, margins=[prior_margin, margin]),
+                    max_rank=n_scenarios,
+                )
+                for prior_margin in prior_margins
+            ]
+        # sort each column once here: the pickled pairs carry the summaries, and no worker re-sorts them
+        for profile in margin_profiles.select([*prior_margins, margin]):
+            profile.compute_copula_summaries()
+        build = partial(_build_target_grid, self._copula_provider, max_rank=n_scenarios)
+        pairs = [margin_profiles.subset([prior_margin, margin]) for prior_margin in prior_margins]
+        return list(self._executor.map(build, pairs))
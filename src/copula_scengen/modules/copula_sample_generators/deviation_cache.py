@@ -1,12 +1,28 @@
+from concurrent.futures import Executor
+from itertools import pairwise
+
 import numpy as np
 
 from copula_scengen.modules.copula.base import Copula
+from copula_scengen.modules.copula.copula_grid import CopulaGrid
 from copula_scengen.modules.copula.copula_sample2d import CopulaSample2D
 
+# below this many elements per shard, dispatching to worker threads costs more than it saves
+_MIN_SHARD_SIZE = 1 << 15
+
+
+def shard_slices(n_items: int, n_shards: int, item_size: int = 1) -> list[slice]:
+    """Split ``range(n_items)`` into at most ``n_shards`` contiguous, non-empty slices worth sharding."""
+    n_shards = max(1, min(n_shards, n_items * item_size // _MIN_SHARD_SIZE, n_items))
+    bounds = np.linspace(0, n_items, n_shards + 1).astype(int)
+    return [slice(start, stop) for start, stop in pairwise(bounds)]
+
 
 class DeviationCache:
-    def __init__(self, cache_matrix: np.ndarray) -> None:
+    def __init__(self, cache_matrix: np.ndarray, executor: Executor | None = None, n_shards: int = 1) -> None:
         self._cache_matrix = cache_matrix
+        self._executor = executor
+        self._n_shards = n_shards
 
     @staticmethod
     def precompute_target_grid(target_copula: Copula, max_rank: int) -> np.ndarray:
@@ -23,6 +39,17 @@ class DeviationCache:
         """
         return target_copula.grid(max_rank)
 
+    @staticmethod
+    def target_grid(target_copula: Copula, max_rank: int) -> CopulaGrid:
+        """
+        Lazy counterpart of :meth:`precompute_target_grid`, producing one column per rank.
+
+        The greedy loop only ever reads column ``rank`` of the target grid, so streaming the
+        columns keeps memory at ``O(max_rank)`` per prior margin instead of the
+        ``(max_rank + 1) ** 2`` matrix, with bit-identical values.
+        """
+        return target_copula.grid_columns(max_rank)
+
     @classmethod
     def compute_cache(
         cls,
@@ -56,3 +83,23 @@ class DeviationCache:
 
     def __call__(self, ranks: np.ndarray) -> np.ndarray:
         return np.take_along_axis(self._cache_matrix.T, ranks - 1, axis=0)
+
+    def total_deviation(self, ranks: np.ndarray) -> np.ndarray:
+        """
+        Sum of the cached deviations over the prior margins for every row of ``ranks``.
+
+        Equal to ``self(ranks).sum(axis=1)``. With an executor, the rows are split into
+        contiguous shards reduced concurrently; each row is reduced exactly as in the serial
+        call, so the result, and thus the argmin, does not depend on the sharding.
+        """
+        shards = shard_slices(ranks.shape[0], self._n_shards, ranks.shape[1])
+        if self._executor is None or len(shards) == 1:
+            return self(ranks).sum(axis=1)
+
+        total = np.empty(ranks.shape[0], dtype=float)
+
+        def reduce_shard(rows: slice) -> None:
+            total[rows] = self(ranks[rows]).sum(axis=1)
+
+        list(self._executor.map(reduce_shard, shards))
+        return total
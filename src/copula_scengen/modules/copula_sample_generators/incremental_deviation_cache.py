@@ -0,0 +1,95 @@
+from concurrent.futures import Executor
+
+import numpy as np
+
+from copula_scengen.modules.copula.copula_grid import CopulaGrid
+from copula_scengen.modules.copula.copula_sample2d import running_fractions
+from copula_scengen.modules.copula_sample_generators.deviation_cache import DeviationCache, shard_slices
+
+
+def deviation_rows(sample_counts: np.ndarray, target_column: np.ndarray) -> np.ndarray:
+    """
+    Deviation cache rows from sample counts and target columns over ``0..max_rank`` on the last axis.
+
+    Leading axes, e.g. the prior margins or a batch of them, are carried through unchanged.
+    """
+    max_rank = sample_counts.shape[-1] - 1
+    tc_eval_1 = target_column[..., 1:]
+    tc_eval_2 = target_column[..., :max_rank]
+    # the counts are read as the running float sums of the original samples, see ``running_fractions``
+    sample_values = running_fractions(max_rank)[sample_counts]
+    cs_eval_1 = sample_values[..., 1:]
+    cs_eval_2 = sample_values[..., :max_rank]
+
+    delta = np.sum(np.abs(cs_eval_1 + 1.0 / max_rank - tc_eval_1), axis=-1)
+
+    delta_arr = np.abs(cs_eval_2 - tc_eval_2) - np.abs(cs_eval_2 + 1.0 / max_rank - tc_eval_2)
+    return delta[..., None] + np.cumsum(delta_arr, axis=-1)
+
+
+class IncrementalDeviationCache:
+    """
+    Deviation cache kept alive across the consecutive ranks of the greedy assignment loop.
+
+    :meth:`DeviationCache.compute_cache` loops over the prior margins and re-evaluates every 2D
+    copula sample on the whole ``1..max_rank`` lattice for each new rank. This class instead
+    keeps the integer sample counts of all prior margins in a single ``(n_margins, max_rank + 1)``
+    buffer, updated by :meth:`assign` with one vectorized comparison, and computes the cache
+    rows of all margins in one batched pass in :meth:`at_rank`, reading only the column
+    ``rank`` of each target grid. The resulting cache matrix is bit-identical to
+    :meth:`DeviationCache.compute_cache` on :class:`CopulaSample2D` samples given the same
+    assignments.
+
+    The saving is a constant factor, not an asymptotic one: the target column differs from one
+    rank to the next on the whole lattice, and each cache row is a cumulative sum over it, so
+    every rank still costs ``O(n_margins * max_rank)``. Assigning a margin is therefore
+    ``O(n_margins * max_rank ** 2)`` and a whole run ``O(d ** 2 * max_rank ** 2)``, or
+    ``O(d * k * max_rank ** 2)`` with ``max_prior_margins=k``. Updating the rows in place would
+    change the order of the floating point operations, and with it the ties of the argmin.
+
+    With an ``executor``, the prior margins are split into ``n_shards`` contiguous blocks whose
+    cache rows are computed concurrently. Every row is computed exactly as in the serial pass,
+    so the values do not depend on the sharding.
+    """
+
+    def __init__(
+        self,
+        target_grids: list[CopulaGrid],
+        max_rank: int,
+        count_dtype: np.dtype | type = np.int64,
+        executor: Executor | None = None,
+        n_shards: int = 1,
+    ) -> None:
+        self._target_grids = target_grids
+        self._executor = executor
+        self._n_shards = n_shards
+        self.max_rank = max_rank
+
+        # column ``i`` holds the sample counts at ``i`` for ``i`` in ``0..max_rank``, starting from no assignments;
+        # integers, normalized only when compared with the targets
+        self._sample_counts = np.zeros((len(target_grids), max_rank + 1), dtype=count_dtype)
+        # an assignment at ``rank`` bumps every ``i >= rank``; ``0`` mirrors ``max_rank`` (see CopulaSample2D)
+        self._bump_lattice = np.arange(max_rank + 1)
+        self._bump_lattice[0] = max_rank
+        self._target_column = np.empty((len(target_grids), max_rank + 1), dtype=float)
+
+    def at_rank(self, rank: int) -> DeviationCache:
+        """Return the deviation cache for assigning ``rank`` given the assignments made so far."""
+        cache_matrix = np.empty((len(self._target_grids), self.max_rank), dtype=float)
+        shards = shard_slices(len(self._target_grids), self._n_shards, self.max_rank)
+        if self._executor is None or len(shards) == 1:
+            self._fill_rows(rank=rank, rows=slice(None), out=cache_matrix)
+        else:
+            list(self._executor.map(lambda rows: self._fill_rows(rank=rank, rows=rows, out=cache_matrix), shards))
+        return DeviationCache(cache_matrix=cache_matrix, executor=self._executor, n_shards=self._n_shards)
+
+    def _fill_rows(self, rank: int, rows: slice, out: np.ndarray) -> None:
+        target_column = self._target_column[rows]
+        for margin, target_grid in enumerate(self._target_grids[rows]):
+            target_column[margin] = target_grid.column(rank)
+
+        out[rows] = deviation_rows(sample_counts=self._sample_counts[rows], target_column=target_column)
+
+    def assign(self, ranks: np.ndarray) -> None:
+        """Record a scenario whose ranks in the prior margins are ``ranks``."""
+        self._sample_counts += self._bump_lattice >= np.asarray(ranks)[:, None]
@@ -0,0 +1,129 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from copula_scengen.modules.copula.copula_grid import CopulaGrid, DenseCopulaGrid
+from copula_scengen.modules.margin_profiles import MarginProfiles
+
+_FORMAT_VERSION = 1
+_SUFFIX = ".npy"
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def target_grid_key(margin_profiles: MarginProfiles, margins: Sequence[int], max_rank: int, provider_token: str) -> str:
+    """Digest of everything the target grid of the pair ``margins`` depends on."""
+    margin_types = margin_profiles.margin_types or [None] * len(margin_profiles)
+    digest = hashlib.sha256()
+    header = {
+        "format_version": _FORMAT_VERSION,
+        "kind": "target_grid",
+        "max_rank": max_rank,
+        "copula_provider": provider_token,
+        # undeclared types are inferred from the hashed values themselves
+        "margin_types": [margin_types[margin] for margin in margins],
+    }
+    digest.update(json.dumps(header, sort_keys=True).encode())
+    for margin in margins:
+        digest.update(np.ascontiguousarray(margin_profiles.column(margin), dtype=float).tobytes())
+    if margin_profiles.weights is not None:
+        digest.update(np.ascontiguousarray(margin_profiles.weights, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed store of arrays in ``directory``, one ``.npy`` file per key.
+
+    Entries are read back memory-mapped, so a hit costs no more than the pages actually
+    touched. Writes go to a temporary file moved into place with :func:`os.replace`, which
+    makes the directory safe to share between concurrent runs. The modification time of an
+    entry is refreshed on every hit, and after each write the least recently used entries
+    are deleted until the directory holds at most ``max_bytes``.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Read-only memory map of the entry ``key``, or ``None`` if it is not cached."""
+        path = self._path(key)
+        try:
+            values = np.load(path, mmap_mode="r", allow_pickle=False)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            # missing, evicted by a concurrent run or unreadable: recompute
+            return None
+        return values
+
+    def put(self, key: str, values: np.ndarray) -> None:
+        values = np.asarray(values)
+        self._write(key, values.shape, values.dtype, lambda target: np.copyto(target, values))
+
+    def put_grid(self, key: str, grid: CopulaGrid, max_rank: int) -> DenseCopulaGrid:
+        """
+        Store the ``(max_rank + 1) ** 2`` lattice of ``grid`` and return it as a dense grid.
+
+        The columns are written one at a time as the rows of the file, so the lattice is never
+        held in memory as a whole and each later column read is contiguous on disk.
+        """
+
+        def fill(target: np.ndarray) -> None:
+            for index in range(max_rank + 1):
+                target[index] = grid.column(index)
+
+        self._write(key, (max_rank + 1, max_rank + 1), np.dtype(float), fill)
+        cached = self.get(key)
+        if cached is None:
+            # larger than the whole cache, and evicted right away; keep the streamed grid
+            return grid
+        return DenseCopulaGrid(cached.T)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of all entries currently in the cache."""
+        return sum(path.stat().st_size for path in self._entries())
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        return list(self.directory.glob(f"*{_SUFFIX}"))
+
+    def _write(self, key: str, shape: tuple[int, ...], dtype: np.dtype, fill: Callable[[np.ndarray], None]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(file_descriptor)
+        try:
+            target = np.lib.format.open_memmap(temporary, mode="w+", dtype=dtype, shape=shape)
+            fill(target)
+            target.flush()
+            del target
+            Path(temporary).replace(self._path(key))
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        for path in self._entries():
+            # may have been evicted by a concurrent run since it was listed
+            with contextlib.suppress(FileNotFoundError):
+                entries.append((path.stat(), path))
+        entries.sort(key=lambda entry: entry[0].st_mtime_ns)
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
@@ -5,23 +5,26 @@ import pandas as pd
 
 from copula_scengen.modules.copula.copula_sample import CopulaSample
 from copula_scengen.modules.functions.discrete_transformation_bounds import discrete_transformation_bounds
-from copula_scengen.modules.functions.inverse_ecdf import inverse_ecdf
-from copula_scengen.schemas.margin_type import is_discrete
+from copula_scengen.modules.functions.inverse_ecdf import inverse_ecdf, weighted_inverse_ecdf
+from copula_scengen.modules.margin_profiles import MarginProfile, MarginProfiles
+from copula_scengen.modules.observers import GenerationObserver
 
 
-def continuous_transformations(margin_data: np.ndarray, n_scenarios: int) -> np.ndarray:
-    sorted_margin_data = np.sort(margin_data)
+def continuous_transformations(profile: MarginProfile, n_scenarios: int) -> np.ndarray:
+    sorted_margin_data = profile.sorted_values
     ranks = np.arange(1, n_scenarios + 1)
     quantiles = (ranks - 0.5) / n_scenarios
-    computed_values = inverse_ecdf(sorted_data=sorted_margin_data, args=quantiles)
-    offset = sorted_margin_data.mean() - computed_values.mean()
+    computed_values = quantile_values(profile, quantiles)
+    offset = np.average(sorted_margin_data, weights=profile.sorted_weights) - computed_values.mean()
     return computed_values + offset
 
 
-def discrete_distribution(margin_data: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-    value_counts = np.bincount(margin_data.astype(int))
-    cumulative = np.cumsum(value_counts) / len(margin_data)
-    return value_counts, cumulative
+def quantile_values(profile: MarginProfile, quantiles: np.ndarray) -> np.ndarray:
+    if profile.sorted_weights is None:
+        return inverse_ecdf(sorted_data=profile.sorted_values, args=quantiles)
+    return weighted_inverse_ecdf(
+        sorted_data=profile.sorted_values, sorted_weights=profile.sorted_weights, args=quantiles
+    )
 
 
 def discrete_bounds(cumulative: np.ndarray, n_scenarios: int) -> tuple[np.ndarray, np.ndarray]:
@@ -34,25 +37,29 @@ def discrete_bounds(cumulative: np.ndarray, n_scenarios: int) -> tuple[np.ndarra
 
 
 def transform(
-    data: pd.DataFrame,
+    margin_profiles: MarginProfiles,
     copula_sample: CopulaSample,
-    discrete_selector: Callable[[np.ndarray, int], np.ndarray],
-) -> pd.DataFrame:
+    discrete_selector: Callable[[MarginProfile, int], np.ndarray],
+    observer: GenerationObserver,
+) -> np.ndarray:
     n_scenarios = copula_sample.max_rank
-    margin_transformations = np.zeros((data.shape[1], n_scenarios), dtype=float)
+    margin_transformations = np.zeros((len(margin_profiles), n_scenarios), dtype=float)
+
+    with observer.stage("copula_sample_transformation"):
+        for margin_index in range(len(margin_profiles)):
+            with observer.stage("margin_transformation", margin=margin_index):
+                profile = margin_profiles[margin_index]
+                if profile.is_discrete:
+                    margin_transformations[margin_index] = discrete_selector(profile, n_scenarios)
+                else:
+                    margin_transformations[margin_index] = continuous_transformations(profile, n_scenarios)
+
+        return apply_rank_transformations(copula_sample, margin_transformations)
 
-    for margin_index in range(data.shape[1]):
-        margin_data = data.iloc[:, margin_index].to_numpy()
-        if is_discrete(margin_data):
-            margin_transformations[margin_index] = discrete_selector(margin_data, n_scenarios)
-        else:
-            margin_transformations[margin_index] = continuous_transformations(margin_data, n_scenarios)
 
-    return apply_rank_transformations(data, copula_sample, margin_transformations)
+def apply_rank_transformations(copula_sample: CopulaSample, margin_transformations: np.ndarray) -> np.ndarray:
+    return np.take_along_axis(margin_transformations.T, copula_sample.ranks - 1, axis=0)
 
 
-def apply_rank_transformations(
-    data: pd.DataFrame, copula_sample: CopulaSample, margin_transformations: np.ndarray
-) -> pd.DataFrame:
-    result = np.take_along_axis(margin_transformations.T, copula_sample.ranks - 1, axis=0)
-    return pd.DataFrame(result, columns=data.columns)
+def to_frame(margin_profiles: MarginProfiles, values: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame(values, columns=margin_profiles.data.columns)
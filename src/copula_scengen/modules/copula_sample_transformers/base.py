@@ -1,11 +1,31 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
 import pandas as pd
 
 from copula_scengen.modules.copula.copula_sample import CopulaSample
+from copula_scengen.modules.margin_profiles import MarginProfiles
+from copula_scengen.modules.observers import GenerationObserver
 
 
 class CopulaSampleTransformationStrategy(ABC):
+    def __init__(self, observer: GenerationObserver | None = None) -> None:
+        self.observer = observer or GenerationObserver()
+
     @abstractmethod
     def transform(self, data: pd.DataFrame, copula_sample: CopulaSample) -> pd.DataFrame:
         """Transform copula ranks into scenario values."""
+
+    def transform_from_profiles(self, margin_profiles: MarginProfiles, copula_sample: CopulaSample) -> pd.DataFrame:
+        """Transform copula ranks for ``margin_profiles.data``, reusing its shared column profiles."""
+        return self.transform(data=margin_profiles.data, copula_sample=copula_sample)
+
+    def transform_to_array(self, margin_profiles: MarginProfiles, copula_sample: CopulaSample) -> np.ndarray:
+        """
+        Transform copula ranks into a ``(n_scenarios, n_margins)`` float array.
+
+        Strategies that compute the values as an array override this to skip the DataFrame.
+        """
+        return self.transform_from_profiles(margin_profiles=margin_profiles, copula_sample=copula_sample).to_numpy(
+            dtype=float
+        )
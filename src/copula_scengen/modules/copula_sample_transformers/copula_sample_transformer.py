@@ -4,17 +4,22 @@ import pandas as pd
 from copula_scengen.modules.copula.copula_sample import CopulaSample
 from copula_scengen.modules.copula_sample_transformers import _shared
 from copula_scengen.modules.copula_sample_transformers.base import CopulaSampleTransformationStrategy
+from copula_scengen.modules.functions.range_argmax import range_argmax
+from copula_scengen.modules.margin_profiles import MarginProfile, MarginProfiles
 
 
 class CopulaSampleTransformer(CopulaSampleTransformationStrategy):
-    def _discrete_transformations(self, margin_data: np.ndarray, n_scenarios: int) -> np.ndarray:
-        value_counts, cumulative = _shared.discrete_distribution(margin_data)
+    def _discrete_transformations(self, profile: MarginProfile, n_scenarios: int) -> np.ndarray:
+        """Most frequent value within the valid interval of each rank, the first one on ties."""
+        value_counts, cumulative = profile.value_counts, profile.cumulative
         lower_bounds, upper_bounds = _shared.discrete_bounds(cumulative, n_scenarios)
-
-        candidate_values = np.arange(len(value_counts))
-        valid = (candidate_values >= lower_bounds[:, None]) & (candidate_values <= upper_bounds[:, None])
-        counts = np.where(valid, value_counts[None, :], -1)
-        return counts.argmax(axis=1)
+        return range_argmax(value_counts, lower_bounds, upper_bounds)
 
     def transform(self, data: pd.DataFrame, copula_sample: CopulaSample) -> pd.DataFrame:
-        return _shared.transform(data, copula_sample, self._discrete_transformations)
+        return self.transform_from_profiles(margin_profiles=MarginProfiles(data), copula_sample=copula_sample)
+
+    def transform_from_profiles(self, margin_profiles: MarginProfiles, copula_sample: CopulaSample) -> pd.DataFrame:
+        return _shared.to_frame(margin_profiles, self.transform_to_array(margin_profiles, copula_sample))
+
+    def transform_to_array(self, margin_profiles: MarginProfiles, copula_sample: CopulaSample) -> np.ndarray:
+        return _shared.transform(margin_profiles, copula_sample, self._discrete_transformations, self.observer)
@@ -4,18 +4,26 @@ import pandas as pd
 from copula_scengen.modules.copula.copula_sample import CopulaSample
 from copula_scengen.modules.copula_sample_transformers import _shared
 from copula_scengen.modules.copula_sample_transformers.base import CopulaSampleTransformationStrategy
-from copula_scengen.modules.functions.inverse_ecdf import inverse_ecdf
+from copula_scengen.modules.margin_profiles import MarginProfiles
 
 
 class EmpiricalCopulaSampleTransformer(CopulaSampleTransformationStrategy):
     def transform(self, data: pd.DataFrame, copula_sample: CopulaSample) -> pd.DataFrame:
+        return self.transform_from_profiles(margin_profiles=MarginProfiles(data), copula_sample=copula_sample)
+
+    def transform_from_profiles(self, margin_profiles: MarginProfiles, copula_sample: CopulaSample) -> pd.DataFrame:
+        return _shared.to_frame(margin_profiles, self.transform_to_array(margin_profiles, copula_sample))
+
+    def transform_to_array(self, margin_profiles: MarginProfiles, copula_sample: CopulaSample) -> np.ndarray:
         n_scenarios = copula_sample.max_rank
         ranks = np.arange(1, n_scenarios + 1)
         quantiles = (ranks - 0.5) / n_scenarios
-        margin_transformations = np.zeros((data.shape[1], n_scenarios), dtype=float)
+        margin_transformations = np.zeros((len(margin_profiles), n_scenarios), dtype=float)
 
-        for margin_index in range(data.shape[1]):
-            sorted_margin_data = np.sort(data.iloc[:, margin_index].to_numpy())
-            margin_transformations[margin_index] = inverse_ecdf(sorted_margin_data, quantiles)
+        with self.observer.stage("copula_sample_transformation"):
+            for margin_index in range(len(margin_profiles)):
+                with self.observer.stage("margin_transformation", margin=margin_index):
+                    profile = margin_profiles[margin_index]
+                    margin_transformations[margin_index] = _shared.quantile_values(profile, quantiles)
 
-        return _shared.apply_rank_transformations(data, copula_sample, margin_transformations)
+            return _shared.apply_rank_transformations(copula_sample, margin_transformations)
@@ -4,6 +4,8 @@ import pandas as pd
 from copula_scengen.modules.copula.copula_sample import CopulaSample
 from copula_scengen.modules.copula_sample_transformers import _shared
 from copula_scengen.modules.copula_sample_transformers.base import CopulaSampleTransformationStrategy
+from copula_scengen.modules.functions.range_argmax import range_argmax
+from copula_scengen.modules.margin_profiles import MarginProfile, MarginProfiles
 
 
 class ExtendedCopulaSampleTransformer(CopulaSampleTransformationStrategy):
@@ -13,22 +15,62 @@ class ExtendedCopulaSampleTransformer(CopulaSampleTransformationStrategy):
         masses = cumulative[indices] - previous_cumulative
         return indices - 1 + (args - previous_cumulative) / masses
 
-    def _discrete_transformations(self, margin_data: np.ndarray, n_scenarios: int) -> np.ndarray:
-        value_counts, cumulative = _shared.discrete_distribution(margin_data)
+    def _overlaps(self, candidates: np.ndarray, lower_extended: np.ndarray, upper_extended: np.ndarray) -> np.ndarray:
+        """Overlap of the segment ``[c - 1, c]`` of each candidate ``c`` with ``[lower_extended, upper_extended]``."""
+        lower_uniform = 1 - candidates + lower_extended[:, None]
+        upper_uniform = 1 - candidates + upper_extended[:, None]
+        return np.maximum(0.0, np.minimum(1.0, upper_uniform) - np.maximum(0.0, lower_uniform))
+
+    def _discrete_transformations(self, profile: MarginProfile, n_scenarios: int) -> np.ndarray:
+        """
+        Value of the valid interval of each rank with the largest overlap-weighted count.
+
+        The segments strictly inside ``[lower_extended, upper_extended]`` overlap it fully and
+        score their plain count, so their best is a range argmax. Only the two segments at the
+        ends overlap partially and all others score zero, hence a handful of candidates per rank
+        decide the argmax, in ``O(n_scenarios + n_values)`` memory and with the same tie-breaking.
+        """
+        value_counts, cumulative = profile.value_counts, profile.cumulative
         lower_bounds, upper_bounds = _shared.discrete_bounds(cumulative, n_scenarios)
 
         ranks = np.arange(1, n_scenarios + 1)
         lower_extended = self._extended_inverse_ecdf(cumulative, (ranks - 1) / n_scenarios)
         upper_extended = self._extended_inverse_ecdf(cumulative, ranks / n_scenarios)
+        # an unobserved lowest value has no mass and makes the overlaps of the whole row NaN,
+        # where the argmax picks the first valid candidate
+        undefined = np.isnan(lower_extended) | np.isnan(upper_extended)
+        lower_extended = np.where(undefined, 0.0, lower_extended)
+        upper_extended = np.where(undefined, 0.0, upper_extended)
+
+        # first and last fully overlapping candidate; the tests are those of ``_overlaps`` and
+        # monotone in the candidate, so counting failures around the exact solution locates them
+        steps = np.arange(-1, 2)
+        lower_guess = np.ceil(lower_extended).astype(np.intp)[:, None] + 1 + steps
+        first_full = lower_guess[:, 0] + np.count_nonzero(1 - lower_guess + lower_extended[:, None] > 0, axis=1)
+        upper_guess = np.floor(upper_extended).astype(np.intp)[:, None] + steps
+        last_full = upper_guess[:, -1] - np.count_nonzero(1 - upper_guess + upper_extended[:, None] < 1, axis=1)
 
-        candidate_values = np.arange(len(value_counts))
-        lower_uniform = 1 - candidate_values[None, :] + lower_extended[:, None]
-        upper_uniform = 1 - candidate_values[None, :] + upper_extended[:, None]
-        overlaps = np.maximum(0.0, np.minimum(1.0, upper_uniform) - np.maximum(0.0, lower_uniform))
+        full_lower = np.maximum(lower_bounds, first_full)
+        full_upper = np.minimum(upper_bounds, last_full)
+        candidates = np.column_stack(
+            [lower_bounds, range_argmax(value_counts, full_lower, full_upper), first_full - 1, last_full + 1]
+        )
+        valid = (candidates >= lower_bounds[:, None]) & (candidates <= upper_bounds[:, None])
+        valid[:, 1] &= full_lower <= full_upper
 
-        valid = (candidate_values >= lower_bounds[:, None]) & (candidate_values <= upper_bounds[:, None])
-        scores = np.where(valid, overlaps * value_counts[None, :], -1.0)
-        return scores.argmax(axis=1)
+        gathered = value_counts[np.clip(candidates, 0, len(value_counts) - 1)]
+        scores = np.where(valid, self._overlaps(candidates, lower_extended, upper_extended) * gathered, -1.0)
+        best = scores.max(axis=1, keepdims=True)
+        # every rank has a valid candidate unless its interval is empty, where argmax gave 0
+        choice = np.where(scores == best, candidates, len(value_counts)).min(axis=1)
+        choice = np.where(undefined, lower_bounds, choice)
+        return np.where(lower_bounds <= upper_bounds, choice, 0)
 
     def transform(self, data: pd.DataFrame, copula_sample: CopulaSample) -> pd.DataFrame:
-        return _shared.transform(data, copula_sample, self._discrete_transformations)
+        return self.transform_from_profiles(margin_profiles=MarginProfiles(data), copula_sample=copula_sample)
+
+    def transform_from_profiles(self, margin_profiles: MarginProfiles, copula_sample: CopulaSample) -> pd.DataFrame:
+        return _shared.to_frame(margin_profiles, self.transform_to_array(margin_profiles, copula_sample))
+
+    def transform_to_array(self, margin_profiles: MarginProfiles, copula_sample: CopulaSample) -> np.ndarray:
+        return _shared.transform(margin_profiles, copula_sample, self._discrete_transformations, self.observer)
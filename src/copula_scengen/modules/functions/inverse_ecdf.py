@@ -9,3 +9,11 @@ def inverse_ecdf(sorted_data: np.ndarray, args: np.ndarray) -> np.ndarray:
     ranks = np.clip(np.ceil(args * n).astype(int) - 1, 0, n - 1)
 
     return sorted_data[ranks]
+
+
+def weighted_inverse_ecdf(sorted_data: np.ndarray, sorted_weights: np.ndarray, args: np.ndarray) -> np.ndarray:
+    # same as inverse_ecdf on sorted_data[i] repeated sorted_weights[i] times: the first value
+    # whose cumulative weight reaches args * total weight
+    cumulative_weights = np.cumsum(sorted_weights)
+    indices = np.searchsorted(cumulative_weights, args * cumulative_weights[-1], side="left")
+    return sorted_data[np.clip(indices, 0, sorted_data.size - 1)]
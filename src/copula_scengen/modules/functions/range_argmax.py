@@ -0,0 +1,98 @@
+import numpy as np
+
+
+def _sparse_table(values: np.ndarray) -> list[np.ndarray]:
+    """``levels[j][i]`` is the first argmax of ``values[i : i + 2**j]``; on ties the left window wins."""
+    levels = [np.arange(values.size, dtype=np.intp)]
+    width = 1
+    while 2 * width <= values.size:
+        left, right = levels[-1][:-width], levels[-1][width:]
+        levels.append(np.where(values[right] > values[left], right, left))
+        width *= 2
+    return levels
+
+
+def _query(levels: list[np.ndarray], values: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """First argmax of every non-empty ``values[lower : upper + 1]``, from the sparse table ``levels``."""
+    # cover each range by two, possibly overlapping, windows of the largest fitting width
+    level = np.frexp(upper - lower + 1)[1] - 1
+    result = np.zeros(lower.shape, dtype=np.intp)
+    for j in np.unique(level):
+        mask = level == j
+        left = levels[j][lower[mask]]
+        right = levels[j][upper[mask] - (1 << j) + 1]
+        result[mask] = np.where(values[right] > values[left], right, left)
+    return result
+
+
+def range_argmax(values: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """
+    Index of the first maximum of ``values[lower[i] : upper[i] + 1]`` for every query ``i``.
+
+    ``values`` is cut into blocks of about ``log2(len(values))`` entries, each with the argmax
+    of its every prefix and suffix, and a sparse table covers the block maxima only. A range
+    spanning several blocks is then the best of a suffix, a run of whole blocks and a prefix,
+    and a range within one block is scanned. Memory stays ``O(len(values) + q)`` for ``q``
+    queries, instead of a dense ``(q, len(values))`` mask, and the time is
+    ``O(len(values) + q log len(values))``. Empty ranges (``lower > upper``) give 0, like
+    ``argmax`` over a row with no candidates.
+    """
+    values = np.asarray(values)
+    lower = np.asarray(lower, dtype=np.intp)
+    upper = np.asarray(upper, dtype=np.intp)
+    empty = lower > upper
+    lower = np.where(empty, 0, lower)
+    upper = np.where(empty, 0, upper)
+
+    block = max(1, values.size.bit_length())
+    n_blocks = -(-values.size // block)
+    # the padding past the end never wins a comparison
+    padded = np.full(n_blocks * block, -np.inf)
+    padded[: values.size] = values
+    blocks = padded.reshape(n_blocks, block)
+    rows = np.arange(n_blocks)
+
+    # prefix[b, o] and suffix[b, o]: first argmax of block ``b`` over offsets ``0..o`` and ``o..block - 1``
+    prefix = np.zeros((n_blocks, block), dtype=np.intp)
+    suffix = np.full((n_blocks, block), block - 1, dtype=np.intp)
+    for offset in range(1, block):
+        previous = prefix[:, offset - 1]
+        prefix[:, offset] = np.where(blocks[:, offset] > blocks[rows, previous], offset, previous)
+    for offset in range(block - 2, -1, -1):
+        following = suffix[:, offset + 1]
+        suffix[:, offset] = np.where(blocks[:, offset] >= blocks[rows, following], offset, following)
+    starts = (rows * block)[:, None]
+    prefix = (prefix + starts).ravel()
+    suffix = (suffix + starts).ravel()
+    block_argmax = prefix[block - 1 :: block]
+    block_levels = _sparse_table(padded[block_argmax])
+
+    first_block, last_block = lower // block, upper // block
+    result = np.zeros(lower.shape, dtype=np.intp)
+
+    spanning = np.flatnonzero(first_block < last_block)
+    best = suffix[lower[spanning]]
+    middle = last_block[spanning] - first_block[spanning] >= 2  # noqa: PLR2004
+    inner = block_argmax[
+        _query(
+            block_levels,
+            padded[block_argmax],
+            first_block[spanning][middle] + 1,
+            last_block[spanning][middle] - 1,
+        )
+    ]
+    best[middle] = np.where(padded[inner] > padded[best[middle]], inner, best[middle])
+    right = prefix[upper[spanning]]
+    result[spanning] = np.where(padded[right] > padded[best], right, best)
+
+    within = np.flatnonzero(first_block == last_block)
+    start, stop = lower[within], upper[within]
+    best = start.copy()
+    for offset in range(1, block):
+        candidate = np.minimum(start + offset, padded.size - 1)
+        better = (candidate <= stop) & (padded[candidate] > padded[best])
+        best = np.where(better, candidate, best)
+    result[within] = best
+
+    result[empty] = 0
+    return result
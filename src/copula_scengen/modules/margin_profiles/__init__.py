@@ -0,0 +1,4 @@
+from copula_scengen.modules.margin_profiles.margin_profile import MarginProfile
+from copula_scengen.modules.margin_profiles.margin_profiles import MarginProfiles
+
+__all__ = ["MarginProfile", "MarginProfiles"]
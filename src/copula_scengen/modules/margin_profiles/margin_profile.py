@@ -0,0 +1,159 @@
+from functools import cached_property
+
+import numpy as np
+
+from copula_scengen.schemas.margin_type import MarginType, is_discrete
+
+_PICKLED_ATTRIBUTES = frozenset(
+    {"values", "_order", "weights", "margin_type", "total_weight", "pseudo_observations", "is_discrete", "jump_points"}
+)
+
+
+class MarginProfile:
+    """
+    Sorting and counting summaries of a single margin, each computed at most once.
+
+    Every stage of the pipeline needs some of these -- the copulas the pseudo-observations
+    and jump points, the transformers the sorted values and value counts -- so sharing one
+    profile per column replaces the argsorts, bincounts and discreteness checks that each
+    copula and transformer would otherwise redo on the same column.
+
+    Optional positive ``weights`` let one row stand for several identical observations. Every
+    summary is then that of the data with row ``i`` repeated ``weights[i]`` times, its copies
+    taking consecutive ranks; a row's pseudo-observation is that of its first copy. Unit
+    weights give exactly the unweighted summaries.
+
+    A declared ``margin_type`` is taken as given instead of inferring discreteness from the values.
+    Values declared discrete must be integers, since the discrete summaries count them per integer.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        order: np.ndarray | None = None,
+        weights: np.ndarray | None = None,
+        margin_type: MarginType | None = None,
+    ) -> None:
+        self.values = values
+        self._order = order
+        self.weights = weights
+        self.margin_type = None if margin_type is None else MarginType(margin_type)
+        if self.margin_type == MarginType.DISCRETE and not np.array_equal(values, np.round(values)):
+            msg = "Values declared discrete must be integers"
+            raise ValueError(msg)
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle the inputs and, where computed, only the summaries the copula grids read.
+
+        The sort order, ranks and the other summaries are as large as the values and cheap to
+        redo next to them, so leaving them out keeps what a worker process receives small.
+        """
+        return {key: value for key, value in self.__dict__.items() if key in _PICKLED_ATTRIBUTES}
+
+    @property
+    def size(self) -> int:
+        return self.values.size
+
+    @cached_property
+    def total_weight(self) -> float:
+        """Number of observations the rows stand for; :attr:`size` when unweighted."""
+        return self.size if self.weights is None else self.weights.sum()
+
+    @cached_property
+    def order(self) -> np.ndarray:
+        """Indices sorting :attr:`values`; taken as given when restored from a saved model."""
+        return np.argsort(self.values) if self._order is None else self._order
+
+    @cached_property
+    def sorted_values(self) -> np.ndarray:
+        return self.values[self.order]
+
+    @cached_property
+    def sorted_weights(self) -> np.ndarray | None:
+        return None if self.weights is None else self.weights[self.order]
+
+    @cached_property
+    def _weight_before(self) -> np.ndarray:
+        """Total weight of the rows preceding each sorted position, with the overall total appended."""
+        if self.sorted_weights is None:
+            return np.arange(self.size + 1)
+        return np.concatenate(([0], np.cumsum(self.sorted_weights)))
+
+    @cached_property
+    def ranks(self) -> np.ndarray:
+        """Zero-based rank of every observation, ties broken by :attr:`order`."""
+        ranks = np.empty(self.size, dtype=np.intp)
+        ranks[self.order] = np.arange(self.size)
+        return ranks
+
+    @cached_property
+    def average_ranks(self) -> np.ndarray:
+        """Zero-based rank of every observation, tied observations sharing their mean rank."""
+        sorted_values = self.sorted_values
+        starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+        ends = np.r_[starts[1:], self.size]
+        group = np.repeat(np.arange(starts.size), ends - starts)
+        first, stop = self._weight_before[starts], self._weight_before[ends]
+        average_ranks = np.empty(self.size, dtype=float)
+        average_ranks[self.order] = ((first + stop - 1) / 2)[group]
+        return average_ranks
+
+    @cached_property
+    def centered_ranks(self) -> np.ndarray:
+        """:attr:`average_ranks` minus their weighted mean, shared by every rank correlation of the margin."""
+        return self.average_ranks - np.average(self.average_ranks, weights=self.weights)
+
+    @cached_property
+    def weighted_centered_ranks(self) -> np.ndarray:
+        """:attr:`centered_ranks` times the weights, so a dot product with another margin's is a covariance."""
+        return self.centered_ranks if self.weights is None else self.centered_ranks * self.weights
+
+    @cached_property
+    def centered_ranks_norm(self) -> float:
+        """Weighted Euclidean norm of :attr:`centered_ranks`; ``0`` for a constant margin."""
+        return float(np.sqrt(self.weighted_centered_ranks @ self.centered_ranks))
+
+    @cached_property
+    def pseudo_observations(self) -> np.ndarray:
+        if self.weights is None:
+            return self.ranks / self.size
+        pseudo_observations = np.empty(self.size, dtype=float)
+        pseudo_observations[self.order] = self._weight_before[:-1] / self.total_weight
+        return pseudo_observations
+
+    @cached_property
+    def sorted_pseudo_observations(self) -> np.ndarray:
+        return self.pseudo_observations[self.order]
+
+    def compute_copula_summaries(self) -> None:
+        """Compute the summaries the copula grids read, which a pickled copy then carries instead of re-sorting."""
+        _ = self.pseudo_observations
+        if self.is_discrete:
+            _ = self.jump_points
+
+    @cached_property
+    def is_discrete(self) -> bool:
+        if self.margin_type is not None:
+            return self.margin_type == MarginType.DISCRETE
+        return is_discrete(self.values)
+
+    @cached_property
+    def value_counts(self) -> np.ndarray:
+        """Number of observations of each integer value ``0..max``."""
+        return np.bincount(self.values.astype(int), weights=self.weights)
+
+    @cached_property
+    def cumulative(self) -> np.ndarray:
+        """Empirical CDF at each integer value ``0..max``."""
+        counts = np.cumsum(self.value_counts)
+        # divide by the sum itself so that fractional weights still end at exactly 1.0
+        return counts / counts[-1]
+
+    @cached_property
+    def jump_points(self) -> np.ndarray:
+        """The sorted, distinct, attained CDF values (range of F), with a leading 0.0."""
+        min_val = int(np.min(self.values))
+        value_counts = np.bincount((self.values - min_val).astype(int), weights=self.weights)
+        counts = np.cumsum(value_counts)
+        return np.concatenate(([0.0], counts / counts[-1]))
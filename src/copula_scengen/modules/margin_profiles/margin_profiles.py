@@ -0,0 +1,143 @@
+from collections.abc import Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from copula_scengen.modules.margin_profiles.margin_profile import MarginProfile
+from copula_scengen.schemas.margin_type import MarginType
+
+
+class MarginProfiles:
+    """
+    Store of one :class:`MarginProfile` per column of ``data``, built lazily on first access.
+
+    Created once per generation run and handed to the copula providers and the transformers,
+    so that each column is sorted, ranked and counted a single time.
+
+    ``weights`` gives the number of observations each row of ``data`` stands for (see
+    :class:`MarginProfile`); :meth:`deduplicate` builds such a store from raw data.
+    ``margin_types`` optionally declares the type of each column, ``None`` entries are inferred.
+
+    ``data`` may also be a 2D float array (see :meth:`from_array`). Every profile then views a
+    column of that array in place, and :attr:`data` is only wrapped around it when asked for.
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame | np.ndarray,
+        profiles: Sequence[MarginProfile] | None = None,
+        weights: np.ndarray | None = None,
+        margin_types: Sequence[MarginType | None] | None = None,
+        columns: Sequence[Hashable] | None = None,
+    ) -> None:
+        if isinstance(data, pd.DataFrame):
+            self._data: pd.DataFrame | None = data
+            self._values: np.ndarray | None = None
+            self.columns: list[Hashable] = list(data.columns)
+        else:
+            self._data = None
+            self._values = np.asfortranarray(data, dtype=float)
+            if self._values.ndim != 2:  # noqa: PLR2004
+                msg = f"data must be a 2D array, got {self._values.ndim} dimensions"
+                raise ValueError(msg)
+            self.columns = list(range(self._values.shape[1])) if columns is None else list(columns)
+            if len(self.columns) != self._values.shape[1]:
+                msg = f"Expected {self._values.shape[1]} column names, got {len(self.columns)}"
+                raise ValueError(msg)
+
+        n_rows = data.shape[0]
+        if weights is not None:
+            weights = np.asarray(weights)
+            if weights.shape != (n_rows,):
+                msg = f"weights must have one entry per row of data ({n_rows}), got shape {weights.shape}"
+                raise ValueError(msg)
+            if not (np.isfinite(weights).all() and (weights > 0).all()):
+                msg = "weights must be finite and positive"
+                raise ValueError(msg)
+        if margin_types is not None and len(margin_types) != len(self.columns):
+            msg = f"Expected {len(self.columns)} margin types, got {len(margin_types)}"
+            raise ValueError(msg)
+        self.weights = weights
+        self.margin_types = None if margin_types is None else list(margin_types)
+        self._profiles: dict[int, MarginProfile] = dict(enumerate(profiles or []))
+        self._check_declared_discrete()
+
+    def _check_declared_discrete(self) -> None:
+        """Build the profiles of the columns declared discrete now, which rejects non-integer values up front."""
+        for margin, margin_type in enumerate(self.margin_types or []):
+            if margin_type == MarginType.DISCRETE and margin not in self._profiles:
+                try:
+                    self[margin]
+                except ValueError as error:
+                    msg = f"Column {self.columns[margin]!r}: {error}"
+                    raise ValueError(msg) from error
+
+    @classmethod
+    def from_array(
+        cls,
+        values: np.ndarray,
+        columns: Sequence[Hashable] | None = None,
+        weights: np.ndarray | None = None,
+        margin_types: Sequence[MarginType | None] | None = None,
+    ) -> "MarginProfiles":
+        """Store over the columns of the 2D array ``values``, converted to Fortran-ordered floats only if needed."""
+        return cls(values, weights=weights, margin_types=margin_types, columns=columns)
+
+    @classmethod
+    def deduplicate(
+        cls,
+        data: pd.DataFrame | np.ndarray,
+        weights: np.ndarray | None = None,
+        margin_types: Sequence[MarginType | None] | None = None,
+    ) -> "MarginProfiles":
+        """
+        Collapse identical rows of ``data`` into one row weighted by their count (or total weight).
+
+        The profiles, copulas and transformations then scale with the number of distinct rows.
+        """
+        unique_rows, inverse = np.unique(np.asarray(data, dtype=float), axis=0, return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=weights, minlength=unique_rows.shape[0])
+        columns = data.columns if isinstance(data, pd.DataFrame) else None
+        return cls(unique_rows, weights=counts, margin_types=margin_types, columns=columns)
+
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            self._data = pd.DataFrame(self._values, columns=self.columns, copy=False)
+        return self._data
+
+    def __len__(self) -> int:
+        """Number of margins (columns of ``data``)."""
+        return len(self.columns)
+
+    def column(self, margin: int) -> np.ndarray:
+        """Values of column ``margin``, a view when the store is backed by an array."""
+        if self._values is not None:
+            return self._values[:, margin]
+        return self.data.iloc[:, margin].to_numpy()
+
+    def __getitem__(self, margin: int) -> MarginProfile:
+        """Profile of column ``margin``, computed on first access."""
+        if margin not in self._profiles:
+            margin_type = None if self.margin_types is None else self.margin_types[margin]
+            self._profiles[margin] = MarginProfile(
+                values=self.column(margin), weights=self.weights, margin_type=margin_type
+            )
+        return self._profiles[margin]
+
+    def select(self, margins: Sequence[int]) -> list[MarginProfile]:
+        return [self[margin] for margin in margins]
+
+    def subset(self, margins: Sequence[int]) -> "MarginProfiles":
+        """Store over ``data.iloc[:, margins]`` sharing this store's profile objects."""
+        margins = list(margins)
+        profiles = self.select(margins)
+        if self._values is not None:
+            columns = [self.columns[margin] for margin in margins]
+            subset = MarginProfiles(self._values[:, margins], profiles=profiles, columns=columns)
+        else:
+            subset = MarginProfiles(self.data.iloc[:, margins], profiles=profiles)
+        # already validated; skip re-checking the weights for every pair
+        subset.weights = self.weights
+        subset.margin_types = None if self.margin_types is None else [self.margin_types[m] for m in margins]
+        return subset
@@ -0,0 +1,4 @@
+from copula_scengen.modules.observers.base import GenerationObserver
+from copula_scengen.modules.observers.logging_observer import LoggingObserver
+
+__all__ = ["GenerationObserver", "LoggingObserver"]
@@ -0,0 +1,46 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class GenerationObserver:
+    """
+    Receives timing and progress events from the generation pipeline.
+
+    Every hook is a no-op here, so an unobserved run pays one empty method call per event;
+    subclasses override just the hooks they need, e.g. to log or to export metrics. Stages
+    are named ``fit``, ``scenario_generation``, ``copula_sample_generation``,
+    ``margin_assignment``, ``checkpoint``, ``copula_sample_transformation``,
+    ``margin_transformation`` and ``decoding``; per-margin stages also carry the margin index.
+
+    Every started stage is closed by exactly one :meth:`on_stage_end` or, when the stage
+    raised, :meth:`on_stage_error`, which defaults to :meth:`on_stage_end`.
+    """
+
+    def on_stage_start(self, stage: str, margin: int | None = None) -> None:
+        """A stage started."""
+
+    def on_stage_end(self, stage: str, seconds: float, margin: int | None = None) -> None:
+        """A stage finished after ``seconds`` of wall time."""
+
+    def on_stage_error(self, stage: str, seconds: float, error: BaseException, margin: int | None = None) -> None:  # noqa: ARG002
+        """A stage raised ``error`` after ``seconds`` of wall time; reported as its end unless overridden."""
+        self.on_stage_end(stage, seconds=seconds, margin=margin)
+
+    def on_progress(self, margin: int, assigned: int, n_scenarios: int) -> None:
+        """``assigned`` of the ``n_scenarios`` ranks of ``margin`` have been assigned."""
+
+    def on_target_grids_built(self, margin: int, n_grids: int, seconds: float, nbytes: int) -> None:
+        """The target grids of ``margin`` against its prior margins were built, holding ``nbytes``."""
+
+    @contextmanager
+    def stage(self, stage: str, margin: int | None = None) -> Iterator[None]:
+        """Report the start and end of the enclosed block as ``stage``."""
+        self.on_stage_start(stage, margin=margin)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as error:
+            self.on_stage_error(stage, seconds=time.perf_counter() - start, error=error, margin=margin)
+            raise
+        self.on_stage_end(stage, seconds=time.perf_counter() - start, margin=margin)
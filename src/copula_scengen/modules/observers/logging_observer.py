@@ -0,0 +1,52 @@
+import logging
+
+from copula_scengen.modules.observers.base import GenerationObserver
+
+
+class LoggingObserver(GenerationObserver):
+    """
+    Write pipeline events to a :mod:`logging` logger.
+
+    Progress is logged each time a margin crosses another ``progress_step`` fraction of its
+    ranks, so long runs report a bounded number of lines per margin.
+    """
+
+    def __init__(
+        self, logger: logging.Logger | None = None, level: int = logging.INFO, progress_step: float = 0.1
+    ) -> None:
+        self._logger = logger or logging.getLogger("copula_scengen")
+        self._level = level
+        self._progress_step = progress_step
+        self._next_progress: dict[int, float] = {}
+
+    @staticmethod
+    def _label(stage: str, margin: int | None) -> str:
+        return stage if margin is None else f"{stage} (margin {margin})"
+
+    def on_stage_start(self, stage: str, margin: int | None = None) -> None:
+        self._logger.log(self._level, "%s started", self._label(stage, margin))
+
+    def on_stage_end(self, stage: str, seconds: float, margin: int | None = None) -> None:
+        self._logger.log(self._level, "%s finished in %.3f s", self._label(stage, margin), seconds)
+
+    def on_stage_error(self, stage: str, seconds: float, error: BaseException, margin: int | None = None) -> None:
+        self._logger.log(self._level, "%s failed after %.3f s: %r", self._label(stage, margin), seconds, error)
+
+    def on_progress(self, margin: int, assigned: int, n_scenarios: int) -> None:
+        fraction = assigned / n_scenarios
+        if assigned == 1:
+            self._next_progress[margin] = 0.0
+        if fraction < self._next_progress.get(margin, 0.0) and assigned != n_scenarios:
+            return
+        self._next_progress[margin] = fraction + self._progress_step
+        self._logger.log(self._level, "margin %d: %d/%d ranks assigned", margin, assigned, n_scenarios)
+
+    def on_target_grids_built(self, margin: int, n_grids: int, seconds: float, nbytes: int) -> None:
+        self._logger.log(
+            self._level,
+            "margin %d: built %d target grids in %.3f s (%.1f KiB)",
+            margin,
+            n_grids,
+            seconds,
+            nbytes / 1024,
+        )
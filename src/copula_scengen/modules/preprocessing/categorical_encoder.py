@@ -3,10 +3,18 @@ import pandas as pd
 
 from copula_scengen.modules.preprocessing.base import DataEncoder
 
-CATEGORICAL_DTYPE_KINDS = ("category", "object")
+CATEGORICAL_DTYPE_KINDS = ("category", "object", "string")
 
 
 class CategoricalEncoder(DataEncoder):
+    """
+    Encode categorical, object and string columns as integer codes, leaving the others untouched.
+
+    ``pd.Categorical`` columns reuse their existing codes through a lookup table over the
+    categories, and object or string columns are factorized in a single sorting pass. Neither
+    :meth:`encode` nor :meth:`decode` copies the columns they do not re-code.
+    """
+
     def encode(self, data: pd.DataFrame) -> tuple[pd.DataFrame, dict[str, np.ndarray]]:
         """
         Validate `data`, then map categorical columns to integer codes starting at 0.
@@ -17,22 +25,26 @@ class CategoricalEncoder(DataEncoder):
         """
         self._validate(data)
 
-        encoded = data.copy()
+        # shallow: the numeric columns are shared with ``data``, re-coded ones replaced
+        encoded = data.copy(deep=False)
         mapping: dict[str, np.ndarray] = {}
 
-        for column in data.columns:
-            if self._is_categorical(data[column]):
-                categories = np.sort(data[column].unique())
-                codes = np.searchsorted(categories, data[column].to_numpy())
-
-                encoded[column] = codes
-                mapping[column] = categories
+        for column, values in data.items():
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes, categories = self._recode_categorical(values)
+            elif self._is_categorical(values):
+                codes, uniques = pd.factorize(values, sort=True)
+                categories = np.asarray(uniques, dtype=object)
+            else:
+                continue
+            encoded[column] = codes
+            mapping[column] = categories
 
         return encoded, mapping
 
     def decode(self, data: pd.DataFrame, mapping: dict[str, np.ndarray]) -> pd.DataFrame:
         """Map integer-coded categorical columns in `data` back to their original values."""
-        decoded = data.copy()
+        decoded = data.copy(deep=False)
 
         for column, categories in mapping.items():
             codes = np.rint(decoded[column].to_numpy()).astype(int)
@@ -40,15 +52,37 @@ class CategoricalEncoder(DataEncoder):
 
         return decoded
 
+    def _recode_categorical(self, column: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Codes of ``column`` into its observed categories in sorted order, and those categories.
+
+        The existing codes are remapped through a table with one entry per category, so the
+        rows are only touched by a ``bincount`` and one gather.
+        """
+        codes = column.cat.codes.to_numpy()
+        categories = column.cat.categories
+        observed = np.flatnonzero(np.bincount(codes, minlength=len(categories)))
+        observed_categories = np.asarray(categories[observed])
+        order = np.argsort(observed_categories, kind="stable")
+
+        lookup = np.zeros(len(categories), dtype=np.intp)
+        lookup[observed[order]] = np.arange(observed.size)
+        return lookup[codes], observed_categories[order]
+
     def _is_categorical(self, column: pd.Series) -> bool:
-        return isinstance(column.dtype, pd.CategoricalDtype) or column.dtype == object
+        return isinstance(column.dtype, (pd.CategoricalDtype, pd.StringDtype)) or column.dtype == object
 
     def _validate(self, data: pd.DataFrame) -> None:
-        if data.isna().any().any():
-            msg = "Data contains missing values"
-            raise ValueError(msg)
+        """Check ``data`` column by column; missing values take precedence over infinite ones."""
+        infinite = False
+        for name in data.columns:
+            column = data[name]
+            if column.isna().any():
+                msg = "Data contains missing values"
+                raise ValueError(msg)
+            if not infinite and column.dtype.kind == "f":
+                infinite = not np.isfinite(column.to_numpy(dtype=float)).all()
 
-        numeric_columns = data.select_dtypes(include=[np.number])
-        if not numeric_columns.empty and not np.isfinite(numeric_columns.to_numpy()).all():
+        if infinite:
             msg = "Data contains infinite values"
             raise ValueError(msg)
@@ -1,9 +1,11 @@
 from copula_scengen.modules.copula_sample_generators.base import CopulaSampleGenerationStrategy
 from copula_scengen.modules.copula_sample_transformers.base import CopulaSampleTransformationStrategy
+from copula_scengen.modules.scenario_generators.fitted_scenario_generator import FittedScenarioGenerator
 from copula_scengen.modules.scenario_generators.scenario_generator import ScenarioGenerator
 
 __all__ = [
     "CopulaSampleGenerationStrategy",
     "CopulaSampleTransformationStrategy",
+    "FittedScenarioGenerator",
     "ScenarioGenerator",
 ]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from copula_scengen.modules.margin_profiles import MarginProfiles
+from copula_scengen.modules.scenario_generators.fitted_scenario_generator import FittedScenarioGenerator
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterator, Sequence
+
+    from copula_scengen.modules.copula_sample_generators.base import CopulaSampleGenerationStrategy
+    from copula_scengen.modules.copula_sample_transformers.base import CopulaSampleTransformationStrategy
+    from copula_scengen.modules.observers import GenerationObserver
+    from copula_scengen.modules.preprocessing import DataEncoder
+    from copula_scengen.schemas.generation_job import GenerationJob
+    from copula_scengen.schemas.margin_type import MarginType
+
+# per worker process: the pool model and, once built, the model fitted on all rows
+_WORKER_STATE: dict[str, object] = {}
+
+
+class SharedArray:
+    """
+    Float array copied once into shared memory, which pickles as its name and shape only.
+
+    Unpickling attaches to the same block, so a worker process reads the array in place.
+    The creating process frees the block with :meth:`release` once the workers are done.
+    """
+
+    def __init__(self, values: np.ndarray) -> None:
+        self.shape = values.shape
+        self._memory = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self.name = self._memory.name
+        self.array()[...] = values
+
+    def array(self) -> np.ndarray:
+        return np.ndarray(self.shape, dtype=float, buffer=self._memory.buf, order="F")
+
+    def __getstate__(self) -> dict[str, object]:
+        """Pickle the block's name and shape, never its contents."""
+        return {"name": self.name, "shape": self.shape}
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        """Attach to the block named in ``state``."""
+        self.name = state["name"]
+        self.shape = state["shape"]
+        self._memory = shared_memory.SharedMemory(name=self.name)
+
+    def release(self) -> None:
+        self._memory.close()
+        self._memory.unlink()
+
+
+class PoolModel:
+    """Everything a worker needs to fit and run jobs on the shared, encoded data."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        values: np.ndarray,
+        weights: np.ndarray | None,
+        columns: Sequence[Hashable],
+        margin_types: Sequence[MarginType | None] | None,
+        category_mapping: dict[str, np.ndarray],
+        data_encoder: DataEncoder,
+        copula_sample_generation_strategy: CopulaSampleGenerationStrategy,
+        copula_sample_transformation_strategy: CopulaSampleTransformationStrategy,
+        observer: GenerationObserver,
+        deduplicate: bool,
+    ) -> None:
+        self.values = SharedArray(values)
+        self.weights = None if weights is None else SharedArray(np.asarray(weights, dtype=float))
+        self.columns = list(columns)
+        self.margin_types = margin_types
+        self.category_mapping = category_mapping
+        self.data_encoder = data_encoder
+        self.copula_sample_generation_strategy = copula_sample_generation_strategy
+        self.copula_sample_transformation_strategy = copula_sample_transformation_strategy
+        self.observer = observer
+        self.deduplicate = deduplicate
+
+    def fit(self, rows: np.ndarray | None) -> FittedScenarioGenerator:
+        """Model fitted on ``rows`` of the shared data, or on all of it in place for ``None``."""
+        values = self.values.array()
+        weights = None if self.weights is None else self.weights.array()
+        if rows is not None:
+            values = np.asfortranarray(values[rows])
+            weights = None if weights is None else weights[rows]
+
+        if self.deduplicate:
+            data = pd.DataFrame(values, columns=self.columns, copy=False)
+            margin_profiles = MarginProfiles.deduplicate(data, weights=weights, margin_types=self.margin_types)
+        else:
+            margin_profiles = MarginProfiles.from_array(
+                values, columns=self.columns, weights=weights, margin_types=self.margin_types
+            )
+        return FittedScenarioGenerator(
+            margin_profiles=margin_profiles,
+            category_mapping=self.category_mapping,
+            data_encoder=self.data_encoder,
+            copula_sample_generation_strategy=self.copula_sample_generation_strategy,
+            copula_sample_transformation_strategy=self.copula_sample_transformation_strategy,
+            observer=self.observer,
+        )
+
+    def release(self) -> None:
+        self.values.release()
+        if self.weights is not None:
+            self.weights.release()
+
+
+def initialize_worker(model: PoolModel) -> None:
+    _WORKER_STATE.clear()
+    _WORKER_STATE["model"] = model
+
+
+def run_job(n_scenarios: int, rows: np.ndarray | None) -> pd.DataFrame:
+    model: PoolModel = _WORKER_STATE["model"]
+    if rows is not None:
+        return model.fit(rows).generate(n_scenarios=n_scenarios)
+    # jobs on all rows share one model, so its columns are profiled once per worker
+    if "fitted" not in _WORKER_STATE:
+        _WORKER_STATE["fitted"] = model.fit(None)
+    fitted: FittedScenarioGenerator = _WORKER_STATE["fitted"]
+    return fitted.generate(n_scenarios=n_scenarios)
+
+
+def stream_jobs(
+    model_factory: Callable[[], PoolModel], jobs: Sequence[GenerationJob], max_workers: int | None
+) -> Iterator[tuple[int, pd.DataFrame]]:
+    """Run ``jobs`` on a process pool, yielding ``(job index, scenarios)`` as each one completes."""
+    model = model_factory()
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=initialize_worker, initargs=(model,)) as executor:
+            futures = {executor.submit(run_job, job.n_scenarios, job.rows): index for index, job in enumerate(jobs)}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                # the consumer stopped early or a job failed: drop the jobs not started yet
+                for future in futures:
+                    future.cancel()
+    finally:
+        model.release()
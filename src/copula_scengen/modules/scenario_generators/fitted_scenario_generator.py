@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+import pandas as pd
+
+from copula_scengen.modules.copula_sample_generators import CopulaSampleGenerator
+from copula_scengen.modules.copula_sample_transformers import CopulaSampleTransformer
+from copula_scengen.modules.margin_profiles import MarginProfile, MarginProfiles
+from copula_scengen.modules.observers import GenerationObserver
+from copula_scengen.modules.preprocessing import CategoricalEncoder
+from copula_scengen.schemas.generation_report import GenerationOutcome
+from copula_scengen.schemas.margin_type import MarginType
+
+if TYPE_CHECKING:
+    from copula_scengen.modules.copula.copula_sample import CopulaSample
+    from copula_scengen.modules.copula_sample_generators.base import CopulaSampleGenerationStrategy
+    from copula_scengen.modules.copula_sample_transformers.base import CopulaSampleTransformationStrategy
+    from copula_scengen.modules.preprocessing import DataEncoder
+
+_FORMAT_VERSION = 1
+_META_FILE = "meta.json"
+_VALUES_FILE = "values.npy"
+_ORDERS_FILE = "orders.npy"
+_WEIGHTS_FILE = "weights.npy"
+
+
+class FittedScenarioGenerator:
+    """
+    Scenario generator bound to one history, produced by :meth:`ScenarioGenerator.fit`.
+
+    Encoding the data and sorting every column happen once, at fit time; each :meth:`generate`
+    call then only runs the copula sample generation and transformation for the requested
+    number of scenarios. The pairwise copulas are thin views over the shared margin profiles,
+    so they are rebuilt for free per call rather than stored.
+
+    :meth:`save` writes a directory of plain ``.npy`` arrays plus a small JSON header;
+    :meth:`load` memory-maps the arrays by default, so many worker processes can share one
+    fitted model without refitting or copying it. The margin types resolved at fit time are
+    saved with the arrays, so a loaded model never infers them again.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        margin_profiles: MarginProfiles,
+        category_mapping: dict[str, np.ndarray],
+        data_encoder: DataEncoder,
+        copula_sample_generation_strategy: CopulaSampleGenerationStrategy,
+        copula_sample_transformation_strategy: CopulaSampleTransformationStrategy,
+        observer: GenerationObserver | None = None,
+    ) -> None:
+        self.margin_profiles = margin_profiles
+        self.category_mapping = category_mapping
+        self._data_encoder = data_encoder
+        self._copula_sample_generation_strategy = copula_sample_generation_strategy
+        self._copula_sample_transformation_strategy = copula_sample_transformation_strategy
+        self._observer = observer or GenerationObserver()
+
+    @property
+    def margin_types(self) -> list[MarginType]:
+        """Type of every margin, as declared or as inferred once when first needed."""
+        return [
+            MarginType.DISCRETE if self.margin_profiles[margin].is_discrete else MarginType.CONTINUOUS
+            for margin in range(len(self.margin_profiles))
+        ]
+
+    def generate(self, n_scenarios: int) -> pd.DataFrame:
+        with self._observer.stage("scenario_generation"):
+            return self._decode(self._generate_values(n_scenarios))
+
+    def transform(self, copula_sample: CopulaSample) -> pd.DataFrame:
+        """Decoded scenarios of a complete ``copula_sample`` generated for this model's margins."""
+        with self._observer.stage("scenario_generation"):
+            values = self._copula_sample_transformation_strategy.transform_to_array(
+                margin_profiles=self.margin_profiles, copula_sample=copula_sample
+            )
+            return self._decode(values)
+
+    def _decode(self, values: np.ndarray) -> pd.DataFrame:
+        columns = self.margin_profiles.data.columns[: values.shape[1]]
+        result = pd.DataFrame(values, columns=columns)
+
+        category_mapping = {
+            column: categories for column, categories in self.category_mapping.items() if column in result.columns
+        }
+        with self._observer.stage("decoding"):
+            return self._data_encoder.decode(result, category_mapping)
+
+    def generate_array(self, n_scenarios: int) -> np.ndarray:
+        """
+        Generate ``(n_scenarios, n_margins)`` encoded scenario values, without building DataFrames.
+
+        Categorical columns hold their integer codes; :attr:`category_mapping` maps them back.
+        """
+        with self._observer.stage("scenario_generation"):
+            return self._generate_values(n_scenarios)
+
+    def _generate_values(self, n_scenarios: int) -> np.ndarray:
+        if not isinstance(n_scenarios, int):
+            msg = "n_scenarios must be an int"
+            raise TypeError(msg)
+
+        copula_sample = self._copula_sample_generation_strategy.create_from_profiles(
+            margin_profiles=self.margin_profiles, n_scenarios=n_scenarios
+        )
+        # a generator stopped early returns only the leading margins it completed
+        margin_profiles = self.margin_profiles
+        report = self._copula_sample_generation_strategy.last_report
+        if report is not None and report.outcome == GenerationOutcome.PARTIAL:
+            margin_profiles = margin_profiles.subset(range(report.completed_margins))
+        return self._copula_sample_transformation_strategy.transform_to_array(
+            margin_profiles=margin_profiles, copula_sample=copula_sample
+        )
+
+    def save(self, path: str | Path) -> None:
+        """Write the fitted state to directory ``path``, creating it if needed."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        data = self.margin_profiles.data
+        n_margins = len(self.margin_profiles)
+        np.save(path / _VALUES_FILE, np.asfortranarray(data.to_numpy(dtype=float)))
+        orders = np.empty(data.shape, dtype=np.intp, order="F")
+        for margin in range(n_margins):
+            orders[:, margin] = self.margin_profiles[margin].order
+        np.save(path / _ORDERS_FILE, orders)
+        if self.margin_profiles.weights is not None:
+            np.save(path / _WEIGHTS_FILE, self.margin_profiles.weights)
+
+        mapped_columns = list(self.category_mapping)
+        for index, column in enumerate(mapped_columns):
+            categories = np.asarray(self.category_mapping[column].tolist())
+            if categories.dtype == object:
+                msg = f"Categories of column {column!r} cannot be stored without pickling"
+                raise TypeError(msg)
+            np.save(path / f"mapping_{index}.npy", categories)
+
+        meta = {
+            "format_version": _FORMAT_VERSION,
+            "columns": list(data.columns),
+            "mapped_columns": mapped_columns,
+            "weighted": self.margin_profiles.weights is not None,
+            "margin_types": [str(margin_type) for margin_type in self.margin_types],
+        }
+        (path / _META_FILE).write_text(json.dumps(meta))
+
+    @classmethod
+    def load(  # noqa: PLR0913
+        cls,
+        path: str | Path,
+        *,
+        copula_sample_generation_strategy: CopulaSampleGenerationStrategy | None = None,
+        copula_sample_transformation_strategy: CopulaSampleTransformationStrategy | None = None,
+        data_encoder: DataEncoder | None = None,
+        mmap_mode: Literal["r", "c"] | None = "r",
+        observer: GenerationObserver | None = None,
+    ) -> FittedScenarioGenerator:
+        """Load a model written by :meth:`save`; strategies default as in ``ScenarioGenerator``."""
+        path = Path(path)
+        meta = json.loads((path / _META_FILE).read_text())
+        if meta["format_version"] != _FORMAT_VERSION:
+            msg = f"Unsupported fitted model format version {meta['format_version']}"
+            raise ValueError(msg)
+
+        values = np.load(path / _VALUES_FILE, mmap_mode=mmap_mode, allow_pickle=False)
+        orders = np.load(path / _ORDERS_FILE, mmap_mode=mmap_mode, allow_pickle=False)
+        weights = np.load(path / _WEIGHTS_FILE, allow_pickle=False) if meta.get("weighted", False) else None
+        data = pd.DataFrame(values, columns=meta["columns"], copy=False)
+        margin_types = meta.get("margin_types", [None] * values.shape[1])
+        profiles = [
+            MarginProfile(values=values[:, j], order=orders[:, j], weights=weights, margin_type=margin_types[j])
+            for j in range(values.shape[1])
+        ]
+
+        category_mapping = {
+            column: np.load(path / f"mapping_{index}.npy", allow_pickle=False)
+            for index, column in enumerate(meta["mapped_columns"])
+        }
+
+        return cls(
+            margin_profiles=MarginProfiles(data, profiles=profiles, weights=weights, margin_types=margin_types),
+            category_mapping=category_mapping,
+            data_encoder=data_encoder or CategoricalEncoder(),
+            copula_sample_generation_strategy=copula_sample_generation_strategy
+            or CopulaSampleGenerator(observer=observer),
+            copula_sample_transformation_strategy=copula_sample_transformation_strategy
+            or CopulaSampleTransformer(observer=observer),
+            observer=observer,
+        )
@@ -1,24 +1,79 @@
 from __future__ import annotations
 
+from functools import partial
+from typing import TYPE_CHECKING
+
+import numpy as np
 import pandas as pd
 
+from copula_scengen.modules.copula import HistogramCopulaProvider
 from copula_scengen.modules.copula_sample_generators import CopulaSampleGenerator
 from copula_scengen.modules.copula_sample_generators.base import CopulaSampleGenerationStrategy
 from copula_scengen.modules.copula_sample_transformers import CopulaSampleTransformer
 from copula_scengen.modules.copula_sample_transformers.base import CopulaSampleTransformationStrategy
+from copula_scengen.modules.margin_profiles import MarginProfiles
+from copula_scengen.modules.observers import GenerationObserver
 from copula_scengen.modules.preprocessing import CategoricalEncoder, DataEncoder
+from copula_scengen.modules.scenario_generators import _pool
 from copula_scengen.modules.scenario_generators.base import BaseScenarioGenerator
+from copula_scengen.modules.scenario_generators.fitted_scenario_generator import FittedScenarioGenerator
+from copula_scengen.schemas.generation_job import GenerationJob
+from copula_scengen.schemas.margin_type import MarginType
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterator, Mapping, Sequence
+
+    from copula_scengen.modules.copula import PairwiseHistogramAccumulator
 
 
 class ScenarioGenerator(BaseScenarioGenerator):
-    def __init__(
+    """
+    Generate scenarios from historical data with pluggable strategies.
+
+    ``observer`` receives the timing and progress events of the whole pipeline. It is handed
+    to the default strategies; injected strategies report to the observer they were built with.
+
+    Observation ``weights`` passed to :meth:`fit` or :meth:`generate` make each row of ``data``
+    count as that many observations. With ``deduplicate=True`` identical rows are collapsed into
+    one weighted row before profiling, so the cost scales with the number of distinct rows.
+
+    :meth:`fit_array` and :meth:`generate_array` take a numeric 2D array instead of a DataFrame
+    and return arrays. A Fortran-ordered float array is used in place from profiling to the
+    transformations, and the DataFrame methods are thin wrappers over the same pipeline.
+
+    ``margin_types`` declares the :class:`MarginType` of columns by name (by position for
+    arrays). Declared types are taken as given; the others are inferred once per column when
+    the data is profiled, and every stage then uses that single decision. Categorical columns
+    are always discrete.
+
+    :meth:`fit_accumulator` fits on a :class:`PairwiseHistogramAccumulator` instead of raw rows.
+
+    :meth:`generate_batch` generates scenario sets for many data sets with the same columns at
+    once, amortizing the per-rank overhead of the greedy loop over the whole batch.
+
+    :meth:`generate_many` fans independent jobs on one data set, such as different scenario
+    counts or bootstrap resamples, out to a process pool and streams back their results.
+    """
+
+    def __init__(  # noqa: PLR0913
         self,
         copula_sample_generation_strategy: CopulaSampleGenerationStrategy | None = None,
         copula_sample_transformation_strategy: CopulaSampleTransformationStrategy | None = None,
         data_encoder: DataEncoder | None = None,
+        observer: GenerationObserver | None = None,
+        *,
+        deduplicate: bool = False,
+        margin_types: Mapping[Hashable, MarginType] | None = None,
     ) -> None:
-        self._copula_sample_generation_strategy = copula_sample_generation_strategy or CopulaSampleGenerator()
-        self._copula_sample_transformation_strategy = copula_sample_transformation_strategy or CopulaSampleTransformer()
+        self._deduplicate = deduplicate
+        self._margin_types = {column: MarginType(margin_type) for column, margin_type in (margin_types or {}).items()}
+        self._observer = observer or GenerationObserver()
+        self._copula_sample_generation_strategy = copula_sample_generation_strategy or CopulaSampleGenerator(
+            observer=self._observer
+        )
+        self._copula_sample_transformation_strategy = copula_sample_transformation_strategy or CopulaSampleTransformer(
+            observer=self._observer
+        )
         self._data_encoder = data_encoder or CategoricalEncoder()
 
     def set_data_encoder(self, encoder: DataEncoder) -> None:
@@ -43,17 +98,214 @@ class ScenarioGenerator(BaseScenarioGenerator):
             )
         self._copula_sample_transformation_strategy = strategy
 
-    def generate(self, data: pd.DataFrame, n_scenarios: int) -> pd.DataFrame:
+    def _resolve_margin_types(
+        self, columns: Sequence[Hashable], categorical_columns: Sequence[Hashable] = ()
+    ) -> list[MarginType | None] | None:
+        """Declared type of each of ``columns``, ``None`` where it is left to inference."""
+        unknown = [column for column in self._margin_types if column not in columns]
+        if unknown:
+            msg = f"margin_types given for unknown columns {unknown}"
+            raise ValueError(msg)
+        for column in categorical_columns:
+            if self._margin_types.get(column, MarginType.DISCRETE) != MarginType.DISCRETE:
+                msg = f"Categorical column {column!r} cannot be declared {self._margin_types[column]}"
+                raise ValueError(msg)
+        if not self._margin_types and not categorical_columns:
+            return None
+        return [
+            MarginType.DISCRETE if column in categorical_columns else self._margin_types.get(column)
+            for column in columns
+        ]
+
+    def fit(self, data: pd.DataFrame, weights: np.ndarray | None = None) -> FittedScenarioGenerator:
+        """Encode and profile ``data`` once, returning a model that generates from it repeatedly."""
         if not isinstance(data, pd.DataFrame):
             msg = "data must be a pandas DataFrame"
             raise TypeError(msg)
+
+        with self._observer.stage("fit"):
+            encoded_data, category_mapping = self._data_encoder.encode(data)
+            margin_types = self._resolve_margin_types(list(encoded_data.columns), list(category_mapping))
+            if self._deduplicate:
+                margin_profiles = MarginProfiles.deduplicate(encoded_data, weights=weights, margin_types=margin_types)
+            else:
+                margin_profiles = MarginProfiles(encoded_data, weights=weights, margin_types=margin_types)
+            return FittedScenarioGenerator(
+                margin_profiles=margin_profiles,
+                category_mapping=category_mapping,
+                data_encoder=self._data_encoder,
+                copula_sample_generation_strategy=self._copula_sample_generation_strategy,
+                copula_sample_transformation_strategy=self._copula_sample_transformation_strategy,
+                observer=self._observer,
+            )
+
+    def fit_array(
+        self,
+        values: np.ndarray,
+        margin_types: Sequence[MarginType | None] | None = None,
+        weights: np.ndarray | None = None,
+    ) -> FittedScenarioGenerator:
+        """
+        Profile the columns of the numeric 2D array ``values`` once, without an encoding step.
+
+        ``margin_types`` lists the declared type of every column, ``None`` to infer it; when it
+        is omitted, the ``margin_types`` of the generator apply, keyed by column position.
+        """
+        values = np.asfortranarray(values, dtype=float)
+        if values.ndim != 2:  # noqa: PLR2004
+            msg = f"values must be a 2D array, got {values.ndim} dimensions"
+            raise ValueError(msg)
+        if margin_types is None:
+            margin_types = self._resolve_margin_types(list(range(values.shape[1])))
+        for margin in range(values.shape[1]):
+            column = values[:, margin]
+            if np.isnan(column).any():
+                msg = "Data contains missing values"
+                raise ValueError(msg)
+            if not np.isfinite(column).all():
+                msg = "Data contains infinite values"
+                raise ValueError(msg)
+
+        with self._observer.stage("fit"):
+            if self._deduplicate:
+                margin_profiles = MarginProfiles.deduplicate(values, weights=weights, margin_types=margin_types)
+            else:
+                margin_profiles = MarginProfiles.from_array(values, weights=weights, margin_types=margin_types)
+            return FittedScenarioGenerator(
+                margin_profiles=margin_profiles,
+                category_mapping={},
+                data_encoder=self._data_encoder,
+                copula_sample_generation_strategy=self._copula_sample_generation_strategy,
+                copula_sample_transformation_strategy=self._copula_sample_transformation_strategy,
+                observer=self._observer,
+            )
+
+    def fit_accumulator(self, accumulator: PairwiseHistogramAccumulator) -> FittedScenarioGenerator:
+        """
+        Model of the history summarized by ``accumulator``, which never held its rows.
+
+        The copula sample matches the accumulated pairwise histograms, through a
+        :class:`CopulaSampleGenerator` over a :class:`HistogramCopulaProvider`, and the
+        configured transformation maps it through the column sketches of
+        :meth:`PairwiseHistogramAccumulator.margin_profiles`. The accumulator's margin types apply.
+        """
+        if not accumulator.columns:
+            msg = "accumulator has not been updated with any rows"
+            raise ValueError(msg)
+        with self._observer.stage("fit"):
+            return FittedScenarioGenerator(
+                margin_profiles=accumulator.margin_profiles(),
+                category_mapping={},
+                data_encoder=self._data_encoder,
+                copula_sample_generation_strategy=CopulaSampleGenerator(
+                    copula_provider=HistogramCopulaProvider(accumulator), observer=self._observer
+                ),
+                copula_sample_transformation_strategy=self._copula_sample_transformation_strategy,
+                observer=self._observer,
+            )
+
+    def generate_array(
+        self,
+        values: np.ndarray,
+        n_scenarios: int,
+        margin_types: Sequence[MarginType | None] | None = None,
+        weights: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Generate a ``(n_scenarios, n_margins)`` array of scenarios from the columns of ``values``."""
         if not isinstance(n_scenarios, int):
             msg = "n_scenarios must be an int"
             raise TypeError(msg)
 
+        fitted = self.fit_array(values, margin_types=margin_types, weights=weights)
+        return fitted.generate_array(n_scenarios=n_scenarios)
+
+    def generate_batch(
+        self,
+        datasets: Sequence[pd.DataFrame],
+        n_scenarios: int,
+        weights: Sequence[np.ndarray | None] | None = None,
+    ) -> list[pd.DataFrame]:
+        """
+        Generate ``n_scenarios`` scenarios for each of ``datasets``, which share their columns.
+
+        The copula samples of all data sets come from one ``create_batch`` call of the copula
+        sample generation strategy, which :class:`CopulaSampleGenerator` runs as a single greedy
+        loop over the whole batch. Each result equals ``generate(data, n_scenarios)``.
+        """
+        if not isinstance(n_scenarios, int):
+            msg = "n_scenarios must be an int"
+            raise TypeError(msg)
+        if any(not isinstance(data, pd.DataFrame) for data in datasets):
+            msg = "datasets must be pandas DataFrames"
+            raise TypeError(msg)
+        if any(list(data.columns) != list(datasets[0].columns) for data in datasets):
+            msg = "All datasets must have the same columns"
+            raise ValueError(msg)
+        weights = [None] * len(datasets) if weights is None else list(weights)
+        if len(weights) != len(datasets):
+            msg = f"Expected one weights entry per dataset ({len(datasets)}), got {len(weights)}"
+            raise ValueError(msg)
+
+        fitted = [self.fit(data, weights=data_weights) for data, data_weights in zip(datasets, weights, strict=True)]
+        copula_samples = self._copula_sample_generation_strategy.create_batch(
+            [model.margin_profiles for model in fitted], n_scenarios=n_scenarios
+        )
+        return [model.transform(copula_sample) for model, copula_sample in zip(fitted, copula_samples, strict=True)]
+
+    def generate_many(
+        self,
+        data: pd.DataFrame,
+        jobs: Sequence[GenerationJob | int],
+        weights: np.ndarray | None = None,
+        max_workers: int | None = None,
+    ) -> Iterator[tuple[int, pd.DataFrame]]:
+        """
+        Run ``jobs`` on ``data`` in a pool of ``max_workers`` processes, yielding results as they complete.
+
+        An ``int`` job generates that many scenarios from all of ``data``; a :class:`GenerationJob`
+        may instead select rows of it, e.g. a bootstrap resample. ``data`` is validated and
+        encoded once here and placed in shared memory, which every worker reads in place rather
+        than receiving a pickled copy per job; only the selected rows travel with a job. Yields
+        ``(job index, scenarios)`` pairs in completion order. The strategies must be picklable.
+
+        The pool starts when iteration does, and stopping early cancels the jobs not yet started.
+        """
+        if not isinstance(data, pd.DataFrame):
+            msg = "data must be a pandas DataFrame"
+            raise TypeError(msg)
+        jobs = [job if isinstance(job, GenerationJob) else GenerationJob(n_scenarios=job) for job in jobs]
+
         encoded_data, category_mapping = self._data_encoder.encode(data)
+        margin_types = self._resolve_margin_types(list(encoded_data.columns), list(category_mapping))
+        values = np.asfortranarray(encoded_data.to_numpy(dtype=float))
+        # validate the weights against the data up front, not in the workers
+        MarginProfiles.from_array(values, weights=weights, margin_types=margin_types)
+        for job in jobs:
+            if job.rows is not None and job.rows.size and not (job.rows.min() >= 0 and job.rows.max() < len(values)):
+                msg = f"{job!r} selects rows outside the {len(values)} rows of data"
+                raise ValueError(msg)
+
+        model_factory = partial(
+            _pool.PoolModel,
+            values=values,
+            weights=weights,
+            columns=list(encoded_data.columns),
+            margin_types=margin_types,
+            category_mapping=category_mapping,
+            data_encoder=self._data_encoder,
+            copula_sample_generation_strategy=self._copula_sample_generation_strategy,
+            copula_sample_transformation_strategy=self._copula_sample_transformation_strategy,
+            observer=self._observer,
+            deduplicate=self._deduplicate,
+        )
+        return _pool.stream_jobs(model_factory, jobs, max_workers=max_workers)
 
-        copula_sample = self._copula_sample_generation_strategy.create(data=encoded_data, n_scenarios=n_scenarios)
-        result = self._copula_sample_transformation_strategy.transform(data=encoded_data, copula_sample=copula_sample)
+    def generate(self, data: pd.DataFrame, n_scenarios: int, weights: np.ndarray | None = None) -> pd.DataFrame:
+        if not isinstance(data, pd.DataFrame):
+            msg = "data must be a pandas DataFrame"
+            raise TypeError(msg)
+        if not isinstance(n_scenarios, int):
+            msg = "n_scenarios must be an int"
+            raise TypeError(msg)
 
-        return self._data_encoder.decode(result, category_mapping)
+        return self.fit(data, weights=weights).generate(n_scenarios=n_scenarios)
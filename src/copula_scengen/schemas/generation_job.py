@@ -0,0 +1,22 @@
+import numpy as np
+
+
+class GenerationJob:
+    """
+    One scenario set of a :meth:`ScenarioGenerator.generate_many` run.
+
+    ``rows`` selects, possibly with repetition, the rows of the shared data the job is fitted
+    on, e.g. a bootstrap resample; ``None`` uses the data as given.
+    """
+
+    def __init__(self, n_scenarios: int, rows: np.ndarray | None = None) -> None:
+        if not isinstance(n_scenarios, int):
+            msg = "n_scenarios must be an int"
+            raise TypeError(msg)
+        self.n_scenarios = n_scenarios
+        self.rows = None if rows is None else np.asarray(rows, dtype=np.intp)
+
+    def __repr__(self) -> str:
+        """Show the scenario count and how many rows the job is fitted on."""
+        rows = "all" if self.rows is None else self.rows.size
+        return f"GenerationJob(n_scenarios={self.n_scenarios}, rows={rows})"
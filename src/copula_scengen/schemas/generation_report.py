@@ -0,0 +1,38 @@
+from enum import StrEnum
+
+
+class BudgetPolicy(StrEnum):
+    """What the generator does when its time budget runs out or it is cancelled."""
+
+    PARTIAL = "partial"
+    FALLBACK = "fallback"
+
+
+class GenerationOutcome(StrEnum):
+    COMPLETED = "completed"
+    PARTIAL = "partial"
+    FALLBACK = "fallback"
+
+
+class GenerationReport:
+    """
+    How a copula sample generation run ended.
+
+    ``completed_margins`` counts the leading margins whose ranks were assigned by the full greedy
+    heuristic; ``fallback_margins`` lists the margins completed by the cheaper fallback instead.
+    A ``PARTIAL`` sample only holds the completed margins.
+    """
+
+    def __init__(
+        self, outcome: GenerationOutcome, completed_margins: int, fallback_margins: tuple[int, ...] = ()
+    ) -> None:
+        self.outcome = outcome
+        self.completed_margins = completed_margins
+        self.fallback_margins = fallback_margins
+
+    def __repr__(self) -> str:
+        """Show the outcome and the margin counts, e.g. for logs."""
+        return (
+            f"GenerationReport(outcome={self.outcome!s}, completed_margins={self.completed_margins}, "
+            f"fallback_margins={self.fallback_margins})"
+        )
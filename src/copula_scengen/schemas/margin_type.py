@@ -18,6 +18,9 @@ def is_discrete(arr: np.ndarray) -> bool:
         msg = "Array must contain numeric values only."
         raise TypeError(msg)
 
+    if np.issubdtype(arr.dtype, np.integer):
+        return True
+
     # Ignore NaNs, compare integer-casted values to originals
     arr_no_nan = arr[~np.isnan(arr)]
     return np.allclose(arr_no_nan, np.round(arr_no_nan))
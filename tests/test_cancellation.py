@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from copula_scengen.modules.copula_sample_generators import CancellationToken, CopulaSampleGenerator
+from copula_scengen.modules.observers import GenerationObserver
+from copula_scengen.modules.scenario_generators import ScenarioGenerator
+from copula_scengen.schemas.generation_report import BudgetPolicy, GenerationOutcome
+
+
+class CancelAt(GenerationObserver):
+    """Cancel ``token`` once ``rank`` ranks of ``margin`` have been assigned."""
+
+    def __init__(self, token: CancellationToken, margin: int, rank: int) -> None:
+        self._token = token
+        self._margin = margin
+        self._rank = rank
+
+    def on_progress(self, margin: int, assigned: int, n_scenarios: int) -> None:
+        if (margin, assigned) == (self._margin, self._rank):
+            self._token.cancel()
+
+
+def _data() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    a = rng.normal(size=50)
+    return pd.DataFrame(
+        {
+            "a": a,
+            "b": rng.normal(size=50),
+            "c": rng.integers(0, 4, size=50).astype(float),
+            "d": -a + 0.1 * rng.normal(size=50),
+        },
+    )
+
+
+def _generator(policy: BudgetPolicy, margin: int, rank: int) -> CopulaSampleGenerator:
+    token = CancellationToken()
+    return CopulaSampleGenerator(
+        observer=CancelAt(token, margin=margin, rank=rank), cancellation_token=token, on_budget_exhausted=policy
+    )
+
+
+def test_uncancelled_run_reports_completion() -> None:
+    generator = CopulaSampleGenerator(cancellation_token=CancellationToken(), time_budget=3600.0)
+    ranks = generator.create(data=_data(), n_scenarios=10).ranks
+
+    np.testing.assert_array_equal(ranks, CopulaSampleGenerator().create(data=_data(), n_scenarios=10).ranks)
+    assert generator.last_report.outcome == GenerationOutcome.COMPLETED
+    assert generator.last_report.completed_margins == 4
+
+
+def test_exhausted_time_budget_returns_first_margin() -> None:
+    generator = CopulaSampleGenerator(time_budget=0.0)
+    copula_sample = generator.create(data=_data(), n_scenarios=10)
+
+    assert copula_sample.ranks.shape == (10, 1)
+    assert generator.last_report.outcome == GenerationOutcome.PARTIAL
+    assert generator.last_report.completed_margins == 1
+
+
+def test_cancellation_mid_margin_keeps_completed_margins() -> None:
+    full = CopulaSampleGenerator().create(data=_data(), n_scenarios=10).ranks
+    generator = _generator(BudgetPolicy.PARTIAL, margin=2, rank=4)
+
+    ranks = generator.create(data=_data(), n_scenarios=10).ranks
+
+    np.testing.assert_array_equal(ranks, full[:, :2])
+    assert generator.last_report.outcome == GenerationOutcome.PARTIAL
+    assert generator.last_report.completed_margins == 2
+
+
+def test_fallback_completes_remaining_margins() -> None:
+    full = CopulaSampleGenerator().create(data=_data(), n_scenarios=10).ranks
+    generator = _generator(BudgetPolicy.FALLBACK, margin=2, rank=4)
+
+    ranks = generator.create(data=_data(), n_scenarios=10).ranks
+
+    assert ranks.shape == (10, 4)
+    np.testing.assert_array_equal(ranks[:, :2], full[:, :2])
+    for margin in range(4):
+        np.testing.assert_array_equal(np.sort(ranks[:, margin]), np.arange(1, 11))
+    # greedy choices made before the cancellation are kept
+    np.testing.assert_array_equal(np.isin(ranks[:, 2], [1, 2, 3, 4]), np.isin(full[:, 2], [1, 2, 3, 4]))
+    # "d" is strongly negatively correlated with "a"
+    np.testing.assert_array_equal(ranks[:, 3], 11 - ranks[:, 0])
+    assert generator.last_report.outcome == GenerationOutcome.FALLBACK
+    assert generator.last_report.completed_margins == 2
+    assert generator.last_report.fallback_margins == (2, 3)
+
+
+@pytest.mark.parametrize("policy", list(BudgetPolicy))
+def test_scenario_generator_handles_stopped_generator(policy: BudgetPolicy) -> None:
+    generator = _generator(policy, margin=3, rank=2)
+    scenarios = ScenarioGenerator(copula_sample_generation_strategy=generator).generate(data=_data(), n_scenarios=10)
+
+    expected_columns = ["a", "b", "c"] if policy == BudgetPolicy.PARTIAL else ["a", "b", "c", "d"]
+    assert list(scenarios.columns) == expected_columns
+    assert scenarios.shape == (10, len(expected_columns))
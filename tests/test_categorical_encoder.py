@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from copula_scengen import ScenarioGenerator
+from copula_scengen.modules.preprocessing import CategoricalEncoder
+
+
+def _reference_encode(data: pd.DataFrame) -> tuple[pd.DataFrame, dict[str, np.ndarray]]:
+    """Original encoder: sort the unique values and search every row in them."""
+    encoded = data.copy()
+    mapping = {}
+    for column in data.columns:
+        if isinstance(data[column].dtype, pd.CategoricalDtype) or data[column].dtype == object:
+            categories = np.sort(data[column].unique())
+            encoded[column] = np.searchsorted(categories, data[column].to_numpy())
+            mapping[column] = categories
+    return encoded, mapping
+
+
+def _mixed_frame(seed: int = 0, n: int = 60) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "a": rng.normal(size=n),
+            # unordered categories, one of them never observed
+            "c": pd.Categorical(rng.choice(["z", "x", "y"], size=n), categories=["y", "q", "z", "x"]),
+            "o": pd.Series(rng.choice(["b", "a", "c"], size=n), dtype=object),
+            "i": pd.Categorical(rng.choice([3, 1, 2], size=n)),
+            "n": rng.integers(0, 3, size=n),
+        },
+    )
+
+
+def test_encode_matches_reference() -> None:
+    data = _mixed_frame()
+
+    encoded, mapping = CategoricalEncoder().encode(data)
+    expected, expected_mapping = _reference_encode(data)
+
+    pd.testing.assert_frame_equal(encoded, expected)
+    assert list(mapping) == list(expected_mapping)
+    for column, categories in expected_mapping.items():
+        np.testing.assert_array_equal(mapping[column], categories)
+        assert mapping[column].dtype == categories.dtype
+
+
+def test_encode_leaves_input_untouched_and_decode_round_trips() -> None:
+    data = _mixed_frame()
+    original = data.copy()
+    encoder = CategoricalEncoder()
+
+    encoded, mapping = encoder.encode(data)
+    decoded = encoder.decode(encoded.astype(float), mapping)
+
+    pd.testing.assert_frame_equal(data, original)
+    for column in ["c", "o", "i"]:
+        np.testing.assert_array_equal(decoded[column].to_numpy(), np.asarray(data[column]))
+
+
+def test_string_dtype_columns_are_encoded() -> None:
+    data = pd.DataFrame({"s": pd.Series(["b", "a", "b", "c"], dtype="string"), "x": [0.5, 0.1, 0.2, 0.3]})
+
+    encoded, mapping = CategoricalEncoder().encode(data)
+
+    np.testing.assert_array_equal(encoded["s"], [1, 0, 1, 2])
+    np.testing.assert_array_equal(mapping["s"], ["a", "b", "c"])
+    scenarios = ScenarioGenerator().generate(data=data, n_scenarios=3)
+    assert set(scenarios["s"]) <= {"a", "b", "c"}
+
+
+@pytest.mark.parametrize(
+    ("column", "message"),
+    [
+        (pd.Categorical(["x", None, "y"]), "missing"),
+        (pd.Series(["x", None, "y"], dtype=object), "missing"),
+        ([1.0, np.inf, 2.0], "infinite"),
+    ],
+)
+def test_validation_is_column_wise(column: object, message: str) -> None:
+    data = pd.DataFrame({"a": [0.1, 0.2, 0.3], "b": column})
+
+    with pytest.raises(ValueError, match=message):
+        CategoricalEncoder().encode(data)
+
+
+def test_missing_values_take_precedence_over_infinite_ones() -> None:
+    data = pd.DataFrame({"a": [0.1, np.inf, 0.3], "b": [1.0, np.nan, 2.0]})
+
+    with pytest.raises(ValueError, match="missing"):
+        CategoricalEncoder().encode(data)
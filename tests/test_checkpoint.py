@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from copula_scengen.modules.copula import HistogramCopulaProvider, PairwiseHistogramAccumulator
+from copula_scengen.modules.copula_sample_generators import CancellationToken, CopulaSampleGenerator
+from copula_scengen.modules.copula_sample_generators.checkpoint import Checkpoint
+from copula_scengen.modules.margin_profiles import MarginProfiles
+from copula_scengen.modules.observers import GenerationObserver
+
+
+class CancelAfterMargin(GenerationObserver):
+    def __init__(self, token: CancellationToken, margin: int) -> None:
+        self._token = token
+        self._margin = margin
+        self.assigned_margins: list[int] = []
+
+    def on_stage_start(self, stage: str, margin: int | None = None) -> None:
+        if stage == "margin_assignment":
+            self.assigned_margins.append(margin)
+
+    def on_stage_end(self, stage: str, seconds: float, margin: int | None = None) -> None:
+        if (stage, margin) == ("checkpoint", self._margin):
+            self._token.cancel()
+
+
+def _data(seed: int = 5) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "a": rng.normal(size=40),
+            "k": rng.integers(0, 3, size=40).astype(float),
+            "b": rng.normal(size=40),
+            "c": rng.gamma(2.0, size=40),
+        },
+    )
+
+
+def test_checkpointed_run_matches_plain_run(tmp_path: Path) -> None:
+    expected = CopulaSampleGenerator().create(data=_data(), n_scenarios=10).ranks
+
+    ranks = CopulaSampleGenerator(checkpoint_dir=tmp_path).create(data=_data(), n_scenarios=10).ranks
+
+    np.testing.assert_array_equal(ranks, expected)
+    with np.load(tmp_path / "copula_sample.npz") as archive:
+        assert archive["ranks"].dtype == np.uint8
+        np.testing.assert_array_equal(archive["ranks"], expected)
+
+
+def test_resume_skips_completed_margins(tmp_path: Path) -> None:
+    expected = CopulaSampleGenerator().create(data=_data(), n_scenarios=10).ranks
+
+    token = CancellationToken()
+    interrupted = CopulaSampleGenerator(
+        observer=CancelAfterMargin(token, margin=2), cancellation_token=token, checkpoint_dir=tmp_path
+    )
+    assert interrupted.create(data=_data(), n_scenarios=10).ranks.shape == (10, 3)
+
+    observer = CancelAfterMargin(CancellationToken(), margin=-1)
+    resumed = CopulaSampleGenerator(observer=observer, checkpoint_dir=tmp_path)
+    ranks = resumed.create(data=_data(), n_scenarios=10).ranks
+
+    assert observer.assigned_margins == [3]
+    np.testing.assert_array_equal(ranks, expected)
+
+
+def test_checkpoint_of_other_run_is_ignored(tmp_path: Path) -> None:
+    CopulaSampleGenerator(checkpoint_dir=tmp_path).create(data=_data(seed=1), n_scenarios=10)
+
+    ranks = CopulaSampleGenerator(checkpoint_dir=tmp_path).create(data=_data(), n_scenarios=10).ranks
+
+    np.testing.assert_array_equal(ranks, CopulaSampleGenerator().create(data=_data(), n_scenarios=10).ranks)
+    assert Checkpoint(tmp_path, fingerprint="other").load() is None
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_checkpoint_of_changed_provider_state_is_ignored(tmp_path: Path) -> None:
+    accumulator = PairwiseHistogramAccumulator(n_bins=8)
+    accumulator.update(_data(seed=1))
+    names = pd.DataFrame(columns=accumulator.columns)
+    stale = (
+        CopulaSampleGenerator(copula_provider=HistogramCopulaProvider(accumulator), checkpoint_dir=tmp_path)
+        .create(data=names, n_scenarios=10)
+        .ranks
+    )
+
+    accumulator.update(_data(seed=2))
+    resumed = CopulaSampleGenerator(copula_provider=HistogramCopulaProvider(accumulator), checkpoint_dir=tmp_path)
+    ranks = resumed.create(data=names, n_scenarios=10).ranks
+
+    expected = CopulaSampleGenerator(copula_provider=HistogramCopulaProvider(accumulator)).create(names, 10).ranks
+    np.testing.assert_array_equal(ranks, expected)
+    assert not np.array_equal(expected, stale)
+
+
+def test_checkpoint_of_other_margin_types_is_ignored(tmp_path: Path) -> None:
+    generator = CopulaSampleGenerator(checkpoint_dir=tmp_path)
+    stale = generator.create_from_profiles(MarginProfiles(_data()), n_scenarios=10).ranks
+    declared = MarginProfiles(_data(), margin_types=[None, "continuous", None, None])
+
+    ranks = generator.create_from_profiles(declared, n_scenarios=10).ranks
+
+    expected = CopulaSampleGenerator().create_from_profiles(declared, n_scenarios=10).ranks
+    np.testing.assert_array_equal(ranks, expected)
+    assert not np.array_equal(expected, stale)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from copula_scengen.modules.copula.copula_sample2d import CopulaSample2D, running_fractions
+
+
+class _DenseCopulaSample2D:
+    """Frozen copy of the original dense float implementation."""
+
+    def __init__(self, max_rank: int) -> None:
+        self.max_rank = max_rank
+        self._cache = np.zeros(max_rank)
+
+    def __call__(self, arg: np.ndarray) -> float | np.ndarray:
+        arr = np.asarray(arg) - 1
+        return self._cache[arr]
+
+    def assign(self, rank: int) -> None:
+        self._cache[rank - 1 :] += 1.0 / self.max_rank
+
+
+@pytest.mark.parametrize("max_rank", [1, 2, 7, 16, 33, 100])
+def test_matches_original_dense_floats(max_rank: int) -> None:
+    rng = np.random.default_rng(max_rank)
+    sample = CopulaSample2D.initialize(max_rank)
+    dense = _DenseCopulaSample2D(max_rank)
+    lattice = np.arange(max_rank + 1)
+
+    np.testing.assert_array_equal(sample(lattice), dense(lattice))
+    for rank in rng.permutation(max_rank) + 1:
+        sample.assign(rank=rank)
+        dense.assign(rank=rank)
+        np.testing.assert_array_equal(sample(lattice), dense(lattice))
+        np.testing.assert_array_equal(sample.counts(lattice), np.rint(dense(lattice) * max_rank))
+
+
+def test_scalar_argument() -> None:
+    sample = CopulaSample2D.initialize(4)
+    sample.assign(rank=3)
+    sample.assign(rank=1)
+
+    assert sample(1) == 0.25
+    assert sample(2) == 0.25
+    assert sample(3) == 0.5
+    assert sample(0) == sample(4) == 0.5
+
+
+@pytest.mark.parametrize("max_rank", [3, 10, 49, 150])
+def test_running_fractions_match_repeated_addition(max_rank: int) -> None:
+    expected = [0.0]
+    for _ in range(max_rank):
+        expected.append(expected[-1] + 1.0 / max_rank)
+
+    np.testing.assert_array_equal(running_fractions(max_rank), expected)
@@ -11,28 +11,51 @@ evaluation and assert that the refactored code produces bit-identical results.
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
 import pytest
 
-from copula_scengen.modules.copula.copula_sample import CopulaSample
+from copula_scengen.modules.copula.copula_grid import DenseCopulaGrid
+from copula_scengen.modules.copula.copula_sample import CopulaSample, rank_dtype
 from copula_scengen.modules.copula.copula_sample2d import CopulaSample2D
 from copula_scengen.modules.copula.empirical_copula_provider import EmpiricalCopulaProvider
 from copula_scengen.modules.copula.extended_empirical_copula_provider import ExtendedEmpiricalCopulaProvider
+from copula_scengen.modules.copula_sample_generators import deviation_cache as deviation_cache_module
+from copula_scengen.modules.copula_sample_generators.batched_deviation_cache import BatchedDeviationCache
 from copula_scengen.modules.copula_sample_generators.copula_sample_generator import CopulaSampleGenerator
 from copula_scengen.modules.copula_sample_generators.deviation_cache import DeviationCache
+from copula_scengen.modules.copula_sample_generators.incremental_deviation_cache import IncrementalDeviationCache
+from copula_scengen.modules.margin_profiles import MarginProfiles
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
     from copula_scengen.modules.copula.base import Copula, CopulaProvider
 
 
 # --------------------------------------------------------------------------- #
 # Reference (pre-optimization) implementation
 # --------------------------------------------------------------------------- #
+class _BaselineCopulaSample2D:
+    """Frozen copy of the original dense sample, a running float sum of ``1 / max_rank`` per suffix entry."""
+
+    def __init__(self, max_rank: int) -> None:
+        self.max_rank = max_rank
+        self._cache = np.zeros(max_rank)
+
+    def __call__(self, arg: np.ndarray) -> float | np.ndarray:
+        arr = np.asarray(arg) - 1
+        return self._cache[arr]
+
+    def assign(self, rank: int) -> None:
+        self._cache[rank - 1 :] += 1.0 / self.max_rank
+
+
 def _reference_compute_cache(
-    copula_samples: list[CopulaSample2D],
+    copula_samples: list[CopulaSample2D] | list[_BaselineCopulaSample2D],
     target_copulas: list[Copula],
     rank: int,
 ) -> np.ndarray:
@@ -63,7 +86,7 @@ def _reference_create(provider: CopulaProvider, data: pd.DataFrame, n_scenarios:
     copula_sample = CopulaSample.initialize(max_rank=n_scenarios, n_margins=data.shape[1])
     for margin in range(1, data.shape[1]):
         available = np.ones(n_scenarios, dtype=bool)
-        copula_samples_2d = [CopulaSample2D.initialize(n_scenarios) for _ in range(margin)]
+        copula_samples_2d = [_BaselineCopulaSample2D(n_scenarios) for _ in range(margin)]
         target_copulas = [provider.get(data=data, margins=[prior, margin]) for prior in range(margin)]
         new_ranks = np.zeros(n_scenarios, dtype=int)
         all_scenarios = copula_sample.retrieve_scenarios(scenario_idxs=np.arange(n_scenarios))
@@ -130,6 +153,20 @@ def test_precompute_target_grid_matches_direct_call(
     np.testing.assert_array_equal(grid, expected)
 
 
+@pytest.mark.parametrize(("_provider_name", "provider"), _PROVIDERS)
+@pytest.mark.parametrize(("_tag", "data", "n_scenarios"), _datasets())
+def test_streamed_target_grid_matches_precomputed(
+    _provider_name: str, provider: CopulaProvider, _tag: str, data: pd.DataFrame, n_scenarios: int
+) -> None:
+    for margins in ([0, 1], [1, 0], [0, data.shape[1] - 1]):
+        copula = provider.get(data=data, margins=margins)
+        dense = DeviationCache.precompute_target_grid(target_copula=copula, max_rank=n_scenarios)
+        streamed = DeviationCache.target_grid(target_copula=copula, max_rank=n_scenarios)
+
+        for rank in [*range(n_scenarios + 1), 0, n_scenarios // 2, n_scenarios // 2]:
+            np.testing.assert_array_equal(streamed.column(rank), dense[:, rank])
+
+
 @pytest.mark.parametrize(("_provider_name", "provider"), _PROVIDERS)
 @pytest.mark.parametrize(("_tag", "data", "n_scenarios"), _datasets())
 def test_compute_cache_matches_reference(
@@ -144,11 +181,38 @@ def test_compute_cache_matches_reference(
     for rank in range(1, n_scenarios + 1):
         new = DeviationCache.compute_cache(copula_samples=copula_samples, target_grids=target_grids, rank=rank)
         ref = _reference_compute_cache(copula_samples, target_copulas, rank)
-        np.testing.assert_allclose(new._cache_matrix, ref)  # noqa: SLF001
+        np.testing.assert_array_equal(new._cache_matrix, ref)  # noqa: SLF001
         for cs2d in copula_samples:
             cs2d.assign(rank=rank)
 
 
+@pytest.mark.parametrize(("_provider_name", "provider"), _PROVIDERS)
+@pytest.mark.parametrize(("_tag", "data", "n_scenarios"), _datasets())
+def test_incremental_cache_matches_full_recomputation(
+    _provider_name: str, provider: CopulaProvider, _tag: str, data: pd.DataFrame, n_scenarios: int
+) -> None:
+    margin = data.shape[1] - 1
+    target_grids = [
+        DeviationCache.precompute_target_grid(provider.get(data=data, margins=[prior, margin]), n_scenarios)
+        for prior in range(margin)
+    ]
+    reference_samples = [CopulaSample2D.initialize(n_scenarios) for _ in range(margin)]
+    incremental = IncrementalDeviationCache(
+        target_grids=[DenseCopulaGrid(grid) for grid in target_grids], max_rank=n_scenarios
+    )
+
+    rng = np.random.default_rng(7)
+    prior_ranks = np.column_stack([rng.permutation(n_scenarios) + 1 for _ in range(margin)])
+    for rank in range(1, n_scenarios + 1):
+        new = incremental.at_rank(rank)
+        ref = DeviationCache.compute_cache(copula_samples=reference_samples, target_grids=target_grids, rank=rank)
+        np.testing.assert_array_equal(new._cache_matrix, ref._cache_matrix)  # noqa: SLF001
+
+        incremental.assign(ranks=prior_ranks[rank - 1])
+        for cs2d, prior_rank in zip(reference_samples, prior_ranks[rank - 1], strict=True):
+            cs2d.assign(rank=prior_rank)
+
+
 @pytest.mark.parametrize(("_provider_name", "provider"), _PROVIDERS)
 @pytest.mark.parametrize(("_tag", "data", "n_scenarios"), _datasets())
 def test_generator_matches_reference(
@@ -157,3 +221,203 @@ def test_generator_matches_reference(
     optimized = CopulaSampleGenerator(copula_provider=provider).create(data=data, n_scenarios=n_scenarios).ranks
     reference = _reference_create(provider=provider, data=data, n_scenarios=n_scenarios)
     np.testing.assert_array_equal(optimized, reference)
+
+
+@pytest.mark.parametrize(("_provider_name", "provider"), _PROVIDERS)
+def test_generator_matches_reference_on_tied_deviations(_provider_name: str, provider: CopulaProvider) -> None:
+    # many scenarios tie up to the last ulp here, so any drift in the sample values flips the argmin
+    rng = np.random.default_rng(0)
+    latent = rng.normal(size=200)
+    data = pd.DataFrame(
+        {
+            "a": latent + rng.normal(size=200),
+            "k": np.clip(np.round(latent + 1), 0, 4),
+            "b": rng.gamma(2.0, size=200),
+            "m": rng.poisson(2, 200).astype(float),
+            "c": latent * 2 + rng.normal(size=200),
+        },
+    )
+
+    optimized = CopulaSampleGenerator(copula_provider=provider).create(data=data, n_scenarios=50).ranks
+    np.testing.assert_array_equal(optimized, _reference_create(provider=provider, data=data, n_scenarios=50))
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_generator_with_executor_matches_serial(executor_class: type[Executor]) -> None:
+    _, data, n_scenarios = _datasets()[2]
+    serial = CopulaSampleGenerator().create(data=data, n_scenarios=n_scenarios).ranks
+
+    with executor_class(max_workers=2) as executor:
+        parallel = CopulaSampleGenerator(executor=executor).create(data=data, n_scenarios=n_scenarios).ranks
+
+    np.testing.assert_array_equal(parallel, serial)
+
+
+@pytest.mark.parametrize(("_tag", "data", "n_scenarios"), _datasets())
+def test_generator_with_threads_matches_serial(
+    monkeypatch: pytest.MonkeyPatch, _tag: str, data: pd.DataFrame, n_scenarios: int
+) -> None:
+    # force sharding even for the tiny test problems
+    monkeypatch.setattr(deviation_cache_module, "_MIN_SHARD_SIZE", 1)
+    serial = CopulaSampleGenerator().create(data=data, n_scenarios=n_scenarios).ranks
+    threaded = CopulaSampleGenerator(n_threads=3).create(data=data, n_scenarios=n_scenarios).ranks
+
+    np.testing.assert_array_equal(threaded, serial)
+
+
+def test_generator_with_all_prior_margins_matches_serial() -> None:
+    _, data, n_scenarios = _datasets()[0]
+    serial = CopulaSampleGenerator().create(data=data, n_scenarios=n_scenarios).ranks
+    sparse = CopulaSampleGenerator(max_prior_margins=2).create(data=data, n_scenarios=n_scenarios).ranks
+
+    np.testing.assert_array_equal(sparse, serial)
+
+
+def test_sparse_generator_keeps_dependence_on_selected_margin() -> None:
+    rng = np.random.default_rng(99)
+    a = rng.normal(size=80)
+    data = pd.DataFrame({"a": a, "b": rng.normal(size=80), "c": a + 0.1 * rng.normal(size=80)})
+
+    ranks = CopulaSampleGenerator(max_prior_margins=1).create(data=data, n_scenarios=20).ranks
+
+    assert np.corrcoef(ranks[:, 0], ranks[:, 2])[0, 1] > 0.8
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_rank_correlations_match_covariance_matrix(*, weighted: bool) -> None:
+    rng = np.random.default_rng(5)
+    a = rng.normal(size=60)
+    values = np.column_stack([a, np.round(a + rng.normal(size=60)), np.ones(60), -a, rng.normal(size=60)])
+    weights = rng.integers(1, 4, size=60).astype(float) if weighted else None
+    margin_profiles = MarginProfiles.from_array(values, weights=weights)
+    ranks = np.vstack([margin_profiles[margin].average_ranks for margin in range(values.shape[1])])
+
+    for margin in range(1, values.shape[1]):
+        # reference: the full covariance matrix of the margin and all its priors; the constant margin gives 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = np.cov(ranks[: margin + 1], aweights=weights)
+            expected = covariance[-1, :-1] / np.sqrt(covariance[-1, -1] * np.diag(covariance)[:-1])
+        np.testing.assert_allclose(
+            CopulaSampleGenerator._rank_correlations(margin_profiles, margin),  # noqa: SLF001
+            np.nan_to_num(expected, nan=0.0),
+            atol=1e-12,
+        )
+
+
+@pytest.mark.parametrize(("_tag", "data", "n_scenarios"), _datasets())
+def test_extend_matches_full_generation(_tag: str, data: pd.DataFrame, n_scenarios: int) -> None:
+    generator = CopulaSampleGenerator()
+    full = generator.create(data=data, n_scenarios=n_scenarios).ranks
+
+    copula_sample = generator.create(data=data.iloc[:, :1], n_scenarios=n_scenarios)
+    for n_columns in range(2, data.shape[1] + 1):
+        copula_sample = generator.extend(
+            copula_sample=copula_sample, data=data.iloc[:, :n_columns], new_columns=[data.columns[n_columns - 1]]
+        )
+    np.testing.assert_array_equal(copula_sample.ranks, full)
+
+    # several margins at once, given in a different column order than in ``data``
+    copula_sample = generator.create(data=data.iloc[:, :1], n_scenarios=n_scenarios)
+    extended = generator.extend(
+        copula_sample=copula_sample, data=data.iloc[:, ::-1], new_columns=list(data.columns[1:])
+    )
+    np.testing.assert_array_equal(extended.ranks, full)
+
+
+def test_extend_validates_columns() -> None:
+    _, data, n_scenarios = _datasets()[0]
+    copula_sample = CopulaSampleGenerator().create(data=data.iloc[:, :2], n_scenarios=n_scenarios)
+
+    with pytest.raises(ValueError, match="not found"):
+        CopulaSampleGenerator().extend(copula_sample=copula_sample, data=data, new_columns=["z"])
+    with pytest.raises(ValueError, match="margins"):
+        CopulaSampleGenerator().extend(copula_sample=copula_sample, data=data, new_columns=[])
+
+
+@pytest.mark.parametrize(("_provider_name", "provider"), _PROVIDERS)
+@pytest.mark.parametrize(("_tag", "data", "n_scenarios"), _datasets())
+def test_compact_generator_matches_default(
+    _provider_name: str, provider: CopulaProvider, _tag: str, data: pd.DataFrame, n_scenarios: int
+) -> None:
+    default = CopulaSampleGenerator(copula_provider=provider).create(data=data, n_scenarios=n_scenarios).ranks
+    compact = CopulaSampleGenerator(copula_provider=provider, compact=True).create(data=data, n_scenarios=n_scenarios)
+
+    assert compact.ranks.dtype == rank_dtype(n_scenarios)
+    np.testing.assert_array_equal(compact.ranks, default)
+
+
+@pytest.mark.parametrize(("max_rank", "expected"), [(255, np.uint8), (256, np.uint16), (70_000, np.uint32)])
+def test_rank_dtype_is_smallest_holding_max_rank(max_rank: int, expected: type) -> None:
+    assert rank_dtype(max_rank) == expected
+
+
+def test_compact_extend_keeps_dtype() -> None:
+    _, data, n_scenarios = _datasets()[0]
+    generator = CopulaSampleGenerator(compact=True)
+    copula_sample = generator.create(data=data.iloc[:, :1], n_scenarios=n_scenarios)
+
+    extended = generator.extend(copula_sample=copula_sample, data=data, new_columns=list(data.columns[1:]))
+
+    assert extended.ranks.dtype == rank_dtype(n_scenarios)
+    np.testing.assert_array_equal(
+        extended.ranks, CopulaSampleGenerator().create(data=data, n_scenarios=n_scenarios).ranks
+    )
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize(("_provider_name", "provider"), _PROVIDERS)
+@pytest.mark.parametrize(("_tag", "data", "n_scenarios"), _datasets())
+def test_batched_generator_matches_per_dataset_runs(
+    _provider_name: str, provider: CopulaProvider, _tag: str, data: pd.DataFrame, n_scenarios: int, *, compact: bool
+) -> None:
+    rng = np.random.default_rng(5)
+    # bootstrap resamples: same columns, different target copulas per job
+    datasets = [data, *(data.iloc[rng.integers(0, data.shape[0], size=data.shape[0])] for _ in range(4))]
+    generator = CopulaSampleGenerator(copula_provider=provider, compact=compact)
+
+    batch = generator.create_batch([MarginProfiles(dataset) for dataset in datasets], n_scenarios=n_scenarios)
+
+    for dataset, copula_sample in zip(datasets, batch, strict=True):
+        expected = CopulaSampleGenerator(copula_provider=provider, compact=compact).create(dataset, n_scenarios)
+        assert copula_sample.ranks.dtype == expected.ranks.dtype
+        np.testing.assert_array_equal(copula_sample.ranks, expected.ranks)
+
+
+def test_batched_generator_with_selected_prior_margins_matches_per_dataset_runs() -> None:
+    rng = np.random.default_rng(6)
+    datasets = [
+        pd.DataFrame(rng.normal(size=(30, 5)) @ rng.normal(size=(5, 5)), columns=list("abcde")) for _ in range(3)
+    ]
+    generator = CopulaSampleGenerator(max_prior_margins=2)
+
+    batch = generator.create_batch([MarginProfiles(dataset) for dataset in datasets], n_scenarios=9)
+
+    for dataset, copula_sample in zip(datasets, batch, strict=True):
+        expected = CopulaSampleGenerator(max_prior_margins=2).create(dataset, n_scenarios=9)
+        np.testing.assert_array_equal(copula_sample.ranks, expected.ranks)
+
+
+def test_batched_generator_rejects_different_margin_counts() -> None:
+    (_, first, _), (_, second, _), _ = _datasets()
+
+    with pytest.raises(ValueError, match="same number of margins"):
+        CopulaSampleGenerator().create_batch([MarginProfiles(first), MarginProfiles(second)], n_scenarios=5)
+
+
+def test_batched_cache_streams_target_columns() -> None:
+    rng = np.random.default_rng(8)
+    n_scenarios, n_jobs, n_priors = 200, 3, 2
+    datasets = [pd.DataFrame(rng.normal(size=(50, n_priors + 1))) for _ in range(n_jobs)]
+    provider = ExtendedEmpiricalCopulaProvider()
+    target_grids = [
+        [DeviationCache.target_grid(provider.get(data, [prior, n_priors]), n_scenarios) for prior in range(n_priors)]
+        for data in datasets
+    ]
+
+    cache = BatchedDeviationCache(target_grids=target_grids, max_rank=n_scenarios)
+
+    # far below the ``B * P * (n_scenarios + 1) ** 2`` floats of dense grids
+    assert cache.nbytes < n_jobs * n_priors * (n_scenarios + 1) ** 2
+    for job, grids in enumerate(target_grids):
+        reference = IncrementalDeviationCache(target_grids=grids, max_rank=n_scenarios)
+        np.testing.assert_array_equal(cache.at_rank(7)[job], reference.at_rank(7)._cache_matrix)  # noqa: SLF001
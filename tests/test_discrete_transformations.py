@@ -0,0 +1,95 @@
+"""
+Parity tests for the interval-based discrete transformations.
+
+The transformers used to score every candidate value for every rank in dense
+``(n_scenarios, n_values)`` matrices before an ``argmax``. The references below keep that
+formulation and the optimized transformers must pick exactly the same values.
+"""
+
+import numpy as np
+import pytest
+
+from copula_scengen.modules.copula_sample_transformers import (
+    CopulaSampleTransformer,
+    ExtendedCopulaSampleTransformer,
+    _shared,
+)
+from copula_scengen.modules.functions.range_argmax import range_argmax
+from copula_scengen.modules.margin_profiles import MarginProfile
+
+
+def _reference_discrete(profile: MarginProfile, n_scenarios: int) -> np.ndarray:
+    value_counts, cumulative = profile.value_counts, profile.cumulative
+    lower_bounds, upper_bounds = _shared.discrete_bounds(cumulative, n_scenarios)
+
+    candidate_values = np.arange(len(value_counts))
+    valid = (candidate_values >= lower_bounds[:, None]) & (candidate_values <= upper_bounds[:, None])
+    counts = np.where(valid, value_counts[None, :], -1)
+    return counts.argmax(axis=1)
+
+
+def _reference_extended_discrete(profile: MarginProfile, n_scenarios: int) -> np.ndarray:
+    transformer = ExtendedCopulaSampleTransformer()
+    value_counts, cumulative = profile.value_counts, profile.cumulative
+    lower_bounds, upper_bounds = _shared.discrete_bounds(cumulative, n_scenarios)
+
+    ranks = np.arange(1, n_scenarios + 1)
+    with np.errstate(invalid="ignore"):
+        lower_extended = transformer._extended_inverse_ecdf(cumulative, (ranks - 1) / n_scenarios)  # noqa: SLF001
+    upper_extended = transformer._extended_inverse_ecdf(cumulative, ranks / n_scenarios)  # noqa: SLF001
+
+    candidate_values = np.arange(len(value_counts))
+    lower_uniform = 1 - candidate_values[None, :] + lower_extended[:, None]
+    upper_uniform = 1 - candidate_values[None, :] + upper_extended[:, None]
+    overlaps = np.maximum(0.0, np.minimum(1.0, upper_uniform) - np.maximum(0.0, lower_uniform))
+
+    valid = (candidate_values >= lower_bounds[:, None]) & (candidate_values <= upper_bounds[:, None])
+    scores = np.where(valid, overlaps * value_counts[None, :], -1.0)
+    return scores.argmax(axis=1)
+
+
+def _profiles() -> list[MarginProfile]:
+    rng = np.random.default_rng(5)
+    return [
+        MarginProfile(values=rng.integers(0, 6, size=40).astype(float)),
+        # unobserved values, including 0, and a dominant one
+        MarginProfile(values=rng.choice([1.0, 2.0, 5.0, 9.0], size=70, p=[0.1, 0.6, 0.2, 0.1])),
+        MarginProfile(values=rng.poisson(30.0, size=300).astype(float)),
+        MarginProfile(values=rng.integers(0, 25, size=90).astype(float), weights=rng.uniform(0.2, 3.0, size=90)),
+        MarginProfile(values=np.full(10, 3.0)),
+    ]
+
+
+@pytest.mark.parametrize("profile", _profiles())
+@pytest.mark.parametrize("n_scenarios", [1, 2, 7, 40, 150])
+def test_discrete_transformations_match_dense_reference(profile: MarginProfile, n_scenarios: int) -> None:
+    np.testing.assert_array_equal(
+        CopulaSampleTransformer()._discrete_transformations(profile, n_scenarios),  # noqa: SLF001
+        _reference_discrete(profile, n_scenarios),
+    )
+    with np.errstate(invalid="ignore"):
+        result = ExtendedCopulaSampleTransformer()._discrete_transformations(profile, n_scenarios)  # noqa: SLF001
+    np.testing.assert_array_equal(result, _reference_extended_discrete(profile, n_scenarios))
+
+
+def test_range_argmax_matches_dense_argmax() -> None:
+    rng = np.random.default_rng(8)
+    values = rng.integers(0, 5, size=37)
+    lower, upper = rng.integers(0, 37, size=500), rng.integers(0, 37, size=500)
+
+    candidates = np.arange(values.size)
+    valid = (candidates >= lower[:, None]) & (candidates <= upper[:, None])
+    expected = np.where(valid, values[None, :], -1).argmax(axis=1)
+    np.testing.assert_array_equal(range_argmax(values, lower, upper), expected)
+
+
+@pytest.mark.parametrize("size", [1, 2, 8, 9, 64, 1000])
+def test_range_argmax_matches_dense_argmax_across_block_sizes(size: int) -> None:
+    rng = np.random.default_rng(size)
+    values = rng.integers(0, 3, size=size).astype(float)
+    lower, upper = rng.integers(0, size, size=2000), rng.integers(0, size, size=2000)
+
+    candidates = np.arange(values.size)
+    valid = (candidates >= lower[:, None]) & (candidates <= upper[:, None])
+    expected = np.where(valid, values[None, :], -1).argmax(axis=1)
+    np.testing.assert_array_equal(range_argmax(values, lower, upper), expected)
@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 
+from copula_scengen.modules.copula.dominance_counter import DominanceCounter
 from copula_scengen.modules.copula.empirical_copula import EmpiricalCopula
 
 
@@ -58,3 +59,35 @@ def test_call_empirical_copula(
     out = ec(queries)
     assert out.shape == expected.shape
     assert np.allclose(out, expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("n_margins", [2, 3])
+def test_memory_bounded_evaluation_matches_broadcast(n_margins: int) -> None:
+    rng = np.random.default_rng(17)
+    n = 37
+    data = np.column_stack([rng.normal(size=n), rng.integers(0, 4, size=n), rng.normal(size=n)])[:, :n_margins]
+    # exact pseudo-observation values, points between them and outside [0, 1]
+    queries = np.vstack(
+        [
+            rng.integers(0, n + 1, size=(200, n_margins)) / n,
+            rng.uniform(-0.1, 1.1, size=(200, n_margins)),
+            np.full((1, n_margins), np.nan),
+        ]
+    )
+
+    unbounded = EmpiricalCopula(data=data, memory_budget=1 << 40)(queries)
+    bounded = EmpiricalCopula(data=data, memory_budget=n * (n_margins + 1) * 8)(queries)
+
+    np.testing.assert_array_equal(bounded, unbounded)
+
+
+def test_dominance_counter_matches_brute_force() -> None:
+    rng = np.random.default_rng(4)
+    for n in (1, 2, 5, 16, 33):
+        first = rng.permutation(n)
+        second = rng.integers(0, n, size=n)
+        t0 = rng.integers(0, n + 1, size=50)
+        t1 = rng.integers(0, n + 1, size=50)
+
+        expected = ((first[None, :] < t0[:, None]) & (second[None, :] < t1[:, None])).sum(axis=1)
+        np.testing.assert_array_equal(DominanceCounter(first=first, second=second).count(t0, t1), expected)
@@ -61,3 +61,45 @@ def test_call_single_point_1d_broadcast(eec: ExtendedEmpiricalCopula) -> None:
     out = eec(np.array([1.0, 1.0]))
     assert out.shape == (1,)
     assert np.isclose(out[0], 1.0)
+
+
+def test_grid_columns_match_grid_with_two_discrete_margins() -> None:
+    rng = np.random.default_rng(3)
+    data = np.column_stack((rng.integers(0, 3, size=40), rng.integers(0, 5, size=40))).astype(float)
+    eec = ExtendedEmpiricalCopula(data=data)
+
+    grid = eec.grid(max_rank=9)
+    columns = eec.grid_columns(max_rank=9)
+    for rank in range(10):
+        np.testing.assert_array_equal(columns.column(rank), grid[:, rank])
+
+
+@pytest.mark.parametrize("columns", [(0, 1, 2), (1, 2, 3), (0, 3, 1, 2)])
+def test_lattice_matches_call_in_higher_dimensions(columns: tuple[int, ...]) -> None:
+    rng = np.random.default_rng(8)
+    data = np.column_stack(
+        (rng.normal(size=50), rng.integers(0, 3, size=50), rng.integers(0, 4, size=50), rng.normal(size=50))
+    )[:, columns].astype(float)
+    eec = ExtendedEmpiricalCopula(data=data)
+    # unsorted, repeated and exact jump-point coordinates, a different size per axis
+    coords = [
+        rng.choice(np.r_[np.linspace(0.0, 1.0, 7), rng.uniform(size=3)], size=4 + axis) for axis in range(len(columns))
+    ]
+
+    lattice = eec.lattice(coords)
+
+    points = np.stack(np.meshgrid(*coords, indexing="ij"), axis=-1).reshape(-1, len(columns))
+    np.testing.assert_allclose(lattice, eec(points).reshape(lattice.shape), rtol=0, atol=1e-12)
+
+
+def test_grid_in_three_dimensions_matches_call() -> None:
+    rng = np.random.default_rng(9)
+    data = np.column_stack((rng.normal(size=30), rng.integers(0, 3, size=30), rng.normal(size=30))).astype(float)
+    eec = ExtendedEmpiricalCopula(data=data)
+
+    grid = eec.grid(max_rank=5)
+
+    coords = np.arange(6) / 5
+    points = np.stack(np.meshgrid(coords, coords, coords, indexing="ij"), axis=-1).reshape(-1, 3)
+    assert grid.shape == (6, 6, 6)
+    np.testing.assert_allclose(grid, eec(points).reshape(6, 6, 6), rtol=0, atol=1e-12)
@@ -0,0 +1,154 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copula_scengen.modules.copula.extended_empirical_copula_provider import ExtendedEmpiricalCopulaProvider
+from copula_scengen.modules.functions.pseudoobservations import compute_pseudoobservations
+from copula_scengen.modules.margin_profiles import MarginProfile, MarginProfiles
+from copula_scengen.modules.margin_profiles import margin_profile as margin_profile_module
+from copula_scengen.modules.scenario_generators import FittedScenarioGenerator, ScenarioGenerator
+from copula_scengen.schemas.margin_type import MarginType, is_discrete
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.array([5.0, 2.0, 7.0, 3.0]),
+        np.array([1.0, 1.0, 2.0, 2.0]),
+        np.array([0.0, -1.0, -1.0, 10.0]),
+    ],
+)
+def test_ranks_match_pseudoobservations(values: np.ndarray) -> None:
+    profile = MarginProfile(values=values)
+
+    np.testing.assert_array_equal(profile.pseudo_observations, compute_pseudoobservations(values))
+    np.testing.assert_array_equal(profile.sorted_values, np.sort(values))
+
+
+def test_discrete_summaries() -> None:
+    profile = MarginProfile(values=np.array([2.0, 0.0, 2.0, 3.0]))
+
+    assert profile.is_discrete
+    np.testing.assert_array_equal(profile.value_counts, [1, 0, 2, 1])
+    np.testing.assert_allclose(profile.cumulative, [0.25, 0.25, 0.75, 1.0])
+    np.testing.assert_allclose(profile.jump_points, [0.0, 0.25, 0.25, 0.75, 1.0])
+
+
+def test_continuous_margin_is_not_discrete() -> None:
+    assert not MarginProfile(values=np.array([0.5, 1.0, 2.0])).is_discrete
+
+
+def test_profiles_are_built_once_and_shared_by_copulas() -> None:
+    data = pd.DataFrame({"x": [0.3, 0.1, 0.2], "k": [1.0, 0.0, 1.0], "y": [2.0, 3.0, 1.0]})
+    margin_profiles = MarginProfiles(data)
+    provider = ExtendedEmpiricalCopulaProvider()
+
+    first = provider.from_profiles(margin_profiles=margin_profiles, margins=[0, 1])
+    second = provider.from_profiles(margin_profiles=margin_profiles, margins=[1, 2])
+
+    assert margin_profiles[1] is margin_profiles[1]
+    assert first._inner_copula.margin_profiles[1] is second._inner_copula.margin_profiles[0]  # noqa: SLF001
+    np.testing.assert_array_equal(
+        first(np.array([[0.5, 0.5], [1.0, 1.0]])),
+        provider.get(data=data, margins=[0, 1])(np.array([[0.5, 0.5], [1.0, 1.0]])),
+    )
+
+
+def test_average_ranks_share_ties() -> None:
+    profile = MarginProfile(values=np.array([3.0, 1.0, 3.0, 2.0, 3.0]))
+
+    np.testing.assert_array_equal(profile.average_ranks, [3.0, 0.0, 3.0, 1.0, 3.0])
+
+
+def _count_inferences(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+
+    def counting_is_discrete(values: np.ndarray) -> bool:
+        calls.append(values.size)
+        return is_discrete(values)
+
+    monkeypatch.setattr(margin_profile_module, "is_discrete", counting_is_discrete)
+    return calls
+
+
+def _typed_data() -> pd.DataFrame:
+    rng = np.random.default_rng(9)
+    return pd.DataFrame(
+        {
+            "a": rng.normal(size=30),
+            "k": rng.integers(0, 4, size=30).astype(float),
+            "b": rng.gamma(2.0, size=30),
+            "c": pd.Categorical(rng.choice(["x", "y"], size=30)),
+        },
+    )
+
+
+def test_declared_margin_type_overrides_inference() -> None:
+    values = np.array([0.0, 1.0, 2.0, 2.0])
+
+    assert MarginProfile(values=values).is_discrete
+    assert not MarginProfile(values=values, margin_type=MarginType.CONTINUOUS).is_discrete
+
+
+def test_non_integer_values_cannot_be_declared_discrete() -> None:
+    with pytest.raises(ValueError, match="declared discrete must be integers"):
+        MarginProfile(values=np.array([0.5, 1.5]), margin_type="discrete")
+
+    data = pd.DataFrame({"a": [1.0, 2.0, 3.0], "x": [2.5, 7.5, 10.25]})
+    with pytest.raises(ValueError, match="Column 'x'"):
+        ScenarioGenerator(margin_types={"x": MarginType.DISCRETE}).fit(data)
+
+
+def test_margin_types_are_inferred_once_per_column(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _count_inferences(monkeypatch)
+
+    ScenarioGenerator().generate(data=_typed_data(), n_scenarios=6)
+
+    # the categorical column is discrete by construction, the other three are inferred once
+    assert len(calls) == 3
+
+
+def test_declared_margin_types_skip_inference(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calls = _count_inferences(monkeypatch)
+    margin_types = {"a": MarginType.CONTINUOUS, "k": MarginType.DISCRETE, "b": MarginType.CONTINUOUS}
+
+    fitted = ScenarioGenerator(margin_types=margin_types).fit(_typed_data())
+    fitted.generate(n_scenarios=6)
+    fitted.save(tmp_path)
+    loaded = FittedScenarioGenerator.load(tmp_path)
+    loaded.generate(n_scenarios=6)
+
+    assert calls == []
+    assert loaded.margin_types == [MarginType.CONTINUOUS, MarginType.DISCRETE, MarginType.CONTINUOUS, "discrete"]
+
+
+def test_declared_margin_type_changes_the_transformation() -> None:
+    data = _typed_data()[["a", "k"]]
+
+    scenarios = ScenarioGenerator(margin_types={"k": MarginType.CONTINUOUS}).generate(data=data, n_scenarios=7)
+
+    assert not np.allclose(scenarios["k"], np.round(scenarios["k"]))
+
+
+@pytest.mark.parametrize(
+    ("margin_types", "match"),
+    [({"missing": MarginType.DISCRETE}, "unknown columns"), ({"c": MarginType.CONTINUOUS}, "Categorical column")],
+)
+def test_invalid_margin_type_declarations_are_rejected(margin_types: dict[str, MarginType], match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        ScenarioGenerator(margin_types=margin_types).fit(_typed_data())
+
+
+def test_pickled_profile_ships_copula_summaries_only() -> None:
+    profile = MarginProfile(values=np.array([2.0, 0.0, 1.0, 2.0]), weights=np.array([1.0, 2.0, 1.0, 1.0]))
+    profile.compute_copula_summaries()
+
+    copy = pickle.loads(pickle.dumps(profile))  # noqa: S301
+
+    assert {"pseudo_observations", "jump_points"} <= copy.__dict__.keys()
+    assert not {"order", "ranks", "sorted_values"} & copy.__dict__.keys()
+    np.testing.assert_array_equal(copy.pseudo_observations, profile.pseudo_observations)
+    np.testing.assert_array_equal(copy.average_ranks, profile.average_ranks)
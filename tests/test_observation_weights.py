@@ -0,0 +1,175 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copula_scengen import ScenarioGenerator
+from copula_scengen.modules.copula.dominance_counter import DominanceCounter
+from copula_scengen.modules.copula.empirical_copula import EmpiricalCopula
+from copula_scengen.modules.copula.extended_empirical_copula import ExtendedEmpiricalCopula
+from copula_scengen.modules.copula_sample_generators import CopulaSampleGenerator
+from copula_scengen.modules.copula_sample_transformers import (
+    CopulaSampleTransformer,
+    EmpiricalCopulaSampleTransformer,
+    ExtendedCopulaSampleTransformer,
+)
+from copula_scengen.modules.functions.inverse_ecdf import inverse_ecdf, weighted_inverse_ecdf
+from copula_scengen.modules.margin_profiles import MarginProfile, MarginProfiles
+from copula_scengen.modules.scenario_generators import FittedScenarioGenerator
+
+
+def _mixed_data(seed: int = 2, n: int = 60) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=n)
+    return pd.DataFrame(
+        {
+            "a": latent + rng.normal(size=n),
+            "k": np.clip(np.round(latent + 1), 0, 3),
+            "b": rng.gamma(2.0, size=n),
+        },
+    )
+
+
+def _duplicated_data(seed: int = 4) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    distinct = pd.DataFrame({"x": rng.integers(0, 4, size=12), "y": rng.integers(0, 3, size=12)}).astype(float)
+    return distinct.iloc[rng.integers(0, 12, size=80)].reset_index(drop=True)
+
+
+def test_unit_weights_are_bit_identical_to_unweighted() -> None:
+    data = _mixed_data()
+    ones = np.ones(data.shape[0])
+    n_scenarios = 9
+
+    plain = CopulaSampleGenerator().create_from_profiles(MarginProfiles(data), n_scenarios=n_scenarios)
+    weighted = CopulaSampleGenerator().create_from_profiles(MarginProfiles(data, weights=ones), n_scenarios=n_scenarios)
+    np.testing.assert_array_equal(weighted.ranks, plain.ranks)
+
+    transformers = (CopulaSampleTransformer(), ExtendedCopulaSampleTransformer(), EmpiricalCopulaSampleTransformer())
+    for transformer in transformers:
+        expected = transformer.transform_from_profiles(MarginProfiles(data), plain)
+        result = transformer.transform_from_profiles(MarginProfiles(data, weights=ones), weighted)
+        pd.testing.assert_frame_equal(result, expected)
+
+
+def test_weighted_profile_matches_repeated_rows() -> None:
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 5, size=20).astype(float)
+    weights = rng.integers(1, 4, size=20)
+
+    weighted = MarginProfile(values=values, weights=weights.astype(float))
+    expanded = MarginProfile(values=np.repeat(values, weights))
+
+    np.testing.assert_allclose(weighted.value_counts, expanded.value_counts)
+    np.testing.assert_allclose(weighted.cumulative, expanded.cumulative)
+    np.testing.assert_allclose(weighted.jump_points, expanded.jump_points)
+    np.testing.assert_allclose(np.repeat(weighted.average_ranks, weights), expanded.average_ranks)
+    assert weighted.total_weight == expanded.size
+
+
+def test_weighted_inverse_ecdf_matches_repeated_rows() -> None:
+    rng = np.random.default_rng(1)
+    sorted_data = np.sort(rng.normal(size=15))
+    sorted_weights = rng.integers(1, 5, size=15)
+    args = np.linspace(0, 1, 101)
+
+    np.testing.assert_array_equal(
+        weighted_inverse_ecdf(sorted_data, sorted_weights.astype(float), args),
+        inverse_ecdf(np.repeat(sorted_data, sorted_weights), args),
+    )
+
+
+def test_weighted_dominance_counter_matches_brute_force() -> None:
+    rng = np.random.default_rng(3)
+    n = 37
+    first, second = rng.permutation(n), rng.integers(0, n, size=n)
+    weights = rng.uniform(0.5, 2.0, size=n)
+    t0, t1 = rng.integers(0, n + 1, size=200), rng.integers(0, n + 1, size=200)
+
+    expected = [weights[(first < a) & (second < b)].sum() for a, b in zip(t0, t1, strict=True)]
+    np.testing.assert_allclose(DominanceCounter(first, second, weights=weights).count(t0, t1), expected)
+
+
+def test_weighted_empirical_copula_paths_agree() -> None:
+    data = _mixed_data().to_numpy()[:, [0, 2]]
+    weights = np.random.default_rng(6).uniform(0.5, 3.0, size=data.shape[0])
+    coords = np.arange(11) / 10
+    queries = np.column_stack([np.repeat(coords, coords.size), np.tile(coords, coords.size)])
+
+    broadcast = EmpiricalCopula(data=data, weights=weights)(queries)
+    dominance = EmpiricalCopula(data=data, weights=weights, memory_budget=1)(queries)
+    lattice = EmpiricalCopula(data=data, weights=weights).grid(10).ravel()
+    columns = EmpiricalCopula(data=data, weights=weights).grid_columns(10)
+
+    pseudo = EmpiricalCopula(data=data, weights=weights).pseudo_observations
+    expected = [weights[(pseudo <= query).all(axis=1)].sum() / weights.sum() for query in queries]
+    np.testing.assert_allclose(broadcast, expected)
+    np.testing.assert_allclose(dominance, expected)
+    np.testing.assert_allclose(lattice, expected)
+    np.testing.assert_allclose(np.column_stack([columns.column(j) for j in range(11)]).ravel(), expected)
+
+
+def test_weighted_extended_copula_grid_matches_evaluation() -> None:
+    data = _mixed_data().to_numpy()[:, :2]
+    weights = np.random.default_rng(7).uniform(0.5, 3.0, size=data.shape[0])
+    copula = ExtendedEmpiricalCopula(data=data, weights=weights)
+    coords = np.arange(8) / 7
+    queries = np.column_stack([np.tile(coords, coords.size), np.repeat(coords, coords.size)])
+
+    np.testing.assert_allclose(copula.grid(7), copula(queries).reshape(coords.size, coords.size).T)
+
+
+@pytest.mark.parametrize("weights", [np.array([1.0, -1.0, 2.0]), np.array([1.0, 2.0]), np.array([1.0, np.nan, 1.0])])
+def test_invalid_weights_are_rejected(weights: np.ndarray) -> None:
+    with pytest.raises(ValueError, match="weights"):
+        MarginProfiles(pd.DataFrame({"a": [1.0, 2.0, 3.0]}), weights=weights)
+
+
+def test_deduplicate_collapses_identical_rows() -> None:
+    data = _duplicated_data()
+    profiles = MarginProfiles.deduplicate(data)
+
+    assert profiles.data.shape[0] == len(data.drop_duplicates())
+    assert profiles.weights.sum() == data.shape[0]
+    np.testing.assert_allclose(profiles[0].cumulative, MarginProfiles(data)[0].cumulative)
+
+
+def test_deduplicated_generation_keeps_margins() -> None:
+    data = _duplicated_data()
+
+    scenarios = ScenarioGenerator(deduplicate=True).generate(data=data, n_scenarios=8)
+
+    assert list(scenarios.columns) == ["x", "y"]
+    assert scenarios.shape == (8, 2)
+    for column in data.columns:
+        assert set(scenarios[column]) <= set(data[column])
+
+
+def test_weighted_fitted_model_roundtrip(tmp_path: Path) -> None:
+    data = _mixed_data()
+    weights = np.random.default_rng(8).integers(1, 4, size=data.shape[0]).astype(float)
+    fitted = ScenarioGenerator().fit(data, weights=weights)
+    fitted.save(tmp_path)
+
+    loaded = FittedScenarioGenerator.load(tmp_path)
+
+    np.testing.assert_array_equal(loaded.margin_profiles.weights, weights)
+    pd.testing.assert_frame_equal(loaded.generate(n_scenarios=7), fitted.generate(n_scenarios=7))
+
+
+@pytest.mark.parametrize(
+    "transformer", [CopulaSampleTransformer(), ExtendedCopulaSampleTransformer(), EmpiricalCopulaSampleTransformer()]
+)
+def test_fractional_weights_reach_every_transformer(transformer: object) -> None:
+    data = _mixed_data(n=200)
+    weights = np.random.default_rng(5).uniform(0.2, 3, size=200)
+    profile = MarginProfile(data["k"].to_numpy(), weights=weights)
+    assert profile.cumulative[-1] == 1.0
+    assert profile.jump_points[-1] == 1.0
+
+    generator = ScenarioGenerator(copula_sample_transformation_strategy=transformer)
+    scenarios = generator.generate(data=data, n_scenarios=50, weights=weights)
+
+    assert scenarios.shape == (50, 3)
+    assert set(scenarios["k"]) <= set(data["k"])
@@ -0,0 +1,102 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copula_scengen.modules.copula_sample_transformers import EmpiricalCopulaSampleTransformer
+from copula_scengen.modules.observers import GenerationObserver, LoggingObserver
+from copula_scengen.modules.scenario_generators import ScenarioGenerator
+
+
+class RecordingObserver(GenerationObserver):
+    def __init__(self) -> None:
+        self.events: list[tuple] = []
+
+    def on_stage_start(self, stage: str, margin: int | None = None) -> None:
+        self.events.append(("start", stage, margin))
+
+    def on_stage_end(self, stage: str, seconds: float, margin: int | None = None) -> None:
+        assert seconds >= 0
+        self.events.append(("end", stage, margin))
+
+    def on_progress(self, margin: int, assigned: int, n_scenarios: int) -> None:
+        self.events.append(("progress", margin, assigned, n_scenarios))
+
+    def on_target_grids_built(self, margin: int, n_grids: int, seconds: float, nbytes: int) -> None:
+        self.events.append(("grids", margin, n_grids, nbytes > 0))
+
+
+def _data() -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    return pd.DataFrame(
+        {
+            "a": rng.normal(size=30),
+            "k": rng.integers(0, 3, size=30).astype(float),
+            "b": rng.normal(size=30),
+        },
+    )
+
+
+def test_observer_receives_pipeline_events() -> None:
+    observer = RecordingObserver()
+    ScenarioGenerator(observer=observer).generate(data=_data(), n_scenarios=6)
+
+    stages = [event[1:] for event in observer.events if event[0] == "start"]
+    assert stages[:3] == [("fit", None), ("scenario_generation", None), ("copula_sample_generation", None)]
+    assert [margin for stage, margin in stages if stage == "margin_assignment"] == [1, 2]
+    assert [margin for stage, margin in stages if stage == "margin_transformation"] == [0, 1, 2]
+    assert ("decoding", None) in stages
+    assert sum(event[0] == "end" for event in observer.events) == len(stages)
+
+    progress = [event[1:] for event in observer.events if event[0] == "progress"]
+    assert progress == [(margin, rank, 6) for margin in (1, 2) for rank in range(1, 7)]
+    assert [event[1:] for event in observer.events if event[0] == "grids"] == [(1, 1, True), (2, 2, True)]
+
+
+def test_failed_stages_are_closed() -> None:
+    observer = RecordingObserver()
+    data = _data()
+    data.loc[0, "b"] = np.nan
+
+    with pytest.raises(ValueError, match="missing values"):
+        ScenarioGenerator(observer=observer).generate(data=data, n_scenarios=6)
+
+    starts = [event[1:] for event in observer.events if event[0] == "start"]
+    ends = [event[1:] for event in observer.events if event[0] == "end"]
+    assert starts
+    assert sorted(ends, key=str) == sorted(starts, key=str)
+
+
+def test_logging_observer_reports_failed_stage(caplog: pytest.LogCaptureFixture) -> None:
+    observer = LoggingObserver()
+
+    with (  # noqa: PT012
+        caplog.at_level(logging.INFO, logger="copula_scengen"),
+        pytest.raises(RuntimeError),
+        observer.stage("margin_assignment", margin=2),
+    ):
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    assert caplog.messages[0] == "margin_assignment (margin 2) started"
+    assert caplog.messages[1].startswith("margin_assignment (margin 2) failed after ")
+    assert caplog.messages[1].endswith("RuntimeError('boom')")
+
+
+def test_injected_transformer_reports_to_its_own_observer() -> None:
+    observer = RecordingObserver()
+    transformer = EmpiricalCopulaSampleTransformer(observer=observer)
+    ScenarioGenerator(copula_sample_transformation_strategy=transformer).generate(data=_data(), n_scenarios=4)
+
+    assert {event[1] for event in observer.events} == {"copula_sample_transformation", "margin_transformation"}
+
+
+def test_logging_observer_limits_progress_lines(caplog: pytest.LogCaptureFixture) -> None:
+    observer = LoggingObserver(progress_step=0.5)
+    with caplog.at_level(logging.INFO, logger="copula_scengen"):
+        ScenarioGenerator(observer=observer).generate(data=_data(), n_scenarios=10)
+
+    progress = [record.getMessage() for record in caplog.records if "ranks assigned" in record.getMessage()]
+    assert progress == [f"margin {m}: {r}/10 ranks assigned" for m in (1, 2) for r in (1, 6, 10)]
+    assert any(record.getMessage().startswith("fit finished in") for record in caplog.records)
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from copula_scengen.modules.copula import (
+    ExtendedEmpiricalCopula,
+    HistogramCopula,
+    HistogramCopulaProvider,
+    PairwiseHistogramAccumulator,
+)
+from copula_scengen.modules.copula_sample_generators import CopulaSampleGenerator
+from copula_scengen.modules.scenario_generators import ScenarioGenerator
+
+
+def _data(seed: int = 0, n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=n)
+    return pd.DataFrame(
+        {
+            "a": latent + rng.normal(size=n),
+            "k": np.clip(np.round(latent + 1), 0, 3),
+            "b": rng.gamma(2.0, size=n),
+        },
+    )
+
+
+def _checkerboard(counts: np.ndarray, u: float, v: float) -> float:
+    """Reference checkerboard copula, bin by bin."""
+    total = counts.sum()
+    row_edges = np.concatenate(([0.0], np.cumsum(counts.sum(axis=1)) / total))
+    column_edges = np.concatenate(([0.0], np.cumsum(counts.sum(axis=0)) / total))
+
+    def fraction(edges: np.ndarray, bin_index: int, value: float) -> float:
+        lower, upper = edges[bin_index], edges[bin_index + 1]
+        if upper == lower:
+            return float(value >= upper)
+        return min(max((value - lower) / (upper - lower), 0.0), 1.0)
+
+    return sum(
+        counts[a, b] / total * fraction(row_edges, a, u) * fraction(column_edges, b, v)
+        for a in range(counts.shape[0])
+        for b in range(counts.shape[1])
+    )
+
+
+def test_chunked_updates_match_single_update() -> None:
+    data = _data()
+    edges = {"a": np.linspace(-3, 3, 20), "b": np.linspace(0, 8, 15)}
+
+    chunked = PairwiseHistogramAccumulator(edges=edges)
+    chunked.update_from(data.iloc[start : start + 70] for start in range(0, data.shape[0], 70))
+    whole = PairwiseHistogramAccumulator(edges=edges)
+    whole.update(data)
+
+    assert chunked.n_rows == whole.n_rows == data.shape[0]
+    for first, second in [("a", "k"), ("k", "b"), ("b", "a")]:
+        np.testing.assert_array_equal(chunked.pair_counts(first, second), whole.pair_counts(first, second))
+
+
+def test_later_chunks_extend_the_range() -> None:
+    first = pd.DataFrame({"x": [0.0, 1.0, 3.0, 1.0], "y": [0.1, 0.5, 0.2, 0.9]})
+    later = pd.DataFrame({"x": [2.0, 5.0, -1.0, 3.0], "y": [4.0, -2.0, 0.3, 7.0]})
+    accumulator = PairwiseHistogramAccumulator(n_bins=2, margin_types={"x": "discrete"})
+    accumulator.update(first)
+
+    accumulator.update(later)
+
+    # unseen values of a discrete column get bins of their own instead of joining a neighbour
+    np.testing.assert_array_equal(accumulator.edges[0], [-1, 0, 1, 2, 3, 5])
+    np.testing.assert_array_equal(accumulator.marginal_counts[0], [1, 1, 2, 1, 2, 1])
+    # a continuous column keeps ``n_bins`` bins covering every value seen, none clamped into the first range
+    assert accumulator.edges[1].size == 2
+    assert accumulator.edges[1][-1] == 7.0
+    assert accumulator.marginal_counts[1].sum() == 8
+    # the top bin ends at the largest value, so open-ended fixed bins count the same
+    fixed = np.append(accumulator.edges[1][:-1], np.inf)
+    whole = PairwiseHistogramAccumulator(edges={"y": fixed}, margin_types={"x": "discrete"})
+    whole.update(pd.concat([first, later]))
+    np.testing.assert_array_equal(accumulator.pair_counts("x", "y"), whole.pair_counts("x", "y"))
+    profile = accumulator.margin_profile("y")
+    np.testing.assert_allclose(
+        np.average(profile.values, weights=profile.weights), pd.concat([first, later])["y"].mean()
+    )
+
+
+def test_sketch_follows_drifting_history() -> None:
+    rng = np.random.default_rng(0)
+    chunks = [pd.DataFrame({"x": rng.normal(loc, size=2000), "y": rng.normal(size=2000)}) for loc in (0.0, 10.0)]
+    n_bins = 32
+    accumulator = PairwiseHistogramAccumulator(n_bins=n_bins)
+    accumulator.update_from(chunks)
+
+    history = np.sort(pd.concat(chunks)["x"].to_numpy())
+    assert accumulator.edges[0].size <= n_bins
+    assert accumulator.marginal_counts[0].max() <= 2 * history.size / n_bins
+    # the edges are quantiles of the whole history, to within two bins' mass
+    cdf = np.cumsum(accumulator.marginal_counts[0]) / history.size
+    np.testing.assert_allclose(np.searchsorted(history, accumulator.edges[0], side="right") / history.size, cdf)
+    quantiles = np.linspace(0.05, 0.95, 19)
+    profile = accumulator.margin_profile("x")
+    sketched = np.interp(quantiles, np.cumsum(profile.weights) / history.size, profile.values)
+    exact_levels = np.searchsorted(history, sketched) / history.size
+    np.testing.assert_allclose(exact_levels, quantiles, atol=2 / n_bins)
+    assert np.average(profile.values, weights=profile.weights) == pytest.approx(history.mean())
+
+
+def test_histogram_copula_evaluations_agree() -> None:
+    accumulator = PairwiseHistogramAccumulator(n_bins=6)
+    accumulator.update(_data())
+    copula = accumulator.copula("a", "k")
+    coords = np.arange(9) / 8
+    queries = np.column_stack([np.repeat(coords, coords.size), np.tile(coords, coords.size)])
+
+    expected = np.array([_checkerboard(copula.counts, u, v) for u, v in queries]).reshape(coords.size, coords.size)
+    columns = copula.grid_columns(8)
+    np.testing.assert_allclose(copula(queries).reshape(coords.size, coords.size), expected, atol=1e-12)
+    np.testing.assert_allclose(copula.grid(8), expected, atol=1e-12)
+    np.testing.assert_allclose(np.column_stack([columns.column(j) for j in range(9)]), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("pair", [("a", "k"), ("a", "b"), ("k", "b")])
+def test_fine_bins_approximate_extended_empirical_copula(pair: tuple[str, str]) -> None:
+    data = _data()
+    accumulator = PairwiseHistogramAccumulator(n_bins=data.shape[0])
+    accumulator.update(data)
+
+    expected = ExtendedEmpiricalCopula(data=data[list(pair)].to_numpy()).grid(20)
+    # within one observation per axis of the exact copula
+    np.testing.assert_allclose(accumulator.copula(*pair).grid(20), expected, atol=2 / data.shape[0])
+
+
+def test_missing_values_are_skipped_pairwise() -> None:
+    data = pd.DataFrame({"x": [0.0, 1.0, np.nan, 1.0], "y": [1.0, np.nan, 0.0, 0.0]})
+    accumulator = PairwiseHistogramAccumulator()
+    accumulator.update(data)
+
+    np.testing.assert_array_equal(accumulator.marginal_counts[0], [1, 2])
+    np.testing.assert_array_equal(accumulator.pair_counts("x", "y"), [[0, 1], [1, 0]])
+
+
+def test_chunk_with_missing_column_is_rejected() -> None:
+    accumulator = PairwiseHistogramAccumulator()
+    accumulator.update(_data())
+
+    with pytest.raises(ValueError, match="missing columns"):
+        accumulator.update(_data().drop(columns="b"))
+
+
+def test_generator_runs_on_accumulated_history() -> None:
+    accumulator = PairwiseHistogramAccumulator(n_bins=32)
+    accumulator.update_from([_data(seed=1), _data(seed=2)])
+    generator = CopulaSampleGenerator(copula_provider=HistogramCopulaProvider(accumulator))
+
+    copula_sample = generator.create(data=pd.DataFrame(columns=accumulator.columns), n_scenarios=12)
+
+    assert copula_sample.ranks.shape == (12, 3)
+    for margin in range(3):
+        np.testing.assert_array_equal(np.sort(copula_sample.ranks[:, margin]), np.arange(1, 13))
+
+
+def test_scenarios_from_accumulated_history() -> None:
+    chunks = [_data(seed=1), _data(seed=2)]
+    accumulator = PairwiseHistogramAccumulator(n_bins=32)
+    accumulator.update_from(chunks)
+
+    scenarios = ScenarioGenerator().fit_accumulator(accumulator).generate(n_scenarios=20)
+
+    history = pd.concat(chunks)
+    assert list(scenarios.columns) == ["a", "k", "b"]
+    assert scenarios.shape == (20, 3)
+    assert set(scenarios["k"]) <= set(history["k"])
+    for column in ("a", "b"):
+        assert history[column].min() <= scenarios[column].min() <= scenarios[column].max() <= history[column].max()
+    assert np.corrcoef(scenarios["a"], scenarios["k"])[0, 1] > 0
+
+
+def test_provider_matches_columns_by_name() -> None:
+    accumulator = PairwiseHistogramAccumulator(n_bins=8)
+    accumulator.update(_data())
+
+    copula = HistogramCopulaProvider(accumulator).get(pd.DataFrame(columns=["b", "a"]), margins=[0, 1])
+
+    assert isinstance(copula, HistogramCopula)
+    np.testing.assert_array_equal(copula.counts, accumulator.pair_counts("a", "b").T)
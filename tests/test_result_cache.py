@@ -0,0 +1,111 @@
+import os
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from copula_scengen.modules.copula import ExtendedEmpiricalCopulaProvider, HistogramCopulaProvider
+from copula_scengen.modules.copula.base import Copula
+from copula_scengen.modules.copula.pairwise_histogram_accumulator import PairwiseHistogramAccumulator
+from copula_scengen.modules.copula_sample_generators import CopulaSampleGenerator, ResultCache
+from copula_scengen.modules.margin_profiles import MarginProfiles
+from copula_scengen.schemas.generation_report import GenerationOutcome
+
+
+class CountingProvider(ExtendedEmpiricalCopulaProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def from_profiles(self, margin_profiles: MarginProfiles, margins: Sequence[int]) -> Copula:
+        self.calls += 1
+        return super().from_profiles(margin_profiles, margins)
+
+
+def _data(seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=50)
+    return pd.DataFrame(
+        {
+            "a": latent + rng.normal(size=50),
+            "k": np.clip(np.round(latent + 1), 0, 3),
+            "b": rng.gamma(2.0, size=50),
+        },
+    )
+
+
+def test_cached_runs_match_uncached_run(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    expected = CopulaSampleGenerator().create(data=_data(), n_scenarios=11).ranks
+    generator = CopulaSampleGenerator(result_cache=ResultCache(tmp_path))
+
+    np.testing.assert_array_equal(generator.create(data=_data(), n_scenarios=11).ranks, expected)
+
+    # the second run returns the cached sample without entering the greedy loop
+    monkeypatch.setattr(CopulaSampleGenerator, "_create", lambda *_: pytest.fail("greedy loop ran"))
+    cached = generator.create(data=_data(), n_scenarios=11)
+    np.testing.assert_array_equal(cached.ranks, expected)
+    assert cached.ranks.dtype == expected.dtype
+    assert generator.last_report.outcome == GenerationOutcome.COMPLETED
+
+
+def test_cached_target_grids_are_reused(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path)
+    expected = CopulaSampleGenerator().create(data=_data(), n_scenarios=9).ranks
+    first = CountingProvider()
+    CopulaSampleGenerator(copula_provider=first, result_cache=cache).create(data=_data(), n_scenarios=9)
+
+    # a different prior selection misses the sample but hits every pair's grid
+    second = CountingProvider()
+    generator = CopulaSampleGenerator(copula_provider=second, max_prior_margins=2, result_cache=cache)
+    ranks = generator.create(data=_data(), n_scenarios=9).ranks
+
+    assert first.calls == 3
+    assert second.calls == 0
+    np.testing.assert_array_equal(ranks, expected)
+
+
+def test_changed_data_misses_the_cache(tmp_path: Path) -> None:
+    generator = CopulaSampleGenerator(result_cache=ResultCache(tmp_path))
+    generator.create(data=_data(seed=3), n_scenarios=9)
+
+    ranks = generator.create(data=_data(seed=4), n_scenarios=9).ranks
+
+    np.testing.assert_array_equal(ranks, CopulaSampleGenerator().create(data=_data(seed=4), n_scenarios=9).ranks)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    entry = np.zeros(100)
+    cache = ResultCache(tmp_path, max_bytes=2 * entry.nbytes + 512)
+    cache.put("first", entry)
+    cache.put("second", entry + 1)
+    os.utime(tmp_path / "first.npy", ns=(0, 0))
+    os.utime(tmp_path / "second.npy", ns=(1, 1))
+    assert cache.get("first") is not None
+
+    cache.put("third", entry + 2)
+
+    assert cache.get("second") is None
+    np.testing.assert_array_equal(cache.get("first"), entry)
+    np.testing.assert_array_equal(cache.get("third"), entry + 2)
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_stored_grid_matches_streamed_columns(tmp_path: Path) -> None:
+    copula = ExtendedEmpiricalCopulaProvider().get(_data(), margins=[0, 1])
+    stored = ResultCache(tmp_path).put_grid("grid", copula.grid_columns(12), max_rank=12)
+
+    for index in range(13):
+        np.testing.assert_array_equal(stored.column(index), copula.grid_columns(12).column(index))
+
+
+def test_histogram_provider_token_follows_accumulated_history() -> None:
+    accumulator = PairwiseHistogramAccumulator(n_bins=8)
+    accumulator.update(_data(seed=1))
+    provider = HistogramCopulaProvider(accumulator)
+    token = provider.cache_token
+
+    accumulator.update(_data(seed=2))
+
+    assert provider.cache_token != token
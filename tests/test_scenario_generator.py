@@ -1,10 +1,22 @@
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
+import pytest
 
+from copula_scengen.modules.copula import EmpiricalCopulaProvider
 from copula_scengen.modules.copula.copula_sample import CopulaSample
 from copula_scengen.modules.copula_sample_generators.base import CopulaSampleGenerationStrategy
+from copula_scengen.modules.copula_sample_transformers import (
+    CopulaSampleTransformer,
+    EmpiricalCopulaSampleTransformer,
+    ExtendedCopulaSampleTransformer,
+)
 from copula_scengen.modules.copula_sample_transformers.base import CopulaSampleTransformationStrategy
-from copula_scengen.modules.scenario_generators.scenario_generator import ScenarioGenerator
+from copula_scengen.modules.margin_profiles import MarginProfiles
+from copula_scengen.modules.scenario_generators import FittedScenarioGenerator, ScenarioGenerator
+from copula_scengen.schemas.generation_job import GenerationJob
+from copula_scengen.schemas.margin_type import MarginType
 
 
 def test_scenario_generator_uses_injected_strategies() -> None:
@@ -55,3 +67,139 @@ def test_scenario_generator_default_strategies_generate_dataframe() -> None:
 
     assert scenarios.shape == (3, 2)
     assert list(scenarios.columns) == ["a", "b"]
+
+
+def test_fitted_scenario_generator_round_trips_through_save(tmp_path: Path) -> None:
+    rng = np.random.default_rng(7)
+    data = pd.DataFrame(
+        {
+            "a": rng.normal(size=40),
+            "b": pd.Categorical(rng.choice(["x", "y", "z"], size=40)),
+            "c": rng.integers(0, 4, size=40).astype(float),
+        },
+    )
+    generator = ScenarioGenerator()
+    expected = generator.generate(data=data, n_scenarios=12)
+
+    fitted = generator.fit(data)
+    assert fitted.generate(n_scenarios=12).equals(expected)
+    assert fitted.generate(n_scenarios=12).equals(expected)
+
+    fitted.save(tmp_path / "model")
+    loaded = FittedScenarioGenerator.load(tmp_path / "model")
+
+    pd.testing.assert_frame_equal(loaded.generate(n_scenarios=12), expected)
+    assert loaded.generate(n_scenarios=5).shape == (5, 3)
+
+
+def _numeric_array(seed: int = 11, n: int = 50) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=n)
+    columns = [latent + rng.normal(size=n), np.clip(np.round(latent + 2), 0, 4), rng.gamma(2.0, size=n)]
+    return np.asfortranarray(np.column_stack(columns))
+
+
+@pytest.mark.parametrize(
+    "transformer", [CopulaSampleTransformer, ExtendedCopulaSampleTransformer, EmpiricalCopulaSampleTransformer]
+)
+def test_generate_array_matches_dataframe_path(transformer: type[CopulaSampleTransformationStrategy]) -> None:
+    values = _numeric_array()
+    generator = ScenarioGenerator(copula_sample_transformation_strategy=transformer())
+
+    expected = generator.generate(data=pd.DataFrame(values, columns=["a", "k", "b"]), n_scenarios=9)
+    result = generator.generate_array(values, n_scenarios=9)
+
+    assert isinstance(result, np.ndarray)
+    np.testing.assert_array_equal(result, expected.to_numpy())
+
+
+def test_array_profiles_view_the_input_in_place() -> None:
+    values = _numeric_array()
+    margin_profiles = MarginProfiles.from_array(values)
+
+    copula = EmpiricalCopulaProvider().from_profiles(margin_profiles, margins=[2, 0])
+
+    assert copula.data is None
+    assert np.shares_memory(copula.margin_profiles[0].values, values)
+    assert np.shares_memory(margin_profiles.data.to_numpy(), values)
+
+
+def test_generate_array_honours_declared_margin_types() -> None:
+    values = _numeric_array()
+    margin_types = [None, MarginType.CONTINUOUS, None]
+
+    result = ScenarioGenerator().generate_array(values, n_scenarios=7, margin_types=margin_types)
+
+    # the integer-valued column is transformed as a continuous one, with non-integer averages
+    assert not np.allclose(result[:, 1], np.round(result[:, 1]))
+
+
+def test_generate_array_rejects_missing_values() -> None:
+    values = _numeric_array()
+    values[3, 1] = np.nan
+
+    with pytest.raises(ValueError, match="missing values"):
+        ScenarioGenerator().generate_array(values, n_scenarios=5)
+
+
+def test_generate_batch_matches_generate() -> None:
+    rng = np.random.default_rng(12)
+    datasets = [
+        pd.DataFrame(
+            {
+                "a": rng.normal(size=30),
+                "b": pd.Categorical(rng.choice(["x", "y", "z"], size=30)),
+                "c": rng.integers(0, 4, size=30).astype(float),
+            },
+        )
+        for _ in range(4)
+    ]
+    generator = ScenarioGenerator()
+
+    batch = generator.generate_batch(datasets, n_scenarios=8)
+
+    assert len(batch) == len(datasets)
+    for data, scenarios in zip(datasets, batch, strict=True):
+        pd.testing.assert_frame_equal(scenarios, generator.generate(data=data, n_scenarios=8))
+
+
+def test_generate_batch_rejects_different_columns() -> None:
+    datasets = [pd.DataFrame({"a": [0.1, 0.2, 0.3]}), pd.DataFrame({"b": [0.1, 0.2, 0.3]})]
+
+    with pytest.raises(ValueError, match="same columns"):
+        ScenarioGenerator().generate_batch(datasets, n_scenarios=2)
+
+
+def _pool_data(seed: int = 13, n: int = 60) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=n)
+    return pd.DataFrame(
+        {
+            "a": latent + rng.normal(size=n),
+            "k": np.clip(np.round(latent + 1), 0, 3),
+            "c": pd.Categorical(rng.choice(["x", "y", "z"], size=n)),
+        },
+    )
+
+
+def test_generate_many_matches_generate() -> None:
+    data = _pool_data()
+    rows = np.random.default_rng(14).integers(0, data.shape[0], size=data.shape[0])
+    generator = ScenarioGenerator()
+
+    results = dict(generator.generate_many(data, [5, GenerationJob(n_scenarios=7, rows=rows), 9], max_workers=2))
+
+    assert sorted(results) == [0, 1, 2]
+    pd.testing.assert_frame_equal(results[0], generator.generate(data=data, n_scenarios=5))
+    pd.testing.assert_frame_equal(results[2], generator.generate(data=data, n_scenarios=9))
+    resample = data.iloc[rows].reset_index(drop=True)
+    pd.testing.assert_frame_equal(results[1], generator.generate(data=resample, n_scenarios=7))
+
+
+def test_generate_many_validates_jobs_before_starting() -> None:
+    data = _pool_data()
+
+    with pytest.raises(ValueError, match="outside"):
+        ScenarioGenerator().generate_many(data, [GenerationJob(n_scenarios=3, rows=[0, data.shape[0]])])
+    with pytest.raises(TypeError, match="n_scenarios"):
+        ScenarioGenerator().generate_many(data, [3.0])